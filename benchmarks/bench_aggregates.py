@@ -0,0 +1,86 @@
+"""
+Benchmark: fleet-wide rollups over many documents, by keeping every
+result and scoring at the end vs. one streaming ComplianceAggregate
+(and shards merged at the end).
+
+Run from the project root:
+    python -m benchmarks.bench_aggregates
+"""
+import gc
+import time
+import tracemalloc
+
+from benchmarks.bench_results import _documents
+from src.compliance.aggregates import ComplianceAggregate
+from src.compliance.control_loader import load_controls
+from src.compliance.gap_engine import evaluate_controls
+from src.compliance.grouping import group_by_function
+from src.compliance.scoring import compute_compliance_score
+
+
+def keep_all(stream):
+    kept = list(stream)
+    pooled = [r for results in kept for r in results]
+    scores = [compute_compliance_score(results) for results in kept]
+    functions = {f: compute_compliance_score(rs) for f, rs in group_by_function(pooled).items()}
+    return compute_compliance_score(pooled), functions, scores
+
+
+def streaming(stream):
+    aggregate = ComplianceAggregate()
+    for results in stream:
+        aggregate.add_document(results)
+    return aggregate.summary()
+
+
+def sharded(stream, shards=4):
+    parts = [ComplianceAggregate() for _ in range(shards)]
+    for n, results in enumerate(stream):
+        parts[n % shards].add_document(results)
+    total = ComplianceAggregate()
+    for part in parts:
+        total += ComplianceAggregate.from_dict(part.to_dict())
+    return total.summary()
+
+
+def run(document_counts=(10_000, 100_000)):
+    controls = load_controls()
+    cache = {}
+
+    def stream(documents, compact):
+        for clauses in documents:
+            key = (id(clauses), compact)
+            if key not in cache:
+                cache[key] = evaluate_controls(controls, clauses, compact=compact)
+            yield cache[key]
+
+    print(f"{'documents':>9} {'variant':<22} {'seconds':>8} {'peak MB':>8}")
+    for count in document_counts:
+        documents = _documents(controls, count)
+        expected = keep_all(stream(documents, False))[0]
+
+        for variant, compact, fn in (
+            ("keep all dicts", False, keep_all),
+            ("aggregate (dicts)", False, streaming),
+            ("aggregate (compact)", True, streaming),
+            ("4 shards + merge", True, sharded),
+        ):
+            gc.collect()
+            start = time.perf_counter()
+            out = fn(stream(documents, compact))
+            seconds = time.perf_counter() - start
+
+            # Memory in a separate run: tracemalloc slows allocation down
+            gc.collect()
+            tracemalloc.start()
+            fn(stream(documents, compact))
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            overall = out[0] if variant == "keep all dicts" else out["overall"]
+            assert overall == expected
+            print(f"{count:>9} {variant:<22} {seconds:>8.3f} {peak / (1 << 20):>8.2f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,103 @@
+"""
+Benchmark: DOCX clause extraction through python-docx's document tree
+vs. streaming word/document.xml with expat.
+
+Documents come from synthetic_structured_docx: "plain" has one run per
+paragraph, "structured" has styled runs, table rows and tracked changes.
+Each variant runs in its own process; "peak MB" is how far peak RSS
+(which includes lxml's tree, invisible to tracemalloc) grows beyond the
+process with the DOCX bytes already loaded.
+
+Run from the project root:
+    python -m benchmarks.bench_docx
+    python -m benchmarks.bench_docx --sizes 1MB,8MB,32MB
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import parse_size, synthetic_policy, synthetic_structured_docx
+
+
+VARIANTS = ("python-docx", "streaming")
+KINDS = {
+    "plain": {"runs_per_paragraph": 1, "table_every": 0, "revision_every": 0},
+    "structured": {},
+}
+
+
+def _peak_rss() -> int:
+    # ru_maxrss is in KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def child(variant: str, path: str) -> dict:
+    from src import metrics
+    from src.parser import policy_parser
+
+    metrics.set_enabled(False)
+    with open(path, "rb") as f:
+        content = f.read()
+    baseline = _peak_rss()
+
+    extract = (
+        policy_parser._iter_docx_paragraphs if variant == "python-docx"
+        else policy_parser._iter_docx_text
+    )
+    digest = hashlib.sha256()
+    clauses = 0
+    start = time.perf_counter()
+    for clause in policy_parser._iter_clauses(extract(io.BytesIO(content))):
+        digest.update(clause.encode("utf-8"))
+        clauses += 1
+    seconds = time.perf_counter() - start
+
+    return {
+        "seconds": seconds,
+        "peak_mb": (_peak_rss() - baseline) / (1 << 20),
+        "clauses": clauses,
+        "digest": digest.hexdigest(),
+    }
+
+
+def run(sizes=("1MB", "8MB", "32MB")):
+    print(f"{'docx':<18} {'docx MB':>8} {'variant':<12} {'seconds':>8} {'peak MB':>8} {'clauses':>8}")
+    for label in sizes:
+        text = synthetic_policy(parse_size(label))
+        for kind, options in KINDS.items():
+            content = synthetic_structured_docx(text, **options)
+            with tempfile.NamedTemporaryFile(suffix=".docx", delete=False) as f:
+                f.write(content)
+            try:
+                outputs = {}
+                for variant in VARIANTS:
+                    result = subprocess.run(
+                        [sys.executable, "-m", "benchmarks.bench_docx", "--child", variant, f.name],
+                        check=True, capture_output=True, text=True,
+                    )
+                    out = outputs[variant] = json.loads(result.stdout)
+                    print(f"{kind + '[' + label + ']':<18} {len(content) / (1 << 20):>8.1f} "
+                          f"{variant:<12} {out['seconds']:>8.3f} {out['peak_mb']:>8.1f} "
+                          f"{out['clauses']:>8}")
+                assert len({out["digest"] for out in outputs.values()}) == 1
+            finally:
+                os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1MB,8MB,32MB", help="comma-separated text sizes")
+    parser.add_argument("--child", nargs=2, metavar=("VARIANT", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(*args.child)))
+    else:
+        run(args.sizes.split(","))
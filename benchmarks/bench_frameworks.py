@@ -0,0 +1,76 @@
+"""
+Benchmark: evaluating a policy against several frameworks, one full
+analysis (normalize, split, scan, score) per framework vs. one shared
+pass over a FrameworkSet.
+
+Run from the project root:
+    python -m benchmarks.bench_frameworks
+    python -m benchmarks.bench_frameworks --sizes 1MB,8MB
+"""
+import argparse
+import gc
+import time
+
+from benchmarks.synthetic import parse_size, synthetic_policy
+from src import metrics
+from src.compliance.control_loader import get_catalog
+from src.compliance.frameworks import (
+    compliance_report,
+    framework_path,
+    framework_reports,
+    get_frameworks,
+)
+from src.compliance.gap_engine import evaluate_controls
+from src.parser.policy_parser import iter_text_clauses
+
+
+FRAMEWORKS = ("nist", "iso27001", "cis", "nist_csf")
+
+
+def separate(text, names):
+    reports = {}
+    for name in names:
+        catalog = get_catalog(framework_path(name))
+        results = evaluate_controls(catalog.controls, iter_text_clauses(text), catalog.compiled)
+        reports[name] = compliance_report(results)
+    return reports
+
+
+def shared(text, names):
+    frameworks = get_frameworks(names)
+    results = evaluate_controls(frameworks.controls, iter_text_clauses(text), frameworks.compiled)
+    return framework_reports(frameworks, results)
+
+
+def _seconds(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=("1MB", "8MB")):
+    metrics.set_enabled(False)
+
+    print(f"{'text':<6} {'frameworks':<28} {'separate(s)':>11} {'shared(s)':>10} {'vs 1 fw':>8}")
+    for label in sizes:
+        text = synthetic_policy(parse_size(label))
+        baseline = None
+        for count in range(1, len(FRAMEWORKS) + 1):
+            names = FRAMEWORKS[:count]
+            assert shared(text, names) == separate(text, names)
+
+            separate_seconds = _seconds(lambda: separate(text, names))
+            shared_seconds = _seconds(lambda: shared(text, names))
+            baseline = baseline or shared_seconds
+            print(f"{label:<6} {','.join(names):<28} {separate_seconds:>11.3f} "
+                  f"{shared_seconds:>10.3f} {shared_seconds / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1MB,8MB", help="comma-separated text sizes")
+    run(parser.parse_args().sizes.split(","))
@@ -0,0 +1,66 @@
+"""
+Benchmark: re-analysis of a lightly edited document, full evaluation
+vs. incremental evaluation from the previous version's match vectors.
+
+Run from the project root:
+    python -m benchmarks.bench_incremental
+"""
+import json
+import random
+import time
+
+from benchmarks.bench_gap_engine import CONTROLS_PATH, synthetic_catalog, synthetic_clauses
+from src.compliance.gap_engine import compile_controls, evaluate_controls
+from src.compliance.incremental import evaluate_revision
+
+
+# Roughly 50 clauses per page
+CLAUSES_PER_PAGE = 50
+
+
+def edited(clauses, edits: int, seed: int = 11):
+    rng = random.Random(seed)
+    revised = list(clauses)
+    for n in range(edits):
+        position = rng.randrange(len(revised))
+        revised[position] = revised[position] + f" (amended {n})"
+    return revised
+
+
+def run(pages=(30, 300), edits=(1, 10, 100), catalog_copies=(1, 5)):
+    with open(CONTROLS_PATH, "r", encoding="utf-8") as f:
+        base_controls = json.load(f)
+
+    print(f"{'controls':>9} {'pages':>6} {'edits':>6} {'full(s)':>9} "
+          f"{'incremental(s)':>15} {'speedup':>8}")
+
+    for copies in catalog_copies:
+        controls = synthetic_catalog(base_controls, copies)
+        compiled = compile_controls(controls)
+
+        for page_count in pages:
+            # Unique clauses, like a real document
+            clauses = [
+                f"{clause} ({n})"
+                for n, clause in enumerate(synthetic_clauses(page_count * CLAUSES_PER_PAGE))
+            ]
+            state = evaluate_revision(controls, clauses, compiled=compiled).state
+
+            for edit_count in edits:
+                revised = edited(clauses, edit_count)
+
+                start = time.perf_counter()
+                expected = evaluate_controls(controls, revised, compiled)
+                full_time = time.perf_counter() - start
+
+                start = time.perf_counter()
+                revision = evaluate_revision(controls, revised, previous=state, compiled=compiled)
+                incremental_time = time.perf_counter() - start
+
+                assert revision.results == expected
+                print(f"{len(controls):>9} {page_count:>6} {edit_count:>6} {full_time:>9.3f} "
+                      f"{incremental_time:>15.3f} {full_time / incremental_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    run()
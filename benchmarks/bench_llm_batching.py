@@ -0,0 +1,112 @@
+"""
+Benchmark: per-gap prompts vs. batched multi-gap prompts.
+
+By default runs against a local simulated model server that charges a
+fixed per-request setup cost, prefill time per prompt token and
+generation time per gap (tune with the flags). Pass --host to measure a
+real Ollama server instead.
+
+Run from the project root:
+    python -m benchmarks.bench_llm_batching [--gaps 16] [--host http://127.0.0.1:11434]
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.llm.llm_engine import Phi3PolicyDraftingEngine
+
+
+DRAFT = ("RISK:\nThe gap leaves the control unenforced.\n\n"
+         "POLICY:\nThe organization shall define and enforce the missing elements.\n\n"
+         "ROADMAP:\n- Assign ownership\n- Review annually")
+
+
+def simulated_server(setup: float, prefill_per_token: float, per_gap: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            prompt = payload["prompt"]
+            numbers = re.findall(r"^GAP (\d+):", prompt, re.MULTILINE)
+
+            time.sleep(setup + prefill_per_token * len(prompt.split())
+                       + per_gap * max(1, len(numbers)))
+
+            if numbers:
+                text = "".join(f"=== GAP {n} ===\n{DRAFT}\n=== END GAP {n} ===\n" for n in numbers)
+            else:
+                text = DRAFT
+
+            body = json.dumps({"response": text, "done": True}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def synthetic_gaps(count: int):
+    return [
+        {
+            "control_id": f"CT.{n:02d}",
+            "control_name": f"Synthetic Control {n}",
+            "severity": "High",
+            "missing_elements": ["roles", "enforcement"],
+        }
+        for n in range(count)
+    ]
+
+
+def run(args):
+    server = None
+    host = args.host
+    if host is None:
+        server = simulated_server(args.setup, args.prefill, args.per_gap)
+        host = f"http://127.0.0.1:{server.server_address[1]}"
+        print(f"Simulated server: setup={args.setup}s prefill={args.prefill}s/token "
+              f"generation={args.per_gap}s/gap\n")
+
+    engine = Phi3PolicyDraftingEngine(backend="http", host=host, use_cache=False)
+    gaps = synthetic_gaps(args.gaps)
+
+    print(f"{'batch size':>10} {'requests':>9} {'seconds':>9} {'speedup':>8}")
+    per_gap_time = None
+    for batch_size in (1, 2, 4, 8):
+        start = time.perf_counter()
+        results = []
+        for i in range(0, len(gaps), batch_size):
+            batch = gaps[i:i + batch_size]
+            if batch_size == 1:
+                results.append(engine.generate_full_improvement(batch[0]))
+            else:
+                results.extend(engine.generate_batch_improvements(batch))
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == len(gaps) and all(r["rewritten_policy"] for r in results)
+        per_gap_time = per_gap_time or elapsed
+        requests = -(-len(gaps) // batch_size)
+        print(f"{batch_size:>10} {requests:>9} {elapsed:>9.2f} {per_gap_time / elapsed:>7.2f}x")
+
+    if server is not None:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gaps", type=int, default=16)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--setup", type=float, default=0.05)
+    parser.add_argument("--prefill", type=float, default=0.0005)
+    parser.add_argument("--per-gap", type=float, default=0.05)
+    run(parser.parse_args())
@@ -0,0 +1,96 @@
+"""
+Benchmark: text normalization and clause segmentation on large text
+exports, before and after the byte-level normalizer.
+
+"before" is the previous implementation (five full-text passes with
+str regexes, then one re.split over the whole document). "after" is
+_clean_text + _extract_clauses as they are now, and iter_text_clauses,
+which normalizes and splits block by block. Peak memory is measured
+with tracemalloc, in a separate run from the timing.
+
+Run from the project root:
+    python -m benchmarks.bench_normalize
+    python -m benchmarks.bench_normalize --sizes 1MB,100MB
+"""
+import argparse
+import gc
+import re
+import time
+import tracemalloc
+from typing import Callable, List
+
+from benchmarks.synthetic import parse_size, synthetic_policy
+from src import metrics
+from src.parser.policy_parser import _clean_text, _extract_clauses, iter_text_clauses
+
+
+def reference_clean_text(text: str) -> str:
+    text = text.lower()
+    text = re.sub(r'-\s*\n\s*', '', text)
+    text = re.sub(r'\n+', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^a-z0-9.,;:() ]', '', text)
+    return text.strip()
+
+
+def reference_clauses(text: str) -> List[str]:
+    raw_clauses = re.split(r'\.\s+|;\s+|\n\d+\.\s+|\n-\s+|\n•\s+', reference_clean_text(text))
+    return [c.strip() for c in raw_clauses if len(c.strip()) >= 40]
+
+
+def with_unicode(text: str) -> str:
+    """
+    The same text with typographic quotes, accents and non-breaking
+    spaces sprinkled in, as in real PDF/DOCX exports.
+    """
+    return (
+        text.replace(" policy", "\xa0policy", 5000)
+        .replace("organization", "organización", 5000)
+        .replace("Section", "“Section”", 5000)
+    )
+
+
+def measure(fn: Callable[[], object]):
+    gc.collect()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def run(sizes=("1MB", "8MB", "32MB")):
+    # Stage timing would only add noise here
+    metrics.set_enabled(False)
+
+    print(f"{'text':<14} {'variant':<24} {'seconds':>8} {'MB/s':>8} {'peak MB':>8} {'x size':>7}")
+    for label in sizes:
+        size = parse_size(label)
+        ascii_text = synthetic_policy(size)
+
+        for kind, text in (("ascii", ascii_text), ("unicode", with_unicode(ascii_text))):
+            expected = reference_clauses(text)
+            assert _extract_clauses(_clean_text(text)) == expected
+            assert list(iter_text_clauses(text)) == expected
+
+            for variant, fn in (
+                ("before", lambda: reference_clauses(text)),
+                ("clean+extract", lambda: _extract_clauses(_clean_text(text))),
+                ("iter_text_clauses", lambda: sum(1 for _ in iter_text_clauses(text))),
+            ):
+                seconds, peak = measure(fn)
+                print(f"{kind + '[' + label + ']':<14} {variant:<24} {seconds:>8.3f} "
+                      f"{size / (1 << 20) / seconds:>8.1f} {peak / (1 << 20):>8.1f} "
+                      f"{peak / size:>7.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1MB,8MB,32MB", help="comma-separated text sizes")
+    run(parser.parse_args().sizes.split(","))
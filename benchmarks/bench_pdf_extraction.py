@@ -0,0 +1,64 @@
+"""
+Benchmark: serial vs. process-pool PDF extraction.
+
+Builds a large PDF by repeating the pages of the bundled NIST policy
+template guide, then parses it with 1/2/4/8 workers and checks that
+every run yields exactly the serial clauses.
+
+Run from the project root:
+    python -m benchmarks.bench_pdf_extraction [copies]
+"""
+import io
+import sys
+import time
+from pathlib import Path
+
+import PyPDF2
+
+from src.parser.policy_parser import iter_policy_clauses
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+SOURCE_PDF = ROOT_DIR / "NIST-Cybersecurity-Framework-Policy-Template-Guide-v2111Online.pdf"
+
+
+def synthetic_pdf(copies: int) -> bytes:
+    """
+    Concatenates `copies` copies of the source PDF into one document.
+    """
+    reader = PyPDF2.PdfReader(str(SOURCE_PDF))
+    writer = PyPDF2.PdfWriter()
+    for _ in range(copies):
+        for page in reader.pages:
+            writer.add_page(page)
+
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def run(copies: int = 20, worker_counts=(1, 2, 4, 8)):
+    content = synthetic_pdf(copies)
+    page_count = len(PyPDF2.PdfReader(io.BytesIO(content)).pages)
+    print(f"Synthetic PDF: {page_count} pages, {len(content) / 1e6:.1f} MB\n")
+    print(f"{'workers':>8} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+
+    baseline = None
+    serial_time = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        clauses = list(iter_policy_clauses(io.BytesIO(content), "policy.pdf", workers=workers))
+        elapsed = time.perf_counter() - start
+
+        if baseline is None:
+            baseline, serial_time = clauses, elapsed
+        assert clauses == baseline, f"{workers} workers changed the output"
+
+        print(
+            f"{workers:>8} {elapsed:>9.2f} {page_count / elapsed:>9.1f} "
+            f"{serial_time / elapsed:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,90 @@
+"""
+Benchmark: memory and scoring time of corpus-scale results, as result
+dicts, as ControlResults and as one columnar ResultSet.
+
+Run from the project root:
+    python -m benchmarks.bench_results
+"""
+import gc
+import random
+import time
+import tracemalloc
+
+from src.compliance.control_loader import load_controls
+from src.compliance.gap_engine import evaluate_controls
+from src.compliance.results import ResultSet
+from src.compliance.scoring import compute_compliance_score
+
+
+def _documents(controls, count, seed=0):
+    """
+    `count` distinct-looking documents: random subsets of element mentions.
+    """
+    rng = random.Random(seed)
+    elements = sorted({e for c in controls for e in c["required_elements"]})
+    variants = []
+    for _ in range(64):
+        mentioned = rng.sample(elements, rng.randint(0, len(elements)))
+        variants.append([f"the organization shall define {e} for all systems" for e in mentioned])
+    return [variants[n % len(variants)] for n in range(count)]
+
+
+def _held(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    seconds = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, size, seconds
+
+
+def run(document_counts=(1_000, 10_000, 50_000)):
+    controls = load_controls()
+    cache = {}
+
+    def evaluate(clauses, compact):
+        # Evaluation itself is not measured: reuse results per variant,
+        # but give every document its own result objects
+        key = (id(clauses), compact)
+        if key not in cache:
+            cache[key] = evaluate_controls(controls, clauses, compact=compact)
+        if compact:
+            return [type(r)(r.control, r.status, r.missing_elements) for r in cache[key]]
+        return [{**r, "missing_elements": list(r["missing_elements"])} for r in cache[key]]
+
+    print(f"{'documents':>9} {'form':<14} {'held MB':>8} {'bytes/result':>13} {'score all(s)':>13}")
+    for count in document_counts:
+        documents = _documents(controls, count)
+        results_count = count * len(controls)
+
+        for form in ("dicts", "ControlResult", "ResultSet"):
+            if form == "ResultSet":
+                def build():
+                    corpus = ResultSet(controls)
+                    for n, clauses in enumerate(documents):
+                        corpus.add(str(n), evaluate(clauses, True))
+                    return corpus
+            else:
+                def build(compact=form == "ControlResult"):
+                    return [evaluate(clauses, compact) for clauses in documents]
+
+            held, size, _ = _held(build)
+
+            start = time.perf_counter()
+            if form == "ResultSet":
+                for n in range(len(held)):
+                    held.score(n)
+            else:
+                for results in held:
+                    compute_compliance_score(results)
+            score_seconds = time.perf_counter() - start
+
+            print(f"{count:>9} {form:<14} {size / (1 << 20):>8.1f} "
+                  f"{size / results_count:>13.1f} {score_seconds:>13.3f}")
+            del held
+
+
+if __name__ == "__main__":
+    run()
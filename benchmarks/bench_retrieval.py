@@ -0,0 +1,48 @@
+"""
+Benchmark: BM25 retrieval matching vs. exact keyword matching as the
+document grows. Index building is linear in the document; scoring all
+elements only walks the postings of their terms.
+
+Run from the project root:
+    python -m benchmarks.bench_retrieval
+"""
+import json
+import time
+
+from benchmarks.bench_gap_engine import CONTROLS_PATH, synthetic_catalog, synthetic_clauses
+from src.compliance.gap_engine import compile_controls, evaluate_controls
+from src.compliance.retrieval import ClauseIndex, evaluate_controls_bm25
+
+
+def run(clause_counts=(1_000, 10_000, 50_000), catalog_copies=(1, 5)):
+    with open(CONTROLS_PATH, "r", encoding="utf-8") as f:
+        base_controls = json.load(f)
+
+    print(f"{'controls':>9} {'clauses':>8} {'keyword(s)':>11} {'index(s)':>9} "
+          f"{'score(s)':>9} {'score/1k clauses(ms)':>21}")
+
+    for copies in catalog_copies:
+        controls = synthetic_catalog(base_controls, copies)
+        compiled = compile_controls(controls)
+
+        for count in clause_counts:
+            clauses = synthetic_clauses(count)
+
+            start = time.perf_counter()
+            evaluate_controls(controls, clauses, compiled)
+            keyword_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            index = ClauseIndex(clauses)
+            index_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            evaluate_controls_bm25(controls, clauses, compiled=compiled, index=index)
+            score_time = time.perf_counter() - start
+
+            print(f"{len(controls):>9} {count:>8} {keyword_time:>11.3f} {index_time:>9.3f} "
+                  f"{score_time:>9.3f} {score_time / count * 1e6:>21.2f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,118 @@
+"""
+Import-time budget for the entry points.
+
+Imports each entry point in a fresh interpreter under
+`python -X importtime` and fails when its cumulative import time is over
+budget, or when it loads a module that must stay lazy (PDF/DOCX
+libraries, the LLM backend, FastAPI outside the API).
+
+Run from the project root:
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --scale 2      # slower machine
+
+Exits with status 1 on any violation.
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+class EntryPoint(NamedTuple):
+    module: str
+    budget_ms: float
+    # Loaded on first use only, never at import
+    lazy: Tuple[str, ...]
+
+
+ENTRY_POINTS = [
+    EntryPoint("main", 250, ("PyPDF2", "docx", "fastapi", "src.llm.ollama_client")),
+    EntryPoint("src.app", 900, ("PyPDF2", "docx", "src.llm.ollama_client")),
+    EntryPoint("ui", 1200, ("PyPDF2", "docx", "fastapi", "src.llm.ollama_client")),
+]
+
+
+def measure(module: str) -> Tuple[float, Dict[str, float], Dict[str, float]]:
+    """
+    Cumulative import time of `module` in milliseconds, the cumulative
+    time of every module loaded, and that of the module's direct imports.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{process.stderr[-2000:]}")
+
+    loaded, direct = {}, {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+
+        # Nesting is shown by two spaces of indentation per level;
+        # children are listed before their parent
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name, ms = name.strip(), int(cumulative) / 1000
+        loaded[name] = ms
+        if depth == 0 and name != module:
+            direct = {}
+        elif depth == 1:
+            direct[name] = ms
+
+    return loaded[module], loaded, direct
+
+
+def check(entry: EntryPoint, repeat: int = 3, scale: float = 1.0) -> List[str]:
+    """
+    Violations for one entry point (empty when within budget). The best
+    of `repeat` runs is compared, to ignore cold disk caches.
+    """
+    runs = [measure(entry.module) for _ in range(max(1, repeat))]
+    elapsed, loaded, direct = min(runs, key=lambda run: run[0])
+    budget = entry.budget_ms * scale
+
+    slowest = sorted(((ms, name) for name, ms in direct.items()), reverse=True)[:3]
+    print(f"{entry.module:<10} {elapsed:>8.1f} ms  (budget {budget:.0f} ms)  slowest: "
+          + ", ".join(f"{name} {ms:.0f} ms" for ms, name in slowest))
+
+    violations = []
+    if elapsed > budget:
+        violations.append(f"{entry.module}: {elapsed:.1f} ms exceeds {budget:.0f} ms")
+    for name in entry.lazy:
+        if name in loaded:
+            violations.append(f"{entry.module}: imports {name} eagerly")
+    return violations
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per entry point (best is kept)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget")
+    parser.add_argument("--only", default="", help="comma-separated entry points to check")
+    args = parser.parse_args(argv)
+
+    only = set(filter(None, args.only.split(",")))
+    violations = []
+    for entry in ENTRY_POINTS:
+        if not only or entry.module in only:
+            violations += check(entry, args.repeat, args.scale)
+
+    if violations:
+        print("\n" + "\n".join(violations))
+        return 1
+    print("\nAll entry points within budget.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
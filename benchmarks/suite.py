@@ -0,0 +1,299 @@
+"""
+Benchmark suite for the analysis hot paths, with JSON baselines.
+
+Covers _clean_text, _extract_clauses, iter_text_clauses,
+parse_policy (TXT/PDF/DOCX), evaluate_control, evaluate_controls,
+compute_compliance_score, group_by_function and the /analyze endpoints
+end to end (LLM stubbed), on deterministic synthetic policies and catalogs (benchmarks.synthetic).
+
+Run from the project root:
+    python -m benchmarks.suite                              # default sizes
+    python -m benchmarks.suite --full                       # up to 100 MB
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json --threshold 0.25
+
+--compare exits with status 1 when any case is slower than its baseline
+by more than --threshold (fractional, 0.25 = 25%).
+"""
+import argparse
+import asyncio
+import io
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, NamedTuple
+
+from benchmarks.synthetic import (
+    parse_size,
+    synthetic_catalog,
+    synthetic_docx,
+    synthetic_pdf,
+    synthetic_policy,
+)
+
+
+DEFAULT_SIZES = ["1KB", "64KB", "1MB", "8MB"]
+FULL_SIZES = DEFAULT_SIZES + ["32MB", "100MB"]
+CATALOG_SIZES = [17, 200]
+RESULT_COUNTS = [100, 10_000, 100_000]
+
+# Largest policy each slow case is run on
+SIZE_LIMITS = {
+    "parse_pdf": parse_size("1MB"),
+    "parse_docx": parse_size("8MB"),
+    "evaluate_control": parse_size("8MB"),
+    "analyze": parse_size("8MB"),
+    "analyze_stream": parse_size("1MB"),
+}
+
+# Differences below this many seconds are noise, never regressions
+NOISE_FLOOR = 0.005
+
+# Cases faster than this get one untimed warm-up run (caches, compiled regexes)
+WARMUP_BELOW = 1.0
+
+
+class Case(NamedTuple):
+    """
+    One benchmark: `setup()` prepares inputs (untimed) and returns the
+    callable that is timed. `size` is the bytes processed, for MB/s.
+    """
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    size: int = 0
+
+
+class _Upload:
+    """
+    The parts of UploadFile that parse_policy uses.
+    """
+
+    def __init__(self, content: bytes, filename: str):
+        self.file = io.BytesIO(content)
+        self.filename = filename
+
+    async def read(self) -> bytes:
+        return self.file.getvalue()
+
+
+# -------------------------------------------------------------------
+# Cases
+# -------------------------------------------------------------------
+def build_cases(size_labels: List[str]) -> Iterator[Case]:
+    from src.compliance.control_loader import load_controls
+    from src.compliance.gap_engine import evaluate_control, evaluate_controls
+    from src.compliance.grouping import group_by_function
+    from src.compliance.scoring import compute_compliance_score
+    from src.parser.policy_parser import (
+        _clean_text,
+        _extract_clauses,
+        iter_text_clauses,
+        parse_policy,
+    )
+
+    catalogs = {17: load_controls()}
+    for count in CATALOG_SIZES:
+        catalogs.setdefault(count, synthetic_catalog(count))
+
+    for label in size_labels:
+        size = parse_size(label)
+        text = lambda size=size: synthetic_policy(size)
+
+        yield Case(f"clean_text[{label}]", lambda text=text: (
+            lambda raw=text(): _clean_text(raw)
+        ), size)
+
+        yield Case(f"extract_clauses[{label}]", lambda text=text: (
+            lambda cleaned=_clean_text(text()): _extract_clauses(cleaned)
+        ), size)
+
+        yield Case(f"text_clauses[{label}]", lambda text=text: (
+            lambda raw=text(): sum(1 for _ in iter_text_clauses(raw))
+        ), size)
+
+        for kind, encode in (
+            ("txt", lambda raw: raw.encode("utf-8")),
+            ("pdf", synthetic_pdf),
+            ("docx", synthetic_docx),
+        ):
+            if size > SIZE_LIMITS.get(f"parse_{kind}", size):
+                continue
+            yield Case(f"parse_{kind}[{label}]", lambda text=text, encode=encode, kind=kind: (
+                lambda content=encode(text()): asyncio.run(
+                    parse_policy(_Upload(content, f"policy.{kind}"))
+                )
+            ), size)
+
+        for count in CATALOG_SIZES:
+            controls = catalogs[count]
+            clauses = lambda text=text: _extract_clauses(_clean_text(text()))
+
+            if size <= SIZE_LIMITS["evaluate_control"]:
+                yield Case(f"evaluate_control[{label} x {count}]",
+                           lambda clauses=clauses, controls=controls: (
+                    lambda cl=clauses(): [evaluate_control(c, cl) for c in controls]
+                ), size)
+
+            yield Case(f"evaluate_controls[{label} x {count}]",
+                       lambda clauses=clauses, controls=controls: (
+                lambda cl=clauses(): evaluate_controls(controls, cl)
+            ), size)
+
+        for endpoint in ("analyze", "analyze_stream"):
+            if size <= SIZE_LIMITS[endpoint]:
+                yield Case(f"{endpoint}_e2e[{label}]", lambda text=text, endpoint=endpoint: (
+                    _endpoint_call(endpoint, text().encode("utf-8"))
+                ), size)
+
+    # Scoring and grouping only depend on the number of results
+    sample = evaluate_controls(catalogs[CATALOG_SIZES[-1]], _extract_clauses(
+        _clean_text(synthetic_policy(parse_size("64KB")))
+    ))
+    for count in RESULT_COUNTS:
+        results = (sample * (count // len(sample) + 1))[:count]
+        yield Case(f"compute_compliance_score[{count} results]",
+                   lambda results=results: (lambda: compute_compliance_score(results)))
+        yield Case(f"group_by_function[{count} results]",
+                   lambda results=results: (lambda: group_by_function(results)))
+
+
+def _endpoint_call(endpoint: str, content: bytes) -> Callable[[], object]:
+    """
+    POST to /analyze or /analyze/stream through the ASGI test client,
+    with the LLM stubbed and the analysis cache cleared before each call.
+    """
+    from fastapi.testclient import TestClient
+
+    from src import app as app_module
+    from src.analysis_cache import CACHE
+
+    app_module.stream_llm_on_gaps = _stub_drafts
+    app_module.run_llm_on_gaps = lambda results, **kwargs: [
+        event for event in _stub_drafts(results) if event["event"] == "draft"
+    ]
+    client = TestClient(app_module.app)
+
+    def call():
+        CACHE.clear()
+        if endpoint == "analyze":
+            response = client.post("/analyze", files={"file": ("policy.txt", content)})
+            response.raise_for_status()
+            return response.json()
+
+        with client.stream("POST", "/analyze/stream",
+                           files={"file": ("policy.txt", content)}) as response:
+            response.raise_for_status()
+            return sum(1 for _ in response.iter_lines())
+
+    return call
+
+
+def _stub_drafts(results: List[Dict]) -> Iterator[Dict]:
+    for gap in results:
+        if gap["status"] in ("WEAK", "MISSING"):
+            yield {
+                "event": "draft",
+                "control_id": gap["control_id"],
+                "control_name": gap["control_name"],
+                "status": gap["status"],
+                "severity": gap["severity"],
+                "risk_explanation": "stub",
+                "rewritten_policy": "stub",
+                "improvement_roadmap": "stub",
+                "latency_seconds": 0.0,
+            }
+
+
+# -------------------------------------------------------------------
+# Running & Comparing
+# -------------------------------------------------------------------
+def run_cases(cases: List[Case], repeat: int) -> Dict[str, Dict]:
+    results = {}
+    for case in cases:
+        fn = case.setup()
+        timings = [_timed(fn)]
+        if timings[0] < WARMUP_BELOW:
+            timings = []
+        while len(timings) < repeat:
+            timings.append(_timed(fn))
+
+        seconds = min(timings)
+        results[case.name] = {"seconds": round(seconds, 6), "bytes": case.size}
+        if case.size:
+            results[case.name]["mb_per_s"] = round(case.size / (1 << 20) / max(seconds, 1e-9), 2)
+
+        throughput = f"{results[case.name]['mb_per_s']:>9.2f} MB/s" if case.size else ""
+        print(f"{case.name:<48} {seconds:>10.4f}s {throughput}", flush=True)
+    return results
+
+
+def _timed(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    Names of the cases slower than baseline by more than `threshold`
+    (and by more than NOISE_FLOOR seconds).
+    """
+    regressions = []
+    print(f"\n{'case':<48} {'baseline(s)':>12} {'current(s)':>11} {'change':>8}")
+    for name, result in current.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<48} {'-':>12} {result['seconds']:>11.4f} {'new':>8}")
+            continue
+
+        old, new = before["seconds"], result["seconds"]
+        change = (new - old) / old if old else 0.0
+        regressed = change > threshold and new - old > NOISE_FLOOR
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<48} {old:>12.4f} {new:>11.4f} {change:>+7.0%}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", help="comma-separated policy sizes, e.g. 1KB,1MB,100MB")
+    parser.add_argument("--full", action="store_true", help="include 32 MB and 100 MB policies")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case (minimum is kept)")
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--save", help="write results to this JSON baseline")
+    parser.add_argument("--compare", help="compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown vs. baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes.split(",") if args.sizes else (FULL_SIZES if args.full else DEFAULT_SIZES)
+    cases = [case for case in build_cases(sizes) if args.filter in case.name]
+    results = run_cases(cases, max(1, args.repeat))
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results,
+            }, f, indent=2)
+        print(f"\nSaved {len(results)} results to {args.save}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed beyond {args.threshold:.0%}")
+            return 1
+        print("\nNo regressions.")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
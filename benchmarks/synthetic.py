@@ -0,0 +1,297 @@
+"""
+Deterministic synthetic inputs for benchmarks: policy text of any size
+(1 KB to 100 MB and beyond), the same text as PDF and DOCX, and control
+catalogs of any size. The same arguments always produce the same bytes.
+"""
+import io
+import json
+import random
+import re
+from pathlib import Path
+from typing import Dict, List
+
+from src.compliance.gap_engine import MANDATORY_TERMS, OWNERSHIP_TERMS, SCOPE_TERMS, SYNONYMS
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+CONTROLS_PATH = ROOT_DIR / "data" / "controls" / "nist_controls.json"
+
+FUNCTIONS = ["Govern", "Identify", "Protect", "Detect", "Respond", "Recover"]
+SEVERITIES = ["High", "Medium", "Low"]
+
+_SUBJECTS = [
+    "the organization", "each business unit", "the information security team",
+    "system owners", "the chief information security officer", "all employees",
+    "third-party vendors", "the risk committee", "data custodians",
+]
+_MODALS = MANDATORY_TERMS + ["should", "may", "will", "are expected to", "can"]
+_VERBS = [
+    "maintain", "document", "review", "implement", "enforce", "approve",
+    "monitor", "test", "update", "report on",
+]
+_QUALIFIERS = [
+    "at least annually", "on a quarterly basis", "after every significant change",
+    "in accordance with this policy", "where technically feasible",
+    "as defined by the governance board", "without undue delay",
+]
+_FILLER = [
+    "this section describes the intent of the program",
+    "exceptions must be approved in writing and reviewed periodically",
+    "the following definitions apply throughout this document",
+    "records are retained for the period required by applicable regulation",
+    "questions about this policy should be directed to the policy owner",
+]
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMG]?B)?\s*$", re.IGNORECASE)
+_UNITS = {None: 1, "B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+
+def parse_size(label: str) -> int:
+    """
+    "64KB" -> 65536. Units are binary (1 KB = 1024 bytes).
+    """
+    match = _SIZE.match(label)
+    if not match:
+        raise ValueError(f"Invalid size: {label}")
+    number, unit = match.groups()
+    return int(float(number) * _UNITS[unit.upper() if unit else None])
+
+
+def _topics() -> List[str]:
+    with open(CONTROLS_PATH, "r", encoding="utf-8") as f:
+        elements = {e for control in json.load(f) for e in control["required_elements"]}
+    for element, synonyms in SYNONYMS.items():
+        elements.add(element)
+        elements.update(synonyms)
+    return sorted(elements)
+
+
+def _sentence(rng: random.Random, topics: List[str]) -> str:
+    kind = rng.random()
+    if kind < 0.15:
+        return rng.choice(_FILLER).capitalize() + "."
+
+    sentence = (
+        f"{rng.choice(_SUBJECTS)} {rng.choice(_MODALS)} {rng.choice(_VERBS)} "
+        f"{rng.choice(topics)}"
+    )
+    if kind < 0.45:
+        sentence += f" and {rng.choice(topics)}"
+    if kind > 0.7:
+        sentence += f" for {rng.choice(SCOPE_TERMS + ['critical systems', 'customer data'])}"
+    if kind > 0.85:
+        sentence += f"; {rng.choice(_SUBJECTS)} are {rng.choice(OWNERSHIP_TERMS)} for compliance"
+    sentence += f" {rng.choice(_QUALIFIERS)}."
+    return sentence[0].upper() + sentence[1:]
+
+
+def synthetic_policy(size_bytes: int, seed: int = 0) -> str:
+    """
+    Policy-like text of exactly `size_bytes` UTF-8 bytes (ASCII only),
+    in paragraphs of 3-8 sentences that mix catalog elements, synonyms,
+    strength terms and filler.
+    """
+    rng = random.Random(seed)
+    topics = _topics()
+
+    parts = []
+    written = 0
+    section = 1
+    while written < size_bytes:
+        heading = f"Section {section}. {rng.choice(topics).title()}\n"
+        body = " ".join(_sentence(rng, topics) for _ in range(rng.randint(3, 8)))
+        paragraph = heading + body + "\n\n"
+        parts.append(paragraph)
+        written += len(paragraph)
+        section += 1
+
+    return "".join(parts)[:size_bytes]
+
+
+def synthetic_catalog(control_count: int, seed: int = 0) -> List[Dict]:
+    """
+    A control catalog of `control_count` controls. Elements are drawn
+    from the real catalog and synonym map plus generated phrases, so
+    controls share some elements and hit synthetic_policy text.
+    """
+    rng = random.Random(seed)
+    vocabulary = sorted(set(_topics()) | {
+        f"{rng.choice(['secure', 'annual', 'vendor', 'privileged', 'remote', 'mobile'])} "
+        f"{rng.choice(['access review', 'baseline', 'audit', 'training', 'backup', 'inventory'])}"
+        for _ in range(max(20, control_count))
+    })
+
+    return [
+        {
+            "id": f"SYN.{n:05d}",
+            "function": rng.choice(FUNCTIONS),
+            "name": f"Synthetic Control {n}",
+            "required_elements": rng.sample(vocabulary, rng.randint(2, 5)),
+            "severity": rng.choice(SEVERITIES),
+        }
+        for n in range(control_count)
+    ]
+
+
+# -------------------------------------------------------------------
+# Document Formats
+# -------------------------------------------------------------------
+def synthetic_docx(text: str) -> bytes:
+    """
+    One DOCX paragraph per line of text.
+    """
+    from docx import Document
+
+    document = Document()
+    for line in text.split("\n"):
+        document.add_paragraph(line)
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+    'relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+_DOCX_PARAGRAPH_PROPERTIES = (
+    '<w:pPr><w:pStyle w:val="BodyText"/><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs>'
+    '<w:spacing w:after="120"/></w:pPr>'
+)
+
+
+def synthetic_structured_docx(text: str, runs_per_paragraph: int = 4,
+                              table_every: int = 7, revision_every: int = 11) -> bytes:
+    """
+    One paragraph per line of text, written the way word processors
+    do: styled runs, every `table_every`th line as a two-cell table row
+    and every `revision_every`th line with a tracked insertion and
+    deletion (the deleted words are not part of the text).
+    """
+    from xml.sax.saxutils import escape
+
+    def runs(line: str) -> str:
+        words = line.split(" ")
+        size = max(1, -(-len(words) // runs_per_paragraph))
+        chunks = [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+        return "".join(
+            f'<w:r><w:rPr><w:rFonts w:ascii="Calibri"/>{"<w:b/>" if n % 2 else ""}'
+            f'<w:sz w:val="22"/></w:rPr><w:t xml:space="preserve">'
+            f'{escape(chunk)}{" " if n < len(chunks) - 1 else ""}</w:t></w:r>'
+            for n, chunk in enumerate(chunks)
+        )
+
+    def paragraph(inner: str) -> str:
+        return f"<w:p>{_DOCX_PARAGRAPH_PROPERTIES}{inner}</w:p>"
+
+    body = []
+    for n, line in enumerate(text.split("\n")):
+        if table_every and n % table_every == table_every - 1:
+            body.append(
+                '<w:tbl><w:tblPr><w:tblW w:w="0" w:type="auto"/></w:tblPr><w:tr>'
+                f'<w:tc>{paragraph(runs(f"Requirement {n}"))}</w:tc>'
+                f"<w:tc>{paragraph(runs(line))}</w:tc></w:tr></w:tbl>"
+            )
+        elif revision_every and n % revision_every == revision_every - 1:
+            body.append(paragraph(
+                f'<w:ins w:id="{n}" w:author="editor">{runs(line)}</w:ins>'
+                f'<w:del w:id="{n}d" w:author="editor"><w:r>'
+                f'<w:delText xml:space="preserve"> obsolete wording</w:delText></w:r></w:del>'
+            ))
+        else:
+            body.append(paragraph(runs(line)))
+
+    return docx_package(
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{"".join(body)}<w:sectPr/></w:body></w:document>'
+    )
+
+
+def docx_package(document_xml: str) -> bytes:
+    """
+    A minimal DOCX around the given word/document.xml content.
+    """
+    import zipfile
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in (
+            ("[Content_Types].xml", _DOCX_CONTENT_TYPES),
+            ("_rels/.rels", _DOCX_RELS),
+            ("word/document.xml",
+             '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>' + document_xml),
+        ):
+            # Fixed timestamps keep the bytes deterministic
+            archive.writestr(zipfile.ZipInfo(name, (1980, 1, 1, 0, 0, 0)), data,
+                             zipfile.ZIP_DEFLATED)
+    return buffer.getvalue()
+
+
+def synthetic_pdf(text: str, line_width: int = 90, lines_per_page: int = 60) -> bytes:
+    """
+    A minimal text PDF (Helvetica, uncompressed content streams) that
+    PyPDF2 can extract. Long lines are wrapped at word boundaries.
+    """
+    lines = []
+    for paragraph in text.split("\n"):
+        words, current = paragraph.split(" "), ""
+        for word in words:
+            if current and len(current) + 1 + len(word) > line_width:
+                lines.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        lines.append(current)
+
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # Objects: 1 catalog, 2 page tree, 3 font, then (page, content) pairs
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        stream = ["BT /F1 10 Tf 12 TL 40 760 Td"]
+        for line in page_lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            stream.append(f"({escaped}) Tj T*")
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1", "replace")
+
+        page_id, content_id = len(objects) + 1, len(objects) + 2
+        page_ids.append(page_id)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
@@ -6,7 +6,7 @@ from typing import List, Dict
 # Import components (Do NOT modify these imports)
 from src.parser.policy_parser import parse_policy
 from src.compliance.control_loader import load_controls
-from src.compliance.gap_engine import evaluate_control
+from src.compliance.gap_engine import evaluate_controls
 from src.llm.llm_engine import Phi3PolicyDraftingEngine
 
 
@@ -43,10 +43,10 @@ async def main():
         try:
             # 2. Parse Policy
             print("Parsing policy...")
-            policy_text = await parse_policy(policy_file)
+            clauses = await parse_policy(policy_file)
             
-            if not policy_text or policy_text.startswith("Error"):
-                print(f"Policy parsing failed: {policy_text}")
+            if not clauses:
+                print("Policy parsing failed: no policy clauses extracted.")
                 sys.exit(1)
                 
         finally:
@@ -67,18 +67,10 @@ async def main():
 
         # 4. Run Gap Detection
         print("Running gap analysis...")
-        gaps = []
-        
-        # Prepare policy clauses (gap_engine expects clauses list, joins them internally)
-        # We pass the full text as a single clause since parsing is handled
-        # policy_text is a single strong string
-        
-        for control in controls:
-            # evaluate_control(control: Dict, clauses: List[str]) -> Dict
-            result = evaluate_control(control, [policy_text])
-            
-            if result["status"] != "ADEQUATE":
-                gaps.append(result)
+        # parse_policy already returns normalized clauses;
+        # evaluate_controls(controls, clauses) scans them once for all controls
+        results = evaluate_controls(controls, clauses)
+        gaps = [result for result in results if result["status"] != "ADEQUATE"]
 
         print(f"Found {len(gaps)} gaps to address.\n")
 
@@ -0,0 +1,299 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# -------------------------
+# Configuration
+# -------------------------
+# In-memory budget per tier (MB) and optional on-disk store (off by default)
+CACHE_MB_PER_TIER = float(os.environ.get("POLICY_CACHE_MB", "64"))
+CACHE_DIR = os.environ.get("POLICY_CACHE_DIR") or None
+
+# On-disk budget per tier (MB); the oldest files (by mtime) are deleted beyond it
+CACHE_DISK_MB_PER_TIER = float(os.environ.get("POLICY_CACHE_DISK_MB", "1024"))
+
+# Pruning deletes down to this share of the disk budget, so it runs rarely
+DISK_PRUNE_TARGET = 0.8
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+# -------------------------
+# Keys
+# -------------------------
+def file_digest(stream: BinaryIO) -> str:
+    """
+    SHA-256 of an uploaded file, read in blocks and rewound afterwards.
+    """
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for block in iter(lambda: stream.read(HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def cache_key(*parts: str) -> str:
+    """
+    Combines a content digest with the versions the cached value depends on.
+    """
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+# -------------------------
+# Single Tier
+# -------------------------
+class CacheTier:
+    """
+    Thread-safe LRU of JSON-serializable values, bounded by total bytes.
+
+    Values are stored serialized, so the size accounting is exact and
+    callers never share (and mutate) a cached object. With `disk_dir`
+    set, every entry is also written there and memory misses fall back
+    to disk. The disk store is bounded by `max_disk_bytes`: once past
+    it, the least recently written or read files are deleted.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_bytes: int,
+        disk_dir: Optional[Path] = None,
+        max_disk_bytes: Optional[int] = None,
+    ):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) / name if disk_dir else None
+        self.max_disk_bytes = (
+            int(CACHE_DISK_MB_PER_TIER * 1024 * 1024) if max_disk_bytes is None else max_disk_bytes
+        )
+        # Bytes on disk, counted on the first write (other processes may share the directory)
+        self._disk_bytes: Optional[int] = None
+        self._disk_lock = threading.Lock()
+
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+    def get(self, key: str):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(data)
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store(key, data)
+        return json.loads(data)
+
+    def put(self, key: str, value) -> None:
+        data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._store(key, data)
+        self._write_disk(key, data)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _store(self, key: str, data: bytes) -> None:
+        # Entries larger than the whole tier only live on disk
+        if len(data) > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+
+        self._entries[key] = data
+        self._bytes += len(data)
+
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            # Reads count as use: keeps hot entries out of pruning
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write_disk(self, key: str, data: bytes) -> None:
+        if self.disk_dir is None:
+            return
+        if len(data) > self.max_disk_bytes:
+            return
+
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[Cache] ⚠️ Could not write {self.name} entry to disk: {e}")
+            return
+
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+            else:
+                self._disk_bytes += len(data)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._prune_disk()
+
+    def _disk_files(self) -> List[Tuple[float, int, str]]:
+        """
+        (mtime, size, path) of every cached file of this tier.
+        """
+        files = []
+        try:
+            shards = list(os.scandir(self.disk_dir))
+        except OSError:
+            return files
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            try:
+                entries = list(os.scandir(shard.path))
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def _prune_disk(self) -> None:
+        """
+        Deletes the oldest files until the tier is back under
+        DISK_PRUNE_TARGET of its disk budget. Recounts from the directory,
+        since overwrites and other processes make the running total drift.
+        """
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * DISK_PRUNE_TARGET
+        for _, size, path in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.disk_evictions += 1
+        self._disk_bytes = total
+
+
+# -------------------------
+# Analysis Cache
+# -------------------------
+class AnalysisCache:
+    """
+    Content-addressed cache for the analysis pipeline:
+    - text:    extracted raw text      (file digest + parser version)
+    - clauses: normalized clause list  (file digest + parser version)
+    - results: compliance output       (file digest + parser, catalog
+                                        and engine versions)
+    - revisions: per-clause match vectors of the latest version of a
+                 document                (caller-chosen document id)
+    """
+
+    def __init__(
+        self,
+        max_bytes_per_tier: int,
+        disk_dir: Optional[str] = None,
+        max_disk_bytes_per_tier: Optional[int] = None,
+    ):
+        tier = lambda name: CacheTier(name, max_bytes_per_tier, disk_dir, max_disk_bytes_per_tier)
+        self.text = tier("text")
+        self.clauses = tier("clauses")
+        self.results = tier("results")
+        self.revisions = tier("revisions")
+
+    def tiers(self):
+        return (self.text, self.clauses, self.results, self.revisions)
+
+    def stats(self) -> Dict:
+        return {tier.name: tier.stats() for tier in self.tiers()}
+
+    def clear(self) -> None:
+        for tier in self.tiers():
+            tier.clear()
+
+
+def record_into(tier: CacheTier, key: str, items: Iterable) -> Iterator:
+    """
+    Passes items through while collecting them; the full list is cached
+    once the iterable is exhausted. Collection stops as soon as the list
+    could no longer fit in the tier, keeping streaming memory bounded.
+    """
+    collected = []
+    size = 0
+    for item in items:
+        if collected is not None:
+            size += len(item) + 3
+            if size > tier.max_bytes:
+                collected = None
+            else:
+                collected.append(item)
+        yield item
+
+    if collected is not None:
+        tier.put(key, collected)
+
+
+CACHE = AnalysisCache(int(CACHE_MB_PER_TIER * 1024 * 1024), CACHE_DIR)
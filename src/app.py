@@ -1,20 +1,73 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pathlib import Path
 import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from fastapi import FastAPI, File, Request, UploadFile, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 
 # Parser
-from src.parser.policy_parser import parse_policy
+from src.parser.policy_parser import PARSER_VERSION, iter_policy_clauses
+# Cache
+from src import metrics
+from src.analysis_cache import CACHE, cache_key, file_digest, record_into
+# Jobs
+from src.jobs import JOB_DB_PATH, JobQueue, JobStore, QueueFull, analysis_job
 #llm
-from src.llm.llm_runner import run_llm_on_gaps
+from src.llm.llm_runner import run_llm_on_gaps, stream_llm_on_gaps
 
 
 # Compliance engine (YOUR WORK)
-from src.compliance.gap_engine import evaluate_control
-from src.compliance.grouping import group_by_function
-from src.compliance.scoring import compute_compliance_score
+from src.compliance.control_loader import get_catalog
+from src.compliance.frameworks import (
+    FrameworkSet,
+    available_frameworks,
+    compliance_report,
+    framework_reports,
+    get_frameworks,
+)
+from src.compliance.gap_engine import ENGINE_VERSION, evaluate_controls
+from src.compliance.incremental import evaluate_revision
+from src.compliance.retrieval import RETRIEVAL_THRESHOLD, evaluate_controls_bm25
+
+# Element matching: "keyword" (exact phrases + synonyms) or "bm25" (retrieval)
+MATCHING_MODE = os.environ.get("POLICY_MATCHING", "keyword")
+
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Process-wide job queue, started on first use. Jobs left queued or
+    running by a previous process are resumed.
+    """
+    global _job_queue
+
+    with _job_queue_lock:
+        if _job_queue is None:
+            process = analysis_job(
+                analyze_upload, lambda results: stream_llm_on_gaps(results)
+            )
+            _job_queue = JobQueue(JobStore(JOB_DB_PATH), process)
+            _job_queue.start()
+        return _job_queue
+
 
-app = FastAPI(title="Policy Gap Analyzer API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Started with the server so interrupted jobs resume right away
+    get_job_queue()
+    yield
+    if _job_queue is not None:
+        _job_queue.stop()
+
+
+app = FastAPI(title="Policy Gap Analyzer API", lifespan=lifespan)
 
 # -------------------------
 # CORS
@@ -30,41 +83,212 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+
 # -------------------------
-# Load Controls (NIST CSF)
+# Server-Timing
 # -------------------------
-ROOT_DIR = Path(__file__).resolve().parents[1]
-CONTROLS_PATH = ROOT_DIR / "data" / "controls" / "nist_controls.json"
-
-
-def load_controls():
-    with open(CONTROLS_PATH, "r", encoding="utf-8") as f:
-        return json.load(f)
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """
+    Adds the stage times of the request (parse, evaluate, llm, ...) as a
+    Server-Timing header. Streamed bodies are only covered up to the
+    point where the response starts.
+    """
+    if not metrics.ENABLED:
+        return await call_next(request)
 
+    start = time.perf_counter()
+    with metrics.request_timings() as timings:
+        response = await call_next(request)
+    response.headers["Server-Timing"] = metrics.server_timing(
+        timings, time.perf_counter() - start
+    )
+    return response
 
 # -------------------------
 # Compliance Runner
 # -------------------------
-def run_compliance(policy_text: str):
+def run_compliance(clauses: Iterable[str], catalog=None):
     """
     Runs deterministic compliance analysis.
+    Clauses are consumed incrementally, so a streaming parser never
+    has to materialize the whole document.
     """
-    clauses = policy_text.lower().split(".")
-    controls = load_controls()
+    return compliance_report(evaluate_catalog(clauses, catalog or get_catalog()))
 
-    results = []
-    for control in controls:
-        results.append(evaluate_control(control, clauses))
+
+def run_frameworks(clauses: Iterable[str], frameworks) -> Dict[str, Dict]:
+    """
+    Runs compliance analysis for every framework of a FrameworkSet in
+    one pass over the clauses. Returns run_compliance's output per
+    framework name.
+    """
+    return framework_reports(frameworks, evaluate_catalog(clauses, frameworks))
+
+
+def evaluate_catalog(clauses: Iterable[str], catalog) -> List[Dict]:
+    """
+    Control results of a catalog (or FrameworkSet) in the configured
+    matching mode.
+    """
+    if MATCHING_MODE == "bm25":
+        return evaluate_controls_bm25(catalog.controls, clauses, compiled=catalog.compiled)
+    return evaluate_controls(catalog.controls, clauses, catalog.compiled)
+
+
+def analyze_upload(stream, filename: str, frameworks: Optional[FrameworkSet] = None) -> Dict:
+    """
+    Cached analysis of an uploaded file. The upload is hashed first;
+    a result or clause cache hit skips PDF/DOCX parsing entirely.
+
+    Returns {"document": {"clauses": n}, "frameworks": {name: report},
+    "compliance": <report of the first framework>}, where each report is
+    run_compliance's output. `frameworks` defaults to POLICY_FRAMEWORKS.
+    """
+    digest = file_digest(stream)
+    file_type = Path(filename).suffix.lower()
+    framework_set = frameworks or get_frameworks()
+
+    result_key = cache_key(
+        digest, file_type, PARSER_VERSION, framework_set.version, ENGINE_VERSION,
+        _matching_version(),
+    )
+    analysis = CACHE.results.get(result_key)
+    if analysis is not None:
+        return analysis
+
+    document = {"clauses": 0}
+    clauses = _counted(_cached_clauses(stream, filename, digest), document)
+    reports = run_frameworks(clauses, framework_set)
+    analysis = {
+        "compliance": reports[framework_set.names[0]],
+        "frameworks": reports,
+        "document": document,
+    }
+    if metrics.ENABLED:
+        metrics.observe_document(stream.seek(0, os.SEEK_END), document["clauses"])
+    CACHE.results.put(result_key, analysis)
+    return analysis
+
+
+def analyze_revision(stream, filename: str, document_id: str) -> Dict:
+    """
+    Analysis of a new version of a known document. Match vectors of the
+    previous version's clauses are reused, so only new or edited clauses
+    are evaluated, and the control status changes are reported.
+    """
+    digest = file_digest(stream)
+    catalog = get_catalog()
+
+    state_key = cache_key("revision", document_id)
+    revision = evaluate_revision(
+        catalog.controls,
+        _cached_clauses(stream, filename, digest),
+        previous=CACHE.revisions.get(state_key),
+        compiled=catalog.compiled,
+        catalog_version=catalog.version,
+    )
+    CACHE.revisions.put(state_key, revision.state)
 
     return {
-        "grouped_results": group_by_function(results),
-        "summary": compute_compliance_score(results),
-        "raw_results": results,
+        "compliance": compliance_report(revision.results),
+        "changes": revision.changes,
+        "document": {
+            "clauses": revision.reused + revision.evaluated,
+            "reused": revision.reused,
+            "evaluated": revision.evaluated,
+        },
     }
 
 
+def _cached_clauses(stream, filename: str, digest: str) -> Iterable[str]:
+    file_type = Path(filename).suffix.lower()
+    clause_key = cache_key(digest, file_type, PARSER_VERSION)
+    clauses = CACHE.clauses.get(clause_key)
+    if clauses is None:
+        clauses = record_into(
+            CACHE.clauses, clause_key, iter_policy_clauses(stream, filename)
+        )
+    return clauses
+
+
+def _matching_version() -> str:
+    if MATCHING_MODE == "bm25":
+        return f"bm25:{RETRIEVAL_THRESHOLD}"
+    return MATCHING_MODE
+
+
+def _framework_names(frameworks: Optional[str]) -> Optional[List[str]]:
+    """
+    "nist, iso27001" -> ["nist", "iso27001"]; None when not given.
+    """
+    if not frameworks:
+        return None
+    return [name.strip() for name in frameworks.split(",") if name.strip()] or None
+
+
+def _framework_set(names: Optional[List[str]]) -> FrameworkSet:
+    """
+    The requested frameworks, resolved once per request; 400 on unknown names.
+    """
+    try:
+        return get_frameworks(names)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _counted(clauses: Iterable[str], document: Dict) -> Iterator[str]:
+    for clause in clauses:
+        document["clauses"] += 1
+        yield clause
+
+
+def iter_analysis_events(
+    stream, filename: str, draft: bool = True, frameworks: Optional[FrameworkSet] = None
+) -> Iterator[Dict]:
+    """
+    Progressive analysis, one event at a time:
+    parse summary -> one event per control -> compliance score ->
+    remediation drafts streamed as the model writes them -> done.
+    Control events and drafts cover the first framework; the score
+    event carries every framework's summary.
+    """
+    start = time.perf_counter()
+
+    try:
+        analysis = analyze_upload(stream, filename, frameworks)
+    except Exception as e:
+        yield {"event": "error", "detail": str(e)}
+        return
+
+    compliance = analysis["compliance"]
+    yield {
+        "event": "parse",
+        "filename": filename,
+        **analysis["document"],
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+    for result in compliance["raw_results"]:
+        yield {"event": "control", **result}
+
+    yield {
+        "event": "score",
+        **compliance["summary"],
+        "frameworks": {
+            name: report["summary"] for name, report in analysis["frameworks"].items()
+        },
+    }
+
+    if draft:
+        yield from stream_llm_on_gaps(compliance["raw_results"])
+
+    yield {"event": "done", "seconds": round(time.perf_counter() - start, 3)}
+
+
 # -------------------------
 # Endpoints
 # -------------------------
@@ -73,19 +297,113 @@ def root():
     return {"message": "Policy Gap Analyzer API is running."}
 
 
+@app.get("/cache/stats")
+def cache_stats():
+    """
+    Hit/miss counters and bytes held per cache tier.
+    """
+    return CACHE.stats()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """
+    Stage durations, document sizes, clause counts, LLM tokens and peak
+    memory in the Prometheus text format.
+    """
+    return PlainTextResponse(
+        metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/frameworks")
+def list_frameworks():
+    """
+    Control frameworks that can be requested, and the default selection.
+    """
+    return {"available": available_frameworks(), "default": get_frameworks().names}
+
+
 @app.post("/analyze")
-async def analyze_policy(file: UploadFile = File(...)):
+async def analyze_policy(file: UploadFile = File(...), frameworks: Optional[str] = None):
     """
     Upload a policy file and receive compliance gap analysis.
+    With `frameworks` (comma-separated, e.g. "nist,iso27001,cis") the
+    document is evaluated against all of them in one pass and the
+    response also holds each framework's results under "frameworks".
     """
+    names = _framework_names(frameworks)
+    framework_set = _framework_set(names)
+
     try:
-        policy_text = await parse_policy(file)
-        compliance_output = run_compliance(policy_text)
+        analysis = analyze_upload(file.file, file.filename, framework_set)
 
-        return {
+        response = {
             "filename": file.filename,
-            "compliance": compliance_output,
+            "compliance": analysis["compliance"],
         }
+        if names:
+            response["frameworks"] = analysis["frameworks"]
+        return response
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/analyze/revision")
+async def analyze_policy_revision(document_id: str, file: UploadFile = File(...)):
+    """
+    Upload a new version of a document previously analyzed under the same
+    `document_id`. Returns the compliance analysis plus the controls whose
+    status changed since that version.
+    """
+    try:
+        analysis = analyze_revision(file.file, file.filename, document_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {"filename": file.filename, "document_id": document_id, **analysis}
+
+
+@app.post("/analyze/stream")
+def analyze_policy_stream(
+    file: UploadFile = File(...), draft: bool = True, frameworks: Optional[str] = None
+):
+    """
+    Same analysis as /analyze, streamed as NDJSON (one JSON event per
+    line) so clients can render results while remediation is drafted.
+    """
+    events = iter_analysis_events(
+        file.file, file.filename, draft=draft,
+        frameworks=_framework_set(_framework_names(frameworks)),
+    )
+    return StreamingResponse(
+        (json.dumps(event) + "\n" for event in events),
+        media_type="application/x-ndjson",
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def submit_job(file: UploadFile = File(...), draft: bool = True):
+    """
+    Queue a policy file for analysis and return its job id immediately.
+    Poll GET /jobs/{job_id} for progress. Returns 429 when the queue is full.
+    """
+    content = await file.read()
+    try:
+        job_id = get_job_queue().submit(file.filename, content, {"draft": draft})
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Job queue is full: {e}")
+
+    return {"job_id": job_id, "status": "queued"}
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str):
+    """
+    Job status, the partial result published so far and the final result.
+    """
+    job = get_job_queue().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return job
@@ -0,0 +1,236 @@
+"""
+Analyzes a corpus of policy documents in bulk.
+
+Usage (from the project root):
+    python -m src.batch_analyze <directory or glob> [--output results.jsonl] [--workers N]
+                                [--rollup rollup.json]
+
+Every TXT/PDF/DOCX file is parsed and evaluated against the control
+catalog in a pool of worker processes. One JSON record per document is
+appended to the output as soon as that document finishes, so a re-run
+with the same output skips everything already analyzed (failed files
+are retried).
+
+With --rollup, the fleet-wide statistics (per-control gap rates,
+per-function maturity, severity-weighted score) are merged into that
+JSON file at the end of the run, so resumed runs and separate shards
+accumulate into one rollup.
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from src.compliance.aggregates import ComplianceAggregate
+from src.compliance.control_loader import get_catalog
+from src.compliance.gap_engine import evaluate_controls
+from src.compliance.scoring import compute_compliance_score
+from src.parser.policy_parser import iter_policy_clauses
+
+
+SUPPORTED_SUFFIXES = (".txt", ".pdf", ".docx")
+
+
+def find_documents(target: str) -> List[Path]:
+    """
+    Policy files under a directory (recursively) or matching a glob.
+    """
+    if os.path.isdir(target):
+        candidates = Path(target).rglob("*")
+    else:
+        candidates = (Path(p) for p in glob.glob(target, recursive=True))
+
+    return sorted(
+        p.resolve() for p in candidates
+        if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES
+    )
+
+
+def completed_paths(output: Path) -> Set[str]:
+    """
+    Documents already analyzed successfully in a previous run.
+    """
+    done = set()
+    if not output.exists():
+        return done
+
+    with open(output, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # torn last line of an interrupted run
+            if "error" not in record:
+                done.add(record["path"])
+    return done
+
+
+def analyze_document(path: str) -> Dict:
+    """
+    Parses and evaluates one document. Never raises: failures are
+    reported in the record's "error" field. Results are ControlResults
+    (compact to send between processes); write_record converts them.
+    """
+    start = time.perf_counter()
+    record = {"path": path, "filename": os.path.basename(path)}
+
+    try:
+        catalog = get_catalog()
+        with open(path, "rb") as stream:
+            pages = None
+            def count_pages(count):
+                nonlocal pages
+                pages = count
+
+            clauses = 0
+            def counted():
+                nonlocal clauses
+                for clause in iter_policy_clauses(stream, path, workers=1, on_pages=count_pages):
+                    clauses += 1
+                    yield clause
+
+            results = evaluate_controls(
+                catalog.controls, counted(), catalog.compiled, compact=True
+            )
+
+        record.update({
+            "pages": pages,
+            "clauses": clauses,
+            "catalog_version": catalog.version,
+            "summary": compute_compliance_score(results),
+            "results": results,
+        })
+
+    except Exception as e:
+        record["error"] = str(e)
+
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def analyze_corpus(paths: List[str], workers: int) -> Iterator[Dict]:
+    """
+    Yields document records in completion order.
+    """
+    if workers == 1:
+        for path in paths:
+            yield analyze_document(path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_document, path) for path in paths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_record(out, record: Dict, aggregate: Optional[ComplianceAggregate] = None) -> None:
+    """
+    Adds the document to the rollup and appends its JSON record, with
+    the results in the API's dict shape.
+    """
+    results = record.get("results")
+    if results is not None:
+        if aggregate is not None:
+            aggregate.add_document(results)
+        record["results"] = [result.to_dict() for result in results]
+
+    out.write(json.dumps(record) + "\n")
+    out.flush()
+
+
+def corpus_summary(aggregate: ComplianceAggregate) -> str:
+    """
+    Overall compliance and maturity per NIST function over the run.
+    """
+    if not aggregate.documents:
+        return "no documents analyzed"
+
+    overall = aggregate.score()
+    weighted = aggregate.severity_weighted_score()
+    functions = ", ".join(
+        f"{function} {score['compliance_percentage']}% ({score['maturity_level']})"
+        for function, score in aggregate.function_scores().items()
+    )
+    return (f"compliance {overall['compliance_percentage']}% ({overall['maturity_level']}), "
+            f"severity-weighted {weighted['compliance_percentage']}% over "
+            f"{aggregate.documents} documents; per function: {functions}")
+
+
+def load_rollup(path: Path) -> ComplianceAggregate:
+    if not path.exists():
+        return ComplianceAggregate()
+    return ComplianceAggregate.from_dict(json.loads(path.read_text(encoding="utf-8"))["counts"])
+
+
+def save_rollup(path: Path, aggregate: ComplianceAggregate) -> None:
+    """
+    Writes the rollup (summary plus the raw counts it merges from).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(
+        json.dumps({"summary": aggregate.summary(), "counts": aggregate.to_dict()}, indent=2),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("target", help="directory or glob of TXT/PDF/DOCX policies")
+    parser.add_argument("--output", default="batch_results.jsonl",
+                        help="JSONL file results are appended to")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes")
+    parser.add_argument("--rollup", help="JSON file fleet-wide statistics are merged into")
+    args = parser.parse_args(argv)
+
+    output = Path(args.output)
+    documents = find_documents(args.target)
+    done = completed_paths(output)
+    todo = [str(p) for p in documents if str(p) not in done]
+
+    print(f"[Batch] {len(documents)} documents found, {len(documents) - len(todo)} "
+          f"already in {output}, {len(todo)} to analyze")
+    if not todo:
+        return
+
+    # Fail fast on a broken catalog instead of once per document
+    get_catalog()
+    aggregate = ComplianceAggregate()
+
+    start = time.perf_counter()
+    finished = failed = pages = 0
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "a", encoding="utf-8") as out:
+        for record in analyze_corpus(todo, max(1, args.workers)):
+            write_record(out, record, aggregate)
+
+            finished += 1
+            if "error" in record:
+                failed += 1
+                print(f"[Batch] ({finished}/{len(todo)}) ⚠️ {record['filename']}: {record['error']}")
+            else:
+                pages += record["pages"] or 0
+                print(f"[Batch] ({finished}/{len(todo)}) {record['filename']}: "
+                      f"{record['summary']['compliance_percentage']}% in {record['seconds']}s")
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"[Batch] {finished} documents ({failed} failed) in {elapsed:.1f}s: "
+          f"{finished / elapsed:.2f} docs/sec, {pages / elapsed:.2f} PDF pages/sec")
+    print(f"[Batch] {corpus_summary(aggregate)}")
+
+    if args.rollup:
+        rollup = Path(args.rollup)
+        total = load_rollup(rollup).merge(aggregate)
+        save_rollup(rollup, total)
+        print(f"[Batch] rollup of {total.documents} documents written to {rollup}")
+
+
+if __name__ == "__main__":
+    main()
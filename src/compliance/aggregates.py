@@ -0,0 +1,268 @@
+"""
+Mergeable compliance statistics for fleet-wide rollups.
+
+ComplianceAggregate keeps only status counts. It keeps them per
+control, per NIST function, per severity and for the whole fleet, plus
+missing-element counts and the maturity of every document. Memory
+depends on the catalog size, never on the number of documents.
+
+Aggregates are updated one result or one document at a time. They can
+be merged (a + b) across worker processes or shards, and they
+round-trip through to_dict() / from_dict() as JSON. The percentages
+and maturity levels are score_from_counts over the pooled counts, so
+they equal compute_compliance_score over the same subset of results.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from src.compliance.results import ControlResult, Status
+from src.compliance.scoring import score_from_counts
+
+
+# Relative weight of a control's score in the severity-weighted score
+SEVERITY_WEIGHTS = {"Critical": 4, "High": 3, "Medium": 2, "Low": 1}
+DEFAULT_SEVERITY_WEIGHT = 1
+
+_MISSING, _WEAK, _ADEQUATE = int(Status.MISSING), int(Status.WEAK), int(Status.ADEQUATE)
+
+
+def _status_code(status) -> int:
+    return status if isinstance(status, int) else Status[status]
+
+
+def _score(counts: List[int]) -> Dict:
+    """
+    compute_compliance_score of the results behind [missing, weak, adequate].
+    """
+    total = sum(counts)
+    if not total:
+        return {"compliance_percentage": 0.0, "maturity_level": "Weak"}
+    return score_from_counts(counts[_ADEQUATE], counts[_WEAK], total)
+
+
+def _gap_rates(counts: List[int]) -> Dict:
+    total = sum(counts) or 1
+    return {
+        "missing": counts[_MISSING],
+        "weak": counts[_WEAK],
+        "adequate": counts[_ADEQUATE],
+        "gap_rate": round((counts[_MISSING] + counts[_WEAK]) / total, 4),
+        "missing_rate": round(counts[_MISSING] / total, 4),
+    }
+
+
+def _add_counts(into: Dict[str, List[int]], other: Dict[str, List[int]]) -> None:
+    for key, counts in other.items():
+        totals = into.setdefault(key, [0, 0, 0])
+        for status, count in enumerate(counts):
+            totals[status] += count
+
+
+class ComplianceAggregate:
+    """
+    Running status counts over any number of results and documents.
+    """
+
+    def __init__(self):
+        self.documents = 0
+        self.document_maturity: Dict[str, int] = {}
+        self.controls: Dict[str, List[int]] = {}
+        self.control_info: Dict[str, Dict[str, str]] = {}
+        self.functions: Dict[str, List[int]] = {}
+        self.severities: Dict[str, List[int]] = {}
+        self.missing_elements: Dict[str, Counter] = {}
+        # control_id -> the counters _count updates
+        self._rows: Dict[str, tuple] = {}
+
+    # -----------------------------
+    # Updates
+    # -----------------------------
+    def add_result(self, result) -> int:
+        """
+        Counts one control result (a result dict or ControlResult) and
+        returns its status code.
+        """
+        if type(result) is ControlResult:
+            control = result.control
+            return self._count(
+                int(result.status), control.id, control.name, control.function,
+                control.severity, result.missing_elements,
+            )
+        return self._count(
+            _status_code(result["status"]), result["control_id"], result["control_name"],
+            result["nist_function"], result["severity"], result["missing_elements"],
+        )
+
+    def _count(self, status: int, control_id: str, name: str, function: str,
+               severity: str, missing) -> int:
+        row = self._rows.get(control_id)
+        if row is None:
+            row = self._row(control_id, name, function, severity)
+        row[0][status] += 1
+        row[1][status] += 1
+        row[2][status] += 1
+
+        if missing:
+            row[3].update(missing)
+        return status
+
+    def _row(self, control_id: str, name: str, function: str, severity: str):
+        """
+        The control's own, function and severity counters, and its
+        missing-element counts (looked up once per control, not per result).
+        """
+        info = self.control_info.setdefault(control_id, {
+            "control_name": name,
+            "nist_function": function,
+            "severity": severity,
+        })
+        row = self._rows[control_id] = (
+            self.controls.setdefault(control_id, [0, 0, 0]),
+            self.functions.setdefault(info["nist_function"], [0, 0, 0]),
+            self.severities.setdefault(info["severity"], [0, 0, 0]),
+            self.missing_elements.setdefault(control_id, Counter()),
+        )
+        return row
+
+    def add_document(self, results: Iterable) -> Dict:
+        """
+        Counts one document's results. Returns its compliance score,
+        the same as compute_compliance_score(results).
+        """
+        counts = [0, 0, 0]
+        for result in results:
+            counts[self.add_result(result)] += 1
+
+        score = _score(counts)
+        self.documents += 1
+        maturity = score["maturity_level"]
+        self.document_maturity[maturity] = self.document_maturity.get(maturity, 0) + 1
+        return score
+
+    def merge(self, other: "ComplianceAggregate") -> "ComplianceAggregate":
+        """
+        Adds another aggregate's counts into this one (in place).
+        """
+        self.documents += other.documents
+        for maturity, count in other.document_maturity.items():
+            self.document_maturity[maturity] = self.document_maturity.get(maturity, 0) + count
+
+        for control_id, info in other.control_info.items():
+            self.control_info.setdefault(control_id, dict(info))
+        _add_counts(self.controls, other.controls)
+        _add_counts(self.functions, other.functions)
+        _add_counts(self.severities, other.severities)
+
+        for control_id, elements in other.missing_elements.items():
+            self.missing_elements.setdefault(control_id, Counter()).update(elements)
+        return self
+
+    def __iadd__(self, other: "ComplianceAggregate") -> "ComplianceAggregate":
+        return self.merge(other)
+
+    def __add__(self, other: "ComplianceAggregate") -> "ComplianceAggregate":
+        return ComplianceAggregate().merge(self).merge(other)
+
+    # -----------------------------
+    # Rollups
+    # -----------------------------
+    def status_counts(self) -> List[int]:
+        """
+        [missing, weak, adequate] over every counted result.
+        """
+        totals = [0, 0, 0]
+        for counts in self.functions.values():
+            for status, count in enumerate(counts):
+                totals[status] += count
+        return totals
+
+    def score(self) -> Dict:
+        """
+        Compliance percentage and maturity over every counted result.
+        """
+        return _score(self.status_counts())
+
+    def function_scores(self) -> Dict[str, Dict]:
+        """
+        Score and gap rates per NIST function.
+        """
+        return {
+            function: {**_score(counts), **_gap_rates(counts)}
+            for function, counts in sorted(self.functions.items())
+        }
+
+    def control_stats(self) -> Dict[str, Dict]:
+        """
+        Gap rates per control, with its most often missing elements first.
+        """
+        stats = {}
+        for control_id, counts in sorted(self.controls.items()):
+            elements = self.missing_elements.get(control_id, {})
+            stats[control_id] = {
+                **self.control_info[control_id],
+                **_score(counts),
+                **_gap_rates(counts),
+                "missing_elements": dict(
+                    sorted(elements.items(), key=lambda item: (-item[1], item[0]))
+                ),
+            }
+        return stats
+
+    def severity_weighted_score(self, weights: Optional[Dict[str, int]] = None) -> Dict:
+        """
+        Compliance percentage and maturity where each result counts
+        with the weight of its control's severity.
+        """
+        weights = SEVERITY_WEIGHTS if weights is None else weights
+        weighted = [0, 0, 0]
+        for severity, counts in self.severities.items():
+            weight = weights.get(severity, DEFAULT_SEVERITY_WEIGHT)
+            for status, count in enumerate(counts):
+                weighted[status] += weight * count
+        return _score(weighted)
+
+    def summary(self) -> Dict:
+        """
+        The fleet-wide rollup as one JSON-ready dict.
+        """
+        return {
+            "documents": self.documents,
+            "document_maturity": dict(sorted(self.document_maturity.items())),
+            "overall": self.score(),
+            "severity_weighted": self.severity_weighted_score(),
+            "severities": {
+                severity: {**_score(counts), **_gap_rates(counts)}
+                for severity, counts in sorted(self.severities.items())
+            },
+            "functions": self.function_scores(),
+            "controls": self.control_stats(),
+        }
+
+    # -----------------------------
+    # Serialization
+    # -----------------------------
+    def to_dict(self) -> Dict:
+        """
+        Raw counts, for shipping between processes or storing per shard.
+        """
+        return {
+            "documents": self.documents,
+            "document_maturity": self.document_maturity,
+            "controls": self.controls,
+            "control_info": self.control_info,
+            "functions": self.functions,
+            "severities": self.severities,
+            "missing_elements": self.missing_elements,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ComplianceAggregate":
+        aggregate = cls()
+        aggregate.documents = data["documents"]
+        aggregate.document_maturity = dict(data["document_maturity"])
+        aggregate.controls = {k: list(v) for k, v in data["controls"].items()}
+        aggregate.control_info = {k: dict(v) for k, v in data["control_info"].items()}
+        aggregate.functions = {k: list(v) for k, v in data["functions"].items()}
+        aggregate.severities = {k: list(v) for k, v in data["severities"].items()}
+        aggregate.missing_elements = {k: Counter(v) for k, v in data["missing_elements"].items()}
+        return aggregate
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from src.compliance.gap_engine import CompiledControls, compile_controls
+
+
+# -------------------------
+# Catalog Location
+# -------------------------
+ROOT_DIR = Path(__file__).resolve().parents[2]
+CONTROLS_PATH = ROOT_DIR / "data" / "controls" / "nist_controls.json"
+
+# Minimum seconds between mtime checks of a loaded catalog
+RELOAD_CHECK_INTERVAL = 1.0
+
+REQUIRED_FIELDS = {
+    "id": str,
+    "function": str,
+    "name": str,
+    "required_elements": list,
+    "severity": str,
+}
+
+
+class ControlCatalog(NamedTuple):
+    """
+    Parsed, validated and precompiled control catalog.
+    `version` is the SHA-256 of the catalog file contents.
+    """
+    path: Path
+    version: str
+    mtime_ns: int
+    controls: List[Dict]
+    compiled: CompiledControls
+
+
+_catalogs: Dict[Path, ControlCatalog] = {}
+_last_checked: Dict[Path, float] = {}
+_lock = threading.Lock()
+
+
+# -------------------------
+# Public API
+# -------------------------
+def load_controls(path: Optional[Path] = None) -> List[Dict]:
+    """
+    Returns the controls of the catalog (cached per process).
+    The returned list is shared; treat it as read-only.
+    """
+    return get_catalog(path).controls
+
+
+def get_catalog(path: Optional[Path] = None) -> ControlCatalog:
+    """
+    Returns the cached catalog, reloading it only when the file's mtime
+    and then its content hash have changed. Checks are throttled to one
+    stat call per RELOAD_CHECK_INTERVAL, so a warm call does no I/O.
+    """
+    path = Path(path or CONTROLS_PATH).resolve()
+
+    with _lock:
+        cached = _catalogs.get(path)
+        now = time.monotonic()
+
+        if cached and now - _last_checked.get(path, 0.0) < RELOAD_CHECK_INTERVAL:
+            return cached
+
+        _last_checked[path] = now
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+            if cached and cached.mtime_ns == mtime_ns:
+                return cached
+            content = path.read_bytes()
+        except OSError as e:
+            if cached is None:
+                raise
+            # Missing or unreadable mid-save — keep the last good catalog
+            print(f"[Catalog] ⚠️ Could not read {path.name}, keeping version "
+                  f"{cached.version[:12]}: {e}")
+            return cached
+
+        version = hashlib.sha256(content).hexdigest()
+        if cached and cached.version == version:
+            # Touched but unchanged — keep the compiled catalog
+            cached = cached._replace(mtime_ns=mtime_ns)
+            _catalogs[path] = cached
+            return cached
+
+        try:
+            controls = validate_controls(json.loads(content.decode("utf-8")))
+        except ValueError as e:
+            if cached is None:
+                raise
+            # Keep serving the last good catalog while the file is being edited
+            print(f"[Catalog] ⚠️ Reload of {path.name} failed, keeping version "
+                  f"{cached.version[:12]}: {e}")
+            return cached
+
+        catalog = ControlCatalog(
+            path=path,
+            version=version,
+            mtime_ns=mtime_ns,
+            controls=controls,
+            compiled=compile_controls(controls),
+        )
+        _catalogs[path] = catalog
+        return catalog
+
+
+def validate_controls(data) -> List[Dict]:
+    """
+    Checks the catalog schema and raises ValueError on the first problem.
+    """
+    if not isinstance(data, list):
+        raise ValueError("Control catalog must be a JSON list of controls")
+
+    seen_ids = set()
+    for index, control in enumerate(data):
+        if not isinstance(control, dict):
+            raise ValueError(f"Control #{index} is not an object")
+
+        for field, expected_type in REQUIRED_FIELDS.items():
+            if field not in control:
+                raise ValueError(f"Control #{index} is missing '{field}'")
+            if not isinstance(control[field], expected_type):
+                raise ValueError(
+                    f"Control #{index} field '{field}' must be {expected_type.__name__}"
+                )
+
+        elements = control["required_elements"]
+        if not elements or not all(isinstance(e, str) and e for e in elements):
+            raise ValueError(
+                f"Control {control['id']} needs a non-empty list of element strings"
+            )
+
+        if control["id"] in seen_ids:
+            raise ValueError(f"Duplicate control id {control['id']}")
+        seen_ids.add(control["id"])
+
+    return data
+
+
+def clear_cache() -> None:
+    """
+    Drops all cached catalogs (mainly for tests).
+    """
+    with _lock:
+        _catalogs.clear()
+        _last_checked.clear()
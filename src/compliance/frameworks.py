@@ -0,0 +1,164 @@
+"""
+Several control frameworks (NIST, ISO 27001, CIS, ...) evaluated in one
+shared pass.
+
+Every catalog in data/controls named "<framework>_controls.json" is a
+framework, namespaced by that name. A FrameworkSet concatenates the
+controls of the selected frameworks and compiles them into one catalog:
+a document is normalized, split and scanned for keywords once, and the
+results are sliced back per framework. Each framework's results are
+exactly what evaluating its catalog alone would return.
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from src.compliance import control_loader
+from src.compliance.control_loader import ROOT_DIR, ControlCatalog, get_catalog
+from src.compliance.gap_engine import CompiledControls, compile_controls
+from src.compliance.grouping import group_by_function
+from src.compliance.scoring import compute_compliance_score
+
+
+# -------------------------
+# Framework Catalogs
+# -------------------------
+FRAMEWORKS_DIR = ROOT_DIR / "data" / "controls"
+CATALOG_SUFFIX = "_controls.json"
+
+# Frameworks evaluated when a request names none ("nist" = nist_controls.json)
+DEFAULT_FRAMEWORKS = tuple(
+    name.strip()
+    for name in os.environ.get("POLICY_FRAMEWORKS", "nist").split(",")
+    if name.strip()
+)
+
+
+class FrameworkSet(NamedTuple):
+    """
+    Controls of several frameworks compiled as one catalog.
+    `slices` gives each framework's range in `controls`; `version`
+    changes whenever any of the catalogs does.
+    """
+    names: Tuple[str, ...]
+    version: str
+    controls: List[Dict]
+    compiled: CompiledControls
+    slices: Dict[str, slice]
+    catalogs: Dict[str, ControlCatalog]
+
+
+_sets: Dict[Tuple[str, ...], FrameworkSet] = {}
+_lock = threading.Lock()
+
+# (directory mtime_ns, framework names), rescanned when the mtime changes
+_available: Optional[Tuple[int, Tuple[str, ...]]] = None
+_available_checked = 0.0
+
+
+def available_frameworks() -> List[str]:
+    """
+    Framework names in FRAMEWORKS_DIR. Like catalogs, the listing is
+    cached and the directory is checked at most once per
+    RELOAD_CHECK_INTERVAL, so a warm call does no I/O.
+    """
+    global _available, _available_checked
+
+    with _lock:
+        now = time.monotonic()
+        if _available is None or now - _available_checked >= control_loader.RELOAD_CHECK_INTERVAL:
+            _available_checked = now
+            mtime_ns = os.stat(FRAMEWORKS_DIR).st_mtime_ns
+            if _available is None or _available[0] != mtime_ns:
+                _available = (mtime_ns, tuple(sorted(
+                    path.name[:-len(CATALOG_SUFFIX)]
+                    for path in FRAMEWORKS_DIR.glob(f"*{CATALOG_SUFFIX}")
+                )))
+        return list(_available[1])
+
+
+def framework_path(name: str) -> Path:
+    """
+    Catalog file of a framework; raises ValueError for unknown names.
+    """
+    available = available_frameworks()
+    if name not in available:
+        raise ValueError(f"Unknown framework '{name}' (available: {', '.join(available)})")
+    return FRAMEWORKS_DIR / f"{name}{CATALOG_SUFFIX}"
+
+
+def get_frameworks(names: Optional[Sequence[str]] = None) -> FrameworkSet:
+    """
+    Returns the compiled set of the named frameworks (default:
+    POLICY_FRAMEWORKS), cached until one of their catalogs changes.
+    """
+    names = tuple(dict.fromkeys(names or DEFAULT_FRAMEWORKS))
+    if not names:
+        raise ValueError("No frameworks selected")
+
+    catalogs = {name: get_catalog(framework_path(name)) for name in names}
+    version = hashlib.sha256(
+        "\n".join(f"{name}:{catalogs[name].version}" for name in names).encode("utf-8")
+    ).hexdigest()
+
+    with _lock:
+        cached = _sets.get(names)
+        if cached is not None and cached.version == version:
+            return cached
+
+        slices = {}
+        start = 0
+        for name in names:
+            slices[name] = slice(start, start + len(catalogs[name].controls))
+            start = slices[name].stop
+
+        if len(names) == 1:
+            # One framework: its own compiled catalog, nothing to merge
+            controls = catalogs[names[0]].controls
+            compiled = catalogs[names[0]].compiled
+        else:
+            controls = [control for name in names for control in catalogs[name].controls]
+            compiled = compile_controls(controls)
+
+        frameworks = FrameworkSet(names, version, controls, compiled, slices, catalogs)
+        _sets[names] = frameworks
+        return frameworks
+
+
+# -------------------------
+# Results per Framework
+# -------------------------
+def split_results(frameworks: FrameworkSet, results: List) -> Dict[str, List]:
+    """
+    Slices the results of the combined catalog back into frameworks.
+    """
+    return {name: results[frameworks.slices[name]] for name in frameworks.names}
+
+
+def compliance_report(results: List[Dict]) -> Dict:
+    """
+    Grouped results, score and raw results of one catalog.
+    """
+    return {
+        "grouped_results": group_by_function(results),
+        "summary": compute_compliance_score(results),
+        "raw_results": results,
+    }
+
+
+def framework_reports(frameworks: FrameworkSet, results: List[Dict]) -> Dict[str, Dict]:
+    return {
+        name: compliance_report(framework_results)
+        for name, framework_results in split_results(frameworks, results).items()
+    }
+
+
+def clear_cache() -> None:
+    global _available
+
+    with _lock:
+        _sets.clear()
+        _available = None
@@ -1,4 +1,22 @@
-from typing import Dict, List
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from src import metrics
+from src.compliance.matcher import KeywordMatcher
+from src.compliance.results import (
+    STATUS_REASONS,
+    ControlInfo,
+    ControlResult,
+    Status,
+    control_infos,
+    missing_elements,
+    result_status,
+)
+
+
+# Bump whenever evaluation results change (invalidates caches)
+ENGINE_VERSION = "2"
 
 
 # -----------------------------
@@ -8,8 +26,101 @@ MANDATORY_TERMS = ["shall", "must", "required to"]
 OWNERSHIP_TERMS = ["responsible", "accountable", "owner", "ownership"]
 SCOPE_TERMS = ["applies to", "all systems", "organization-wide", "entire organization"]
 
+# One bit per signal; a clause's strength is the number of bits set
+MANDATORY_SIGNAL = 1
+OWNERSHIP_SIGNAL = 2
+SCOPE_SIGNAL = 4
+
+STRENGTH_SIGNALS = (
+    (MANDATORY_SIGNAL, MANDATORY_TERMS),
+    (OWNERSHIP_SIGNAL, OWNERSHIP_TERMS),
+    (SCOPE_SIGNAL, SCOPE_TERMS),
+)
+SIGNAL_STRENGTH = (0, 1, 1, 2, 1, 2, 2, 3)
+
+
+# -----------------------------
+# Deterministic Synonym Map
+# -----------------------------
+SYNONYMS = {
+    "asset inventory": ["asset identification", "assets identified", "asset register"],
+    "asset ownership": ["asset owner", "ownership assigned"],
+    "classification": ["classified", "classification scheme"],
+    "risk assessment": ["risk evaluated", "risk analysis", "assess risk"],
+    "least privilege": ["minimum access", "restricted access"],
+    "access control": ["access restricted", "access managed"],
+    "incident response": ["security incident response", "incident handling"],
+    "recovery plan": ["disaster recovery", "business continuity"],
+    "logging": ["log events", "audit logs"],
+    "monitoring": ["continuous monitoring", "system monitoring"],
+    "data classification": ["data categorized", "information classification"],
+    "encryption": ["encrypted", "cryptographic protection"],
+}
+
+
+# Bounds on the compiled-matcher caches: hot reloads and framework sets
+# keep producing new element tuples, and every live catalog already
+# holds its own matcher in CompiledControls
+ELEMENT_CACHE_SIZE = 1024
+SIGNAL_CACHE_SIZE = 16
+
+
+def element_keywords(element: str) -> List[str]:
+    """
+    Returns the element itself followed by its safe synonyms.
+    """
+    return [element] + SYNONYMS.get(element, [])
+
+
+@lru_cache(maxsize=ELEMENT_CACHE_SIZE)
+def compile_elements(required_elements: Tuple[str, ...]) -> KeywordMatcher:
+    """
+    Compiles the keywords and synonyms of a set of required elements
+    into one matcher labelled by element. Cached per element tuple
+    (least recently used first out), so each control is compiled once.
+    """
+    keyword_labels = defaultdict(set)
+    for element in required_elements:
+        for keyword in element_keywords(element):
+            keyword_labels[keyword].add(element)
+
+    return KeywordMatcher(keyword_labels)
+
+
+@lru_cache(maxsize=SIGNAL_CACHE_SIZE)
+def compile_signals(elements: Tuple[str, ...]) -> KeywordMatcher:
+    """
+    Compiles element keywords together with the strength terms.
+    Elements are labelled by name and strength terms by their signal
+    bit, so one scan of a clause yields both.
+    """
+    keyword_labels = defaultdict(set)
+    for element in elements:
+        for keyword in element_keywords(element):
+            keyword_labels[keyword].add(element)
+
+    for signal, terms in STRENGTH_SIGNALS:
+        for term in terms:
+            keyword_labels[term].add(signal)
 
-def evaluate_control(control: Dict, clauses: List[str]) -> Dict:
+    return KeywordMatcher(keyword_labels)
+
+
+def _clause_strength(clause: str) -> int:
+    """
+    Counts the policy strength signals present in a clause.
+    """
+    clause_strength = 0
+    if any(term in clause for term in MANDATORY_TERMS):
+        clause_strength += 1
+    if any(term in clause for term in OWNERSHIP_TERMS):
+        clause_strength += 1
+    if any(term in clause for term in SCOPE_TERMS):
+        clause_strength += 1
+    return clause_strength
+
+
+def evaluate_control(control: Dict, clauses: Iterable[str]) -> Dict:
     """
     Evaluates a single control against policy clauses using:
     - keyword + synonym matching
@@ -20,77 +131,52 @@ def evaluate_control(control: Dict, clauses: List[str]) -> Dict:
     """
 
     required_elements = control.get("required_elements", [])
+    matcher = compile_elements(tuple(required_elements))
     found_elements = set()
     strength_score = 0
 
-    # -----------------------------
-    # Deterministic Synonym Map
-    # -----------------------------
-    SYNONYMS = {
-        "asset inventory": ["asset identification", "assets identified", "asset register"],
-        "asset ownership": ["asset owner", "ownership assigned"],
-        "classification": ["classified", "classification scheme"],
-        "risk assessment": ["risk evaluated", "risk analysis", "assess risk"],
-        "least privilege": ["minimum access", "restricted access"],
-        "access control": ["access restricted", "access managed"],
-        "incident response": ["security incident response", "incident handling"],
-        "recovery plan": ["disaster recovery", "business continuity"],
-        "logging": ["log events", "audit logs"],
-        "monitoring": ["continuous monitoring", "system monitoring"],
-        "data classification": ["data categorized", "information classification"],
-        "encryption": ["encrypted", "cryptographic protection"],
-    }
-
     # -----------------------------
     # Clause Evaluation
     # -----------------------------
     for clause in clauses:
-        clause_strength = 0
-
-        # Strength signals
-        if any(term in clause for term in MANDATORY_TERMS):
-            clause_strength += 1
-        if any(term in clause for term in OWNERSHIP_TERMS):
-            clause_strength += 1
-        if any(term in clause for term in SCOPE_TERMS):
-            clause_strength += 1
-
-        # Element matching
-        for element in required_elements:
-            keywords = [element]
-            if element in SYNONYMS:
-                keywords.extend(SYNONYMS[element])
-
-            if any(keyword in clause for keyword in keywords):
-                found_elements.add(element)
-                strength_score += clause_strength
+        matched = matcher.match(clause)
+        if not matched:
+            continue
+
+        # Every matched element is credited with the clause's strength
+        found_elements |= matched
+        strength_score += _clause_strength(clause) * len(matched)
+
+    return build_result(control, found_elements, strength_score)
+
+
+def build_result(control: Dict, found_elements: Set[str], strength_score: int) -> Dict:
+    """
+    Turns the accumulated matches of one control into its
+    MISSING / WEAK / ADEQUATE result.
+    """
+    required_elements = control.get("required_elements", [])
 
     # -----------------------------
     # Status Determination
     # -----------------------------
-    if not found_elements:
-        status = "MISSING"
-    elif len(found_elements) < len(required_elements):
-        status = "WEAK"
-    else:
-        # All elements found — now check strength
-        status = "ADEQUATE" if strength_score >= 2 else "WEAK"
+    status = result_status(len(found_elements), len(required_elements), strength_score)
+    return result_record(control, status.name, missing_elements(required_elements, found_elements))
 
-    missing_elements = list(set(required_elements) - found_elements)
 
-    # -----------------------------
-    # Reasoning
-    # -----------------------------
-    if status == "MISSING":
-        reason = "No explicit policy statements addressing this control were found."
-    elif status == "WEAK":
-        reason = (
-            "The control is partially addressed or lacks strong policy language "
-            "(mandatory terms, ownership, or scope)."
-        )
-    else:
-        reason = "All required elements are explicitly defined with strong policy language."
+def build_compact_result(control: ControlInfo, found_elements: Set[str], strength_score: int) -> ControlResult:
+    """
+    build_result as a ControlResult (see src.compliance.results).
+    """
+    required_elements = control.required_elements
+    status = result_status(len(found_elements), len(required_elements), strength_score)
+    return ControlResult(control, status, missing_elements(required_elements, found_elements))
 
+
+def result_record(control: Dict, status: str, missing_elements: List[str]) -> Dict:
+    """
+    The result dict of one control, once its status is known.
+    """
     return {
         "control_id": control["id"],
         "control_name": control["name"],
@@ -98,5 +184,122 @@ def evaluate_control(control: Dict, clauses: List[str]) -> Dict:
         "status": status,
         "severity": control["severity"],
         "missing_elements": missing_elements,
-        "reason": reason,
-    }
\ No newline at end of file
+        "reason": STATUS_REASONS[Status[status]],
+    }
+
+
+class CompiledControls(NamedTuple):
+    """
+    Precompiled form of a control catalog for evaluate_controls.
+    """
+    matcher: KeywordMatcher
+    element_controls: Dict[str, List[int]]
+
+
+def compile_controls(controls: List[Dict]) -> CompiledControls:
+    """
+    Indexes which controls require each element and compiles the
+    catalog-wide matcher. Build once per catalog and reuse per document.
+    """
+    element_controls = defaultdict(list)
+    for index, control in enumerate(controls):
+        for element in dict.fromkeys(control.get("required_elements", [])):
+            element_controls[element].append(index)
+
+    matcher = compile_signals(tuple(sorted(element_controls)))
+    return CompiledControls(matcher, dict(element_controls))
+
+
+@metrics.timed("evaluate")
+def evaluate_controls(
+    controls: List[Dict],
+    clauses: Iterable[str],
+    compiled: Optional[CompiledControls] = None,
+    compact: bool = False,
+) -> List[Dict]:
+    """
+    Evaluates every control in a single pass over the clauses.
+
+    Each clause is scanned once for all element keywords and strength
+    terms together; its strength signals are kept as a bitmask and
+    credited to every control whose elements it mentions. Results are
+    identical to calling evaluate_control per control, in catalog order.
+    Clauses may be a generator (e.g. iter_policy_clauses); they are
+    consumed once and never held in memory.
+
+    Pass `compiled` (from compile_controls) to skip recompiling the
+    catalog on every call, and compact=True for ControlResults instead
+    of result dicts.
+    """
+    if compiled is None:
+        compiled = compile_controls(controls)
+
+    matcher = compiled.matcher
+    vectors = (clause_vector(matcher, clause) for clause in clauses)
+    return combine_vectors(controls, compiled, vectors, compact)
+
+
+# -----------------------------
+# Per-Clause Match Vectors
+# -----------------------------
+def clause_vector(matcher: KeywordMatcher, clause: str) -> Tuple[Tuple[str, ...], int]:
+    """
+    Everything evaluation needs to know about one clause: the required
+    elements it mentions (sorted) and its strength signal bitmask.
+    Clauses that mention no element reduce to ((), 0).
+    """
+    labels = matcher.match(clause)
+    if not labels:
+        return (), 0
+
+    signals = 0
+    elements = []
+    for label in labels:
+        if isinstance(label, int):
+            signals |= label
+        else:
+            elements.append(label)
+
+    if not elements:
+        return (), 0
+    return tuple(sorted(elements)), signals
+
+
+def combine_vectors(
+    controls: List[Dict],
+    compiled: CompiledControls,
+    vectors: Iterable[Tuple[Iterable[str], int]],
+    compact: bool = False,
+) -> List[Dict]:
+    """
+    Builds control results from per-clause match vectors, one vector
+    per clause occurrence (see clause_vector). With compact=True the
+    results are ControlResults.
+    """
+    element_controls = compiled.element_controls
+    found = [set() for _ in controls]
+    strength = [0] * len(controls)
+
+    # -----------------------------
+    # Clause Evaluation
+    # -----------------------------
+    for elements, signals in vectors:
+        if not elements:
+            continue
+
+        clause_strength = SIGNAL_STRENGTH[signals]
+        for element in elements:
+            for index in element_controls[element]:
+                found[index].add(element)
+                strength[index] += clause_strength
+
+    if compact:
+        return [
+            build_compact_result(control, found[index], strength[index])
+            for index, control in enumerate(control_infos(controls))
+        ]
+
+    return [
+        build_result(control, found[index], strength[index])
+        for index, control in enumerate(controls)
+    ]
@@ -0,0 +1,118 @@
+import hashlib
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from src.compliance.gap_engine import (
+    ENGINE_VERSION,
+    CompiledControls,
+    clause_vector,
+    combine_vectors,
+    compile_controls,
+)
+
+
+def clause_hash(clause: str) -> str:
+    return hashlib.blake2b(clause.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class Revision(NamedTuple):
+    """
+    Outcome of evaluate_revision.
+    - results:   control results, identical to evaluate_controls
+    - changes:   controls whose status differs from the previous version
+    - state:     JSON-serializable input for the next revision
+    - reused:    clauses answered from stored match vectors
+    - evaluated: clauses that had to be matched
+    """
+    results: List[Dict]
+    changes: List[Dict]
+    state: Dict
+    reused: int
+    evaluated: int
+
+
+def evaluate_revision(
+    controls: List[Dict],
+    clauses: Iterable[str],
+    previous: Optional[Dict] = None,
+    compiled: Optional[CompiledControls] = None,
+    catalog_version: str = "",
+) -> Revision:
+    """
+    Re-evaluates a new version of a document using the per-clause match
+    vectors kept from the previous version (`previous` is the `state` of
+    the last Revision). Only clauses whose hash was not seen before are
+    matched; every control result is then recombined from the vectors.
+
+    Stored vectors are discarded when the catalog or engine version
+    changed, but the status diff is still reported against the previous
+    version.
+    """
+    if compiled is None:
+        compiled = compile_controls(controls)
+
+    previous = previous or {}
+    stored = {}
+    if (
+        previous.get("engine_version") == ENGINE_VERSION
+        and previous.get("catalog_version") == catalog_version
+    ):
+        stored = previous.get("vectors", {})
+
+    vectors = {}
+    occurrences = []
+    reused = evaluated = 0
+
+    for clause in clauses:
+        key = clause_hash(clause)
+        vector = vectors.get(key)
+        if vector is None:
+            vector = stored.get(key)
+            if vector is None:
+                vector = clause_vector(compiled.matcher, clause)
+                evaluated += 1
+            else:
+                reused += 1
+            vectors[key] = vector
+        else:
+            reused += 1
+        occurrences.append(vector)
+
+    results = combine_vectors(controls, compiled, occurrences)
+    statuses = {r["control_id"]: r["status"] for r in results}
+
+    state = {
+        "engine_version": ENGINE_VERSION,
+        "catalog_version": catalog_version,
+        # Only clauses of this version are kept, so state never outgrows the document
+        "vectors": vectors,
+        "statuses": statuses,
+    }
+
+    return Revision(
+        results=results,
+        changes=status_changes(previous.get("statuses", {}), results),
+        state=state,
+        reused=reused,
+        evaluated=evaluated,
+    )
+
+
+def status_changes(previous_statuses: Dict[str, str], results: List[Dict]) -> List[Dict]:
+    """
+    Controls whose status differs from `previous_statuses`
+    (control id -> status). Controls new to the catalog have before=None.
+    """
+    if not previous_statuses:
+        return []
+
+    changes = []
+    for result in results:
+        before = previous_statuses.get(result["control_id"])
+        if before != result["status"]:
+            changes.append({
+                "control_id": result["control_id"],
+                "control_name": result["control_name"],
+                "before": before,
+                "after": result["status"],
+            })
+    return changes
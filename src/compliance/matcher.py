@@ -0,0 +1,81 @@
+import re
+from typing import Dict, FrozenSet, Hashable, Iterable, Set
+
+
+# -------------------------------------------------------------------
+# Compiled Multi-Keyword Matcher
+# -------------------------------------------------------------------
+class KeywordMatcher:
+    """
+    Finds every keyword contained in a clause with a single regex scan.
+
+    All keywords are folded into one prefix-trie pattern, so the regex
+    engine only follows branches that agree with the text. The pattern is
+    wrapped in a lookahead and tried at every position, which reports the
+    longest keyword starting there; keywords nested inside that hit
+    (e.g. "incident response" inside "security incident response") are
+    resolved from a precomputed table. The result is exactly the set of
+    keywords for which `keyword in clause` holds.
+
+    Each keyword carries a set of labels (required elements, strength
+    signals, ...) and `match` returns the union of labels that were hit.
+    """
+
+    def __init__(self, keyword_labels: Dict[str, Iterable[Hashable]]):
+        labels = {
+            keyword: frozenset(values)
+            for keyword, values in keyword_labels.items()
+            if keyword
+        }
+        self.keywords = sorted(labels)
+
+        # Labels hit whenever the keyword is the longest match at a position
+        self._hit_labels: Dict[str, FrozenSet] = {
+            keyword: frozenset().union(
+                *(labels[other] for other in self.keywords if other in keyword)
+            )
+            for keyword in self.keywords
+        }
+
+        pattern = _trie_pattern(self.keywords)
+        self._any = re.compile(pattern) if self.keywords else None
+        self._scan = re.compile(f"(?=({pattern}))") if self.keywords else None
+
+    def match(self, clause: str) -> Set:
+        """
+        Returns the union of labels for every keyword found in the clause.
+        """
+        if self._any is None or not self._any.search(clause):
+            return set()
+
+        hits = set()
+        for m in self._scan.finditer(clause):
+            hits |= self._hit_labels[m.group(1)]
+        return hits
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Builds a regex alternation factored by common prefixes.
+    Optional continuations are greedy, so the longest keyword wins.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [
+            re.escape(ch) + build(child)
+            for ch, child in sorted(node.items())
+            if ch
+        ]
+        if not branches:
+            return ""
+
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
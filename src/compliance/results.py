@@ -0,0 +1,243 @@
+"""
+Compact control results for high-volume analysis.
+
+A result dict repeats the control's strings and the long reason text
+for every document. Here the constant parts live once per catalog
+(ControlInfo, interned), the status is a small enum, and a result only
+holds references: ControlResult for one document, ResultSet for many
+documents as flat arrays (one status byte and one missing-element
+bitmask per control and document).
+
+Both read like the result dicts ("status", "nist_function", ...), so
+compute_compliance_score and group_by_function accept them unchanged;
+to_dict() / to_dicts() produce the JSON shape at the API boundary.
+"""
+import sys
+from array import array
+from enum import IntEnum
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set, Tuple
+
+from src.compliance.scoring import score_from_counts
+
+
+class Status(IntEnum):
+    MISSING = 0
+    WEAK = 1
+    ADEQUATE = 2
+
+
+STATUS_REASONS = {
+    Status.MISSING: "No explicit policy statements addressing this control were found.",
+    Status.WEAK: (
+        "The control is partially addressed or lacks strong policy language "
+        "(mandatory terms, ownership, or scope)."
+    ),
+    Status.ADEQUATE: "All required elements are explicitly defined with strong policy language.",
+}
+
+_STATUSES = tuple(Status)
+# Enum.name is a slow descriptor; results are read by status name a lot
+_STATUS_NAMES = tuple(status.name for status in Status)
+# Plain ints count faster than enum members in arrays
+_STATUS_CODES = tuple(int(status) for status in Status)
+
+# Missing elements fit in one unsigned 64-bit mask per result
+MAX_MASK_ELEMENTS = 64
+
+
+def result_status(found_count: int, required_count: int, strength_score: int) -> Status:
+    """
+    MISSING / WEAK / ADEQUATE from a control's accumulated matches.
+    """
+    if not found_count:
+        return Status.MISSING
+    if found_count < required_count:
+        return Status.WEAK
+    # All elements found — now check strength
+    return Status.ADEQUATE if strength_score >= 2 else Status.WEAK
+
+
+def missing_elements(required_elements: Iterable[str], found_elements: Set[str]) -> List[str]:
+    """
+    The result's "missing_elements" list (in set order, as always).
+    """
+    return list(set(required_elements) - found_elements)
+
+
+# -------------------------------------------------------------------
+# Catalog Rows
+# -------------------------------------------------------------------
+class ControlInfo(NamedTuple):
+    """
+    The constant part of a control's results, shared by all of them.
+    """
+    id: str
+    name: str
+    function: str
+    severity: str
+    required_elements: Tuple[str, ...]
+
+    @classmethod
+    def from_control(cls, control: Dict) -> "ControlInfo":
+        return cls(
+            sys.intern(control["id"]),
+            sys.intern(control["name"]),
+            sys.intern(control["function"]),
+            sys.intern(control["severity"]),
+            tuple(sys.intern(e) for e in control.get("required_elements", [])),
+        )
+
+
+def control_infos(controls: List[Dict]) -> List[ControlInfo]:
+    return [ControlInfo.from_control(control) for control in controls]
+
+
+# -------------------------------------------------------------------
+# One Document
+# -------------------------------------------------------------------
+class ControlResult:
+    """
+    One control's result: shared control row, status, missing elements.
+    Supports result["key"] with the keys of the result dict.
+    """
+    __slots__ = ("control", "status", "missing_elements")
+
+    def __init__(self, control: ControlInfo, status: Status, missing: Sequence[str]):
+        self.control = control
+        self.status = status
+        self.missing_elements = tuple(missing)
+
+    def __getitem__(self, key: str):
+        if key == "status":
+            return _STATUS_NAMES[self.status]
+        if key == "nist_function":
+            return self.control.function
+        if key == "control_id":
+            return self.control.id
+        if key == "control_name":
+            return self.control.name
+        if key == "severity":
+            return self.control.severity
+        if key == "missing_elements":
+            return list(self.missing_elements)
+        if key == "reason":
+            return STATUS_REASONS[self.status]
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict:
+        """
+        The result dict returned by the API.
+        """
+        return {
+            "control_id": self.control.id,
+            "control_name": self.control.name,
+            "nist_function": self.control.function,
+            "status": _STATUS_NAMES[self.status],
+            "severity": self.control.severity,
+            "missing_elements": list(self.missing_elements),
+            "reason": STATUS_REASONS[self.status],
+        }
+
+    def __repr__(self) -> str:
+        return f"ControlResult({self.control.id}, {self.status.name}, {self.missing_elements})"
+
+
+# -------------------------------------------------------------------
+# Many Documents
+# -------------------------------------------------------------------
+class ResultSet:
+    """
+    Results of many documents against one catalog, stored by column:
+    `status` holds one byte per (document, control) in document-major
+    order, `missing` the matching missing-element bitmasks (bit i =
+    required_elements[i] of that control).
+    """
+
+    def __init__(self, controls: List[Dict]):
+        self.controls = control_infos(controls)
+        self.documents: List[str] = []
+        self.status = array("b")
+        # Plain ints when a control has too many elements for 64 bits
+        wide = any(len(c.required_elements) > MAX_MASK_ELEMENTS for c in self.controls)
+        self.missing = [] if wide else array("Q")
+        self._bits = [
+            {element: 1 << i for i, element in enumerate(c.required_elements)}
+            for c in self.controls
+        ]
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, document: str, results: Sequence) -> int:
+        """
+        Appends one document's results (dicts or ControlResults, in
+        catalog order) and returns its index.
+        """
+        if len(results) != len(self.controls):
+            raise ValueError(
+                f"Expected {len(self.controls)} results for {document}, got {len(results)}"
+            )
+
+        for bits, result in zip(self._bits, results):
+            self.status.append(Status[result["status"]])
+            mask = 0
+            for element in result["missing_elements"]:
+                mask |= bits[element]
+            self.missing.append(mask)
+
+        self.documents.append(document)
+        return len(self.documents) - 1
+
+    def results(self, index: int) -> List[ControlResult]:
+        """
+        One document's results as ControlResults.
+        """
+        start = index * len(self.controls)
+        out = []
+        for offset, control in enumerate(self.controls):
+            mask = self.missing[start + offset]
+            required = control.required_elements
+            missing = {e for i, e in enumerate(required) if mask >> i & 1}
+            out.append(ControlResult(
+                control,
+                _STATUSES[self.status[start + offset]],
+                missing_elements(required, set(required) - missing),
+            ))
+        return out
+
+    def to_dicts(self, index: int) -> List[Dict]:
+        return [result.to_dict() for result in self.results(index)]
+
+    def status_counts(self, index: int) -> Tuple[int, int, int]:
+        """
+        (missing, weak, adequate) controls of one document.
+        """
+        start = index * len(self.controls)
+        statuses = self.status[start:start + len(self.controls)]
+        return tuple(map(statuses.count, _STATUS_CODES))
+
+    def score(self, index: int) -> Dict:
+        """
+        compute_compliance_score of one document, from its status bytes.
+        """
+        missing, weak, adequate = self.status_counts(index)
+        return score_from_counts(adequate, weak, missing + weak + adequate)
+
+    def function_counts(self) -> Dict[str, List[int]]:
+        """
+        [missing, weak, adequate] per NIST function, over all documents.
+        """
+        counts: Dict[str, List[int]] = {}
+        for offset, control in enumerate(self.controls):
+            # Every document's result for this control
+            column = self.status[offset::len(self.controls)]
+            totals = counts.setdefault(control.function, [0, 0, 0])
+            for status in _STATUS_CODES:
+                totals[status] += column.count(status)
+        return counts
@@ -0,0 +1,239 @@
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+from src import metrics
+from src.compliance.gap_engine import (
+    CompiledControls,
+    combine_vectors,
+    compile_controls,
+    compile_signals,
+    element_keywords,
+)
+
+
+# -----------------------------
+# Configuration
+# -----------------------------
+# Minimum normalized BM25 score for a clause to count as mentioning an
+# element (1.0 = every term of a keyword present as a whole token, see
+# ClauseIndex.search)
+RETRIEVAL_THRESHOLD = float(os.environ.get("POLICY_RETRIEVAL_THRESHOLD", "0.75"))
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "their there these this to was were will with".split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+# -----------------------------
+# Tokenizer & Stemmer
+# -----------------------------
+# (suffix, replacement), longest first; applied once, keeping a stem of 3+
+_DERIVATIONAL = (
+    ("ifications", "ify"), ("ification", "ify"),
+    ("izations", "ize"), ("ization", "ize"),
+    ("ations", "ate"), ("ation", "ate"),
+    ("ments", ""), ("ment", ""),
+    ("ions", ""), ("ion", ""),
+    ("ingly", ""), ("ings", ""), ("ing", ""),
+    ("edly", ""), ("ied", "y"), ("ed", ""),
+)
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Light suffix-stripping stemmer: plurals first, then one derivational
+    or inflectional suffix, then a final "e" ("classification",
+    "classified" -> "classify"; "monitoring", "monitored" -> "monitor";
+    "management", "managed" -> "manag").
+    """
+    if len(word) <= 3:
+        return word
+
+    # Plurals
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+
+    for suffix, replacement in _DERIVATIONAL:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            # "logg" -> "log", "plann" -> "plan"
+            if (
+                not replacement
+                and len(word) > 3
+                and word[-1] == word[-2]
+                and word[-1] not in "aeiouslz"
+            ):
+                word = word[:-1]
+            break
+
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased alphanumeric tokens, stopwords removed, stemmed.
+    """
+    return [stem(t) for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+# -----------------------------
+# Inverted Index
+# -----------------------------
+class ClauseIndex:
+    """
+    In-process inverted index over the clauses of one document, scored
+    with Okapi BM25. Build once per analysis and query it for every
+    element of every control: a query only walks the postings of its
+    own terms, not the whole document.
+    """
+
+    def __init__(self, clauses: Iterable[str], k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.clauses: List[str] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, List] = defaultdict(list)
+
+        for clause_id, clause in enumerate(clauses):
+            tokens = tokenize(clause)
+            self.clauses.append(clause)
+            self.lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                self.postings[term].append((clause_id, tf))
+
+        self.postings = dict(self.postings)
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        self._norms = [
+            1 - b + b * length / (self.avg_length or 1) for length in self.lengths
+        ]
+        self._term_scores: Dict[str, Dict[int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self.clauses)
+
+    def idf(self, term: str) -> float:
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.clauses) - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str) -> Dict[int, float]:
+        """
+        Normalized BM25 score of every clause sharing a term with the
+        query: the raw score divided by the score a clause of the same
+        length would get with every query term once. A clause containing
+        all terms scores >= 1.0, one with only some of them the
+        idf-weighted share it has. Distinct query terms only; a query of
+        stopwords matches nothing.
+
+        Terms match whole (stemmed) tokens only. Unlike the exact engine's
+        substring test, "encrypted" is not found inside "unencrypted".
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.clauses:
+            return {}
+
+        weights = {term: self.idf(term) for term in terms}
+        ideal = sum(weights.values())
+        k1 = self.k1
+
+        scores: Dict[int, float] = defaultdict(float)
+        for term, idf in weights.items():
+            for clause_id, saturation in self._saturation(term).items():
+                scores[clause_id] += idf * saturation
+
+        # Per clause: (k1 + 1) / (1 + k1 * norm) is the saturation of tf=1
+        return {
+            clause_id: score * (1 + k1 * self._norms[clause_id]) / (ideal * (k1 + 1))
+            for clause_id, score in scores.items()
+        }
+
+    def _saturation(self, term: str) -> Dict[int, float]:
+        """
+        BM25 term-frequency saturation of a term in each clause holding
+        it. Cached, since controls share many terms ("asset", "policy").
+        """
+        cached = self._term_scores.get(term)
+        if cached is None:
+            k1 = self.k1
+            cached = {
+                clause_id: tf * (k1 + 1) / (tf + k1 * self._norms[clause_id])
+                for clause_id, tf in self.postings.get(term, ())
+            }
+            self._term_scores[term] = cached
+        return cached
+
+    def matching_clauses(self, element: str, threshold: float = RETRIEVAL_THRESHOLD) -> Set[int]:
+        """
+        Clauses mentioning an element: any of its keywords or synonyms
+        scores at least `threshold`.
+        """
+        # Tolerate rounding, so a clause with every term always clears threshold=1.0
+        threshold -= 1e-9
+        matched = set()
+        for keyword in element_keywords(element):
+            matched.update(
+                clause_id for clause_id, score in self.search(keyword).items()
+                if score >= threshold
+            )
+        return matched
+
+
+# -----------------------------
+# Evaluation
+# -----------------------------
+@metrics.timed("evaluate")
+def evaluate_controls_bm25(
+    controls: List[Dict],
+    clauses: Iterable[str],
+    threshold: Optional[float] = None,
+    compiled: Optional[CompiledControls] = None,
+    index: Optional[ClauseIndex] = None,
+) -> List[Dict]:
+    """
+    evaluate_controls with retrieval-based element matching: a clause
+    mentions an element when its BM25 score clears `threshold`, so
+    inflections and reordered wording ("inventory of assets") count.
+    Strength signals and the MISSING / WEAK / ADEQUATE rules are
+    unchanged. One index serves every control.
+
+    This is not a superset of evaluate_controls: even at threshold 1.0,
+    exact-engine hits that are only a substring of a longer word
+    ("encrypted" in "unencrypted") are not found, because clauses are
+    indexed by whole tokens.
+    """
+    threshold = RETRIEVAL_THRESHOLD if threshold is None else threshold
+    if compiled is None:
+        compiled = compile_controls(controls)
+    if index is None:
+        index = ClauseIndex(clauses)
+
+    clause_elements: Dict[int, List[str]] = defaultdict(list)
+    for element in compiled.element_controls:
+        for clause_id in index.matching_clauses(element, threshold):
+            clause_elements[clause_id].append(element)
+
+    # Strength terms are still exact phrases
+    signal_matcher = compile_signals(())
+    vectors = []
+    for clause_id, elements in clause_elements.items():
+        signals = 0
+        for bit in signal_matcher.match(index.clauses[clause_id]):
+            signals |= bit
+        vectors.append((elements, signals))
+
+    return combine_vectors(controls, compiled, vectors)
@@ -1,14 +1,21 @@
 def compute_compliance_score(results: list[dict]) -> dict:
-    total_controls = len(results)
-    score = 0
+    adequate = weak = 0
 
     for r in results:
         if r["status"] == "ADEQUATE":
-            score += 100
+            adequate += 1
         elif r["status"] == "WEAK":
-            score += 50
-        else:
-            score += 0
+            weak += 1
+
+    return score_from_counts(adequate, weak, len(results))
+
+
+def score_from_counts(adequate: int, weak: int, total_controls: int) -> dict:
+    """
+    Compliance percentage and maturity from status counts:
+    ADEQUATE scores 100, WEAK 50, MISSING 0.
+    """
+    score = adequate * 100 + weak * 50
 
     percentage = score / (total_controls * 100) * 100
 
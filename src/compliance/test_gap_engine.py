@@ -2,7 +2,7 @@ import json
 from pathlib import Path
 
 from src.parser.policy_parser import parse_policy
-from src.compliance.gap_engine import evaluate_control
+from src.compliance.gap_engine import evaluate_controls
 from src.compliance.scoring import compute_compliance_score
 from src.compliance.grouping import group_by_function
 
@@ -20,12 +20,8 @@ def main():
 
     clauses = parse_policy(POLICY_PATH)
 
-    results = []
-
     # ---- Run evaluation ONCE ----
-    for control in controls:
-        result = evaluate_control(control, clauses)
-        results.append(result)
+    results = evaluate_controls(controls, clauses)
 
     # ---- Group by NIST function ----
     grouped_results = group_by_function(results)
@@ -0,0 +1,297 @@
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+# -------------------------
+# Configuration
+# -------------------------
+JOB_DB_PATH = Path(os.environ.get("POLICY_JOB_DB", ROOT_DIR / ".cache" / "jobs.sqlite3"))
+JOB_WORKERS = int(os.environ.get("POLICY_JOB_WORKERS", "2"))
+MAX_QUEUED_JOBS = int(os.environ.get("POLICY_MAX_QUEUED_JOBS", "32"))
+# Finished and failed jobs (with their results) are deleted after this long
+JOB_RETENTION_HOURS = float(os.environ.get("POLICY_JOB_RETENTION_HOURS", "24"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class QueueFull(Exception):
+    """
+    Raised when a job is submitted while the queue is at capacity.
+    """
+
+
+# -------------------------
+# Persistent Job Store
+# -------------------------
+class JobStore:
+    """
+    SQLite (WAL) store for jobs, their uploads and their results, so
+    queued and interrupted jobs survive a restart. Finished jobs are
+    kept for `retention_hours`, then pruned.
+    """
+
+    def __init__(self, path: Path, retention_hours: float = JOB_RETENTION_HOURS):
+        self.path = Path(path)
+        self.retention_seconds = retention_hours * 3600
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    options TEXT NOT NULL,
+                    content BLOB,
+                    partial TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated)")
+
+    def create(self, filename: str, content: bytes, options: Dict, max_queued: int) -> str:
+        """
+        Inserts a queued job, unless `max_queued` jobs are already waiting.
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            queued = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)
+            ).fetchone()[0]
+            if queued >= max_queued:
+                raise QueueFull(f"{queued} jobs already queued")
+
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, filename, options, content, created, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, filename, json.dumps(options), content, now, now),
+            )
+        return job_id
+
+    def claim_next(self) -> Optional[Dict]:
+        """
+        Marks the oldest queued job as running and returns it with its upload.
+        """
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id, filename, options, content FROM jobs "
+                "WHERE status = ? ORDER BY created LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, updated = ? WHERE id = ?",
+                (RUNNING, time.time(), row[0]),
+            )
+        return {"id": row[0], "filename": row[1], "options": json.loads(row[2]), "content": row[3]}
+
+    def update_partial(self, job_id: str, partial: Dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET partial = ?, updated = ? WHERE id = ?",
+                (json.dumps(partial), time.time(), job_id),
+            )
+
+    def finish(self, job_id: str, result: Optional[Dict] = None, error: Optional[str] = None) -> None:
+        # The upload is no longer needed once the job has an outcome
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, content = NULL, updated = ? "
+                "WHERE id = ?",
+                (
+                    FAILED if error else DONE,
+                    json.dumps(result) if result is not None else None,
+                    error,
+                    time.time(),
+                    job_id,
+                ),
+            )
+        self.prune()
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Deletes finished and failed jobs older than the retention period.
+        """
+        cutoff = (now or time.time()) - self.retention_seconds
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE updated < ? AND status IN (?, ?)",
+                (cutoff, DONE, FAILED),
+            ).rowcount
+
+    def requeue_interrupted(self) -> int:
+        """
+        Jobs left running by a previous process go back to the queue.
+        """
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, partial = NULL, updated = ? WHERE status = ?",
+                (QUEUED, time.time(), RUNNING),
+            ).rowcount
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, filename, partial, result, error, created, updated "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "filename": row[2],
+            "partial": json.loads(row[3]) if row[3] else None,
+            "result": json.loads(row[4]) if row[4] else None,
+            "error": row[5],
+            "created": row[6],
+            "updated": row[7],
+        }
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# -------------------------
+# Worker Pool
+# -------------------------
+class JobQueue:
+    """
+    Runs stored jobs on a pool of worker threads.
+
+    `process(job, report)` does the work; it calls report(partial) to
+    publish intermediate results and returns the final result. Workers
+    poll the store, so jobs queued before a restart are picked up again.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        process: Callable[[Dict, Callable[[Dict], None]], Dict],
+        workers: int = JOB_WORKERS,
+        max_queued: int = MAX_QUEUED_JOBS,
+    ):
+        self.store = store
+        self.process = process
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._threads = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+
+        resumed = self.store.requeue_interrupted()
+        if resumed:
+            print(f"[Jobs] Re-queued {resumed} interrupted job(s)")
+        pruned = self.store.prune()
+        if pruned:
+            print(f"[Jobs] Pruned {pruned} expired job(s)")
+
+        self._stopping = False
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, filename: str, content: bytes, options: Optional[Dict] = None) -> str:
+        """
+        Stores a job and wakes a worker. Raises QueueFull under backpressure.
+        """
+        job_id = self.store.create(filename, content, options or {}, self.max_queued)
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def _work(self) -> None:
+        while True:
+            with self._wakeup:
+                if self._stopping:
+                    return
+
+            job = self.store.claim_next()
+            if job is None:
+                with self._wakeup:
+                    if not self._stopping:
+                        self._wakeup.wait(timeout=1.0)
+                continue
+
+            job_id = job["id"]
+            try:
+                result = self.process(job, lambda partial: self.store.update_partial(job_id, partial))
+            except Exception as e:
+                print(f"[Jobs] ⚠️ Job {job_id} failed: {e}")
+                self.store.finish(job_id, error=str(e))
+            else:
+                self.store.finish(job_id, result=result)
+
+
+def analysis_job(
+    analyze: Callable[[io.BytesIO, str], Dict],
+    draft_events: Callable[[list], Iterator[Dict]],
+) -> Callable[[Dict, Callable[[Dict], None]], Dict]:
+    """
+    Builds the job processor for policy analysis: the compliance result is
+    published first, then each remediation draft as soon as it is ready.
+    """
+
+    def process(job: Dict, report: Callable[[Dict], None]) -> Dict:
+        analysis = analyze(io.BytesIO(job["content"]), job["filename"])
+        partial = {
+            "filename": job["filename"],
+            "compliance": analysis["compliance"],
+            "remediation": [],
+        }
+        report(partial)
+
+        if job["options"].get("draft", True):
+            for event in draft_events(analysis["compliance"]["raw_results"]):
+                if event["event"] == "draft":
+                    partial["remediation"].append(
+                        {k: v for k, v in event.items() if k != "event"}
+                    )
+                    report(partial)
+
+        return partial
+
+    return process
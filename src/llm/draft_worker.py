@@ -0,0 +1,82 @@
+import threading
+from typing import Callable, Dict, Iterator, List
+
+from src.llm.llm_runner import select_gaps, stream_llm_on_gaps
+
+
+class DraftWorker:
+    """
+    Drafts remediation for one analysis on a background thread.
+
+    The UI keeps one worker per session and reads its progress with
+    snapshot() on every rerun, so reruns never restart the model calls
+    and finished drafts appear as soon as they are written.
+    """
+
+    def __init__(
+        self,
+        compliance_results: List[Dict],
+        stream: Callable[[List[Dict]], Iterator[Dict]] = stream_llm_on_gaps,
+    ):
+        self.gaps = select_gaps(compliance_results)
+        self._results = compliance_results
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._partial: Dict[str, str] = {}
+        self._drafts: Dict[str, Dict] = {}
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="draft-worker", daemon=True)
+
+    def start(self) -> "DraftWorker":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops after the event in progress (a superseded upload).
+        """
+        self._stopped.set()
+
+    def join(self, timeout=None) -> None:
+        self._thread.join(timeout)
+
+    @property
+    def done(self) -> bool:
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def snapshot(self) -> Dict:
+        """
+        {"partial": {control_id: text so far}, "drafts": {control_id: draft},
+        "done": bool}, copied under the lock.
+        """
+        with self._lock:
+            return {
+                "partial": dict(self._partial),
+                "drafts": dict(self._drafts),
+                "done": self.done,
+            }
+
+    def _run(self) -> None:
+        events = self._stream(self._results)
+        try:
+            for event in events:
+                if self._stopped.is_set():
+                    break
+
+                control_id = event.get("control_id")
+                with self._lock:
+                    if event["event"] == "draft_delta":
+                        self._partial[control_id] = self._partial.get(control_id, "") + event["text"]
+                    elif event["event"] == "draft":
+                        self._partial.pop(control_id, None)
+                        self._drafts[control_id] = event
+
+        except Exception as e:
+            print(f"[LLM] ⚠️ Background drafting failed: {str(e)}")
+            self.error = str(e)
+
+        finally:
+            close = getattr(events, "close", None)
+            if close is not None:
+                close()
@@ -1,19 +1,63 @@
-import subprocess
-from typing import Dict
+import re
+from typing import Dict, Iterator, List, Optional
+
+from src import metrics
+from src.llm.response_cache import LLMResponseCache, default_cache, gap_signature, response_key
+
+
+# Bump whenever the prompt template or output parsing changes
+# (invalidates cached responses)
+PROMPT_VERSION = "2"
+
+# Delimits one control's section in a batched response
+_BATCH_SECTION = re.compile(r'^\s*=+\s*GAP\s+(\d+)\b[^\n]*$', re.IGNORECASE | re.MULTILINE)
+_BATCH_END = re.compile(r'^\s*=+\s*END\b[^\n]*$', re.IGNORECASE | re.MULTILINE)
 
 
 class Phi3PolicyDraftingEngine:
+    """
+    Drafts remediation text with a local Phi-3 model served by Ollama.
+
+    backend:
+    - "http":       Ollama HTTP API over pooled keep-alive connections
+    - "subprocess": one `ollama run` process per call (legacy)
+    - "auto":       HTTP, falling back to subprocess if the server is down
+
+    Complete drafts are cached persistently (see response_cache), so a
+    gap that was drafted before never reaches the model again.
+    """
+
     def __init__(
         self,
         model_name: str = "phi3:3.8b",
         temperature: float = 0.2,
         top_p: float = 0.9,
         max_tokens: int = 450,
+        backend: str = "auto",
+        host: Optional[str] = None,
+        keep_alive: str = "30m",
+        timeout: float = 120,
+        pool_size: int = 4,
+        use_cache: bool = True,
+        cache: Optional[LLMResponseCache] = None,
     ):
+        if backend not in ("auto", "http", "subprocess"):
+            raise ValueError(f"Unknown LLM backend: {backend}")
+
         self.model_name = model_name
         self.temperature = temperature
         self.top_p = top_p
         self.max_tokens = max_tokens
+        self.backend = backend
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.client = None
+        if backend != "subprocess":
+            # Backends load with the first engine, not with this module
+            from src.llm.ollama_client import OllamaHTTPClient
+
+            self.client = OllamaHTTPClient(host, timeout=timeout, pool_size=pool_size)
+        self.cache = cache or (default_cache() if use_cache else None)
 
     # -------------------------------------------------
     # SINGLE MERGED PROMPT (ONE CALL PER CONTROL)
@@ -24,15 +68,202 @@ class Phi3PolicyDraftingEngine:
         and improvement roadmap in ONE LLM call.
         """
 
-        missing = control_gap.get("missing_elements", [])
-        missing_str = ", ".join(missing) if isinstance(missing, list) else missing
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(control_gap)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        output = self._call_model(self.build_prompt(control_gap))
+        result = self._parse_output(output)
+
+        # Only complete drafts are worth keeping
+        if key is not None and all(result.values()):
+            self.cache.put(key, result)
+
+        return result
+
+    def stream_full_improvement(self, control_gap: Dict) -> Iterator[Dict]:
+        """
+        Streaming counterpart of generate_full_improvement.
+        Yields {"delta": text} fragments while the model generates, then
+        one {"result": {...}} with the parsed sections. Cached drafts
+        (and the subprocess backend) produce the result in one step.
+        """
+
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(control_gap)
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield {"result": cached}
+                return
+
+        prompt = self.build_prompt(control_gap)
+        output = None
+
+        if self.client is not None:
+            from src.llm.ollama_client import OllamaHTTPError
+
+            fragments = []
+            try:
+                for fragment in metrics.timed_iter("llm", self.client.generate_stream(
+                    self.model_name,
+                    prompt,
+                    options=self._generation_options(),
+                    keep_alive=self.keep_alive,
+                    on_done=_count_tokens,
+                )):
+                    fragments.append(fragment)
+                    yield {"delta": fragment}
+                output = "".join(fragments)
+            except OllamaHTTPError as e:
+                output = str(e)
+            except ConnectionError:
+                if fragments or self.backend == "http":
+                    output = "".join(fragments) or "[LLM unavailable] Ollama server not reachable."
+                # auto: server down before any output — fall back to the CLI
+
+        if output is None:
+            with metrics.stage("llm"):
+                output = self._call_subprocess(prompt)
+            yield {"delta": output}
+
+        result = self._parse_output(output)
+        if key is not None and all(result.values()):
+            self.cache.put(key, result)
+
+        yield {"result": result}
+
+    # -------------------------------------------------
+    # BATCHED PROMPT (N CONTROLS PER CALL)
+    # -------------------------------------------------
+    def generate_batch_improvements(self, control_gaps: List[Dict], retries: int = 1) -> List[Dict]:
+        """
+        Drafts several gaps with ONE prompt, sharing the instructions and
+        rules between them. Returns one generate_full_improvement-style
+        dict per gap, in input order.
+
+        Gaps whose section is missing or incomplete in the response are
+        retried as a smaller batch (`retries` times), then one by one.
+        """
+        results: List[Optional[Dict]] = [None] * len(control_gaps)
+        pending = []
+
+        for index, gap in enumerate(control_gaps):
+            cached = None
+            if self.cache is not None:
+                # A single-gap draft, or one from a batch of this size
+                cached = (
+                    self.cache.get(self.cache_key(gap))
+                    or self.cache.get(self.cache_key(gap, len(control_gaps)))
+                )
+            if cached is not None:
+                results[index] = cached
+            else:
+                pending.append(index)
+
+        attempt = 0
+        while len(pending) > 1 and attempt <= retries:
+            batch = [control_gaps[i] for i in pending]
+            output = self._call_model(
+                self.build_batch_prompt(batch),
+                max_tokens=self.max_tokens * len(batch),
+            )
+            sections = self._parse_batch_output(output, len(batch))
+
+            still_pending = []
+            for position, index in enumerate(pending):
+                result = sections.get(position + 1)
+                if result is not None and all(result.values()):
+                    results[index] = result
+                    if self.cache is not None:
+                        self.cache.put(self.cache_key(control_gaps[index], len(batch)), result)
+                else:
+                    still_pending.append(index)
+
+            pending = still_pending
+            attempt += 1
+
+        # Whatever is left falls back to the single-gap prompt
+        for index in pending:
+            results[index] = self.generate_full_improvement(control_gaps[index])
+
+        return results
+
+    def build_batch_prompt(self, control_gaps: List[Dict]) -> str:
+        gap_lines = []
+        for number, gap in enumerate(control_gaps, start=1):
+            gap = gap_signature(gap)
+            gap_lines.append(
+                f"GAP {number}: {gap['control_name']} ({gap['control_id']})\n"
+                f"Severity: {gap['severity']}\n"
+                f"Missing Elements: {', '.join(gap['missing_elements'])}"
+            )
+        gaps_str = "\n\n".join(gap_lines)
 
         prompt = f"""
 You are a cybersecurity compliance expert.
 
-Control: {control_gap.get('control_name')} ({control_gap.get('control_id')})
-Severity: {control_gap.get('severity')}
-Missing Elements: {missing_str}
+Each gap below is one control with missing policy elements.
+
+{gaps_str}
+
+TASKS (for EACH gap, independently):
+1. Explain why this gap increases risk (2–3 sentences).
+2. Write a formal policy section addressing ONLY the missing elements.
+3. Provide 2–3 high-level improvement steps.
+
+STRICT RULES:
+- No new requirements
+- No framework names
+- No implementation details
+- Formal, audit-ready language
+- Be concise
+
+FORMAT EXACTLY AS, one block per gap, in order:
+
+=== GAP <number> ===
+RISK:
+<text>
+
+POLICY:
+<text>
+
+ROADMAP:
+- <bullet>
+- <bullet>
+=== END GAP <number> ===
+"""
+        return prompt
+
+    def cache_key(self, control_gap: Dict, batch_size: int = 1) -> str:
+        """
+        Key of a gap's draft from the single-gap prompt, or from a
+        batched prompt of `batch_size` gaps (its own template and token
+        budget, so batch drafts never stand in for single ones).
+        """
+        if batch_size == 1:
+            return response_key(
+                self.model_name, self._generation_options(), PROMPT_VERSION, control_gap
+            )
+        return response_key(
+            self.model_name,
+            self._generation_options(self.max_tokens * batch_size),
+            f"{PROMPT_VERSION}-batch",
+            control_gap,
+        )
+
+    def build_prompt(self, control_gap: Dict) -> str:
+        gap = gap_signature(control_gap)
+
+        prompt = f"""
+You are a cybersecurity compliance expert.
+
+Control: {gap['control_name']} ({gap['control_id']})
+Severity: {gap['severity']}
+Missing Elements: {', '.join(gap['missing_elements'])}
 
 TASKS:
 1. Explain why this gap increases risk (2–3 sentences).
@@ -58,13 +289,34 @@ ROADMAP:
 - <bullet>
 - <bullet>
 """
-
-        output = self._call_model(prompt)
-        return self._parse_output(output)
+        return prompt
 
     # -------------------------------------------------
     # Helpers
     # -------------------------------------------------
+    def _parse_batch_output(self, text: str, count: int) -> Dict[int, Dict]:
+        """
+        Splits a batched response into {gap number: parsed sections}.
+        Numbers outside 1..count and repeated sections are ignored.
+        """
+        headers = list(_BATCH_SECTION.finditer(text))
+        sections = {}
+
+        for position, header in enumerate(headers):
+            number = int(header.group(1))
+            if not 1 <= number <= count or number in sections:
+                continue
+
+            end = headers[position + 1].start() if position + 1 < len(headers) else len(text)
+            body = text[header.end():end]
+            closing = _BATCH_END.search(body)
+            if closing:
+                body = body[:closing.start()]
+
+            sections[number] = self._parse_output(body)
+
+        return sections
+
     def _parse_output(self, text: str) -> Dict:
         sections = {
             "risk": "",
@@ -97,19 +349,63 @@ ROADMAP:
         }
 
 
-    def _call_model(self, prompt: str) -> str:
+    def _generation_options(self, max_tokens: Optional[int] = None) -> Dict:
+        return {
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "num_predict": max_tokens or self.max_tokens,
+        }
+
+    @metrics.timed("llm")
+    def _call_model(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        if self.client is not None:
+            try:
+                return self._call_http(prompt, max_tokens)
+            except ConnectionError:
+                if self.backend == "http":
+                    return "[LLM unavailable] Ollama server not reachable."
+                # auto: server down — fall back to the CLI
+
+        return self._call_subprocess(prompt)
+
+    def _call_http(self, prompt: str, max_tokens: Optional[int] = None) -> str:
+        from src.llm.ollama_client import OllamaHTTPError
+
+        try:
+            body = self.client.generate(
+                self.model_name,
+                prompt,
+                options=self._generation_options(max_tokens),
+                keep_alive=self.keep_alive,
+            )
+        except OllamaHTTPError as e:
+            return str(e)
+
+        _count_tokens(body)
+        return body.get("response", "")
+
+    def _call_subprocess(self, prompt: str) -> str:
+        import subprocess
+
         try:
             process = subprocess.run(
                 ["ollama", "run", self.model_name],
                 input=prompt.encode("utf-8"),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                timeout=120,
+                timeout=self.timeout,
             )
         except FileNotFoundError:
             return "[LLM unavailable] Ollama not installed."
 
+        # The CLI reports no token counts
+        metrics.count_llm_call()
+
         if process.returncode != 0:
             return process.stderr.decode("utf-8")
 
         return process.stdout.decode("utf-8")
+
+
+def _count_tokens(body: Dict) -> None:
+    metrics.count_llm_call(body.get("prompt_eval_count", 0), body.get("eval_count", 0))
@@ -1,63 +1,190 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Dict, Optional
+
 from src.llm.llm_engine import Phi3PolicyDraftingEngine
-from typing import List, Dict
 
 
-def run_llm_on_gaps(compliance_results: List[Dict]) -> List[Dict]:
+# Concurrent drafting requests sent to the model server (1 = sequential)
+MAX_IN_FLIGHT = int(os.environ.get("POLICY_LLM_CONCURRENCY", "1"))
+
+# Gaps packed into one prompt (1 = one prompt per control)
+BATCH_SIZE = int(os.environ.get("POLICY_LLM_BATCH_SIZE", "1"))
+
+
+def run_llm_on_gaps(
+    compliance_results: List[Dict],
+    max_in_flight: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> List[Dict]:
     """
     Runs Phi-3 Mini on all non-adequate controls.
     Uses ONE merged prompt per control to generate:
     - Risk explanation
     - Rewritten policy
     - Improvement roadmap
+
+    Up to `max_in_flight` requests are drafted concurrently, and with
+    `batch_size` > 1 each request packs that many gaps into one prompt.
+    Results keep the original gap order, a failed gap never affects the
+    others, and each result reports its own `latency_seconds` (for a
+    batch, the latency of the whole batch).
     """
 
-    engine = Phi3PolicyDraftingEngine()
-    outputs = []
+    max_in_flight = max(1, max_in_flight or MAX_IN_FLIGHT)
+    batch_size = max(1, batch_size or BATCH_SIZE)
+    engine = Phi3PolicyDraftingEngine(pool_size=max(4, max_in_flight))
 
     # Only process meaningful gaps
-    gaps = [
-        g for g in compliance_results
-        if g["status"] in ("WEAK", "MISSING")
-    ]
+    gaps = select_gaps(compliance_results)
 
-    print(f"[LLM] Total gaps to process: {len(gaps)}")
+    print(f"[LLM] Total gaps to process: {len(gaps)} "
+          f"(in flight: {max_in_flight}, batch size: {batch_size})")
 
-    for idx, gap in enumerate(gaps, start=1):
-        control_id = gap.get("control_id", "UNKNOWN")
-        control_name = gap.get("control_name", "UNKNOWN")
+    indexed = list(enumerate(gaps, start=1))
+    batches = [indexed[i:i + batch_size] for i in range(0, len(indexed), batch_size)]
+
+    def draft(batch):
+        if len(batch) == 1:
+            idx, gap = batch[0]
+            return [_draft_gap(engine, gap, idx, len(gaps))]
+        return _draft_batch(engine, batch, len(gaps))
 
-        print(f"[LLM] ({idx}/{len(gaps)}) Processing {control_id} — {control_name}")
+    if max_in_flight == 1:
+        drafted = [draft(batch) for batch in batches]
+    else:
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            # map() yields in submission order, whatever finishes first
+            drafted = list(pool.map(draft, batches))
 
+    print("[LLM] All gaps processed.")
+    return [output for batch in drafted for output in batch]
+
+
+def stream_llm_on_gaps(compliance_results: List[Dict]) -> Iterator[Dict]:
+    """
+    Drafts gaps one by one and yields progress events as text arrives:
+    - {"event": "draft_start", "control_id", "control_name"}
+    - {"event": "draft_delta", "control_id", "text"}   (raw model output)
+    - {"event": "draft", ...}  same fields as a run_llm_on_gaps result
+    A failing gap yields its placeholder draft and the stream continues.
+    """
+    engine = Phi3PolicyDraftingEngine()
+    gaps = select_gaps(compliance_results)
+
+    for gap in gaps:
+        control_id = gap.get("control_id", "UNKNOWN")
+        yield {
+            "event": "draft_start",
+            "control_id": control_id,
+            "control_name": gap.get("control_name", "UNKNOWN"),
+        }
+
+        start = time.perf_counter()
         try:
-            llm_result = engine.generate_full_improvement(gap)
-
-            # Safety fallback in case model returns empty sections
-            outputs.append({
-                "control_id": control_id,
-                "control_name": control_name,
-                "status": gap["status"],
-                "severity": gap["severity"],
-                "risk_explanation": llm_result.get("risk_explanation", "").strip() or
-                    "Risk explanation could not be generated.",
-                "rewritten_policy": llm_result.get("rewritten_policy", "").strip() or
-                    "No policy rewrite generated.",
-                "improvement_roadmap": llm_result.get("improvement_roadmap", "").strip() or
-                    "No improvement roadmap generated."
-            })
+            llm_result = None
+            for part in engine.stream_full_improvement(gap):
+                if "delta" in part:
+                    yield {"event": "draft_delta", "control_id": control_id, "text": part["delta"]}
+                else:
+                    llm_result = part["result"]
+            output = _gap_output(gap, llm_result or {})
 
         except Exception as e:
             print(f"[LLM] ⚠️ Failed for {control_id}: {str(e)}")
+            output = _failed_output(gap)
 
-            # Fail gracefully — do NOT break pipeline
-            outputs.append({
-                "control_id": control_id,
-                "control_name": control_name,
-                "status": gap["status"],
-                "severity": gap["severity"],
-                "risk_explanation": "LLM generation failed.",
-                "rewritten_policy": "LLM generation failed.",
-                "improvement_roadmap": "LLM generation failed."
-            })
+        output["latency_seconds"] = round(time.perf_counter() - start, 3)
+        yield {"event": "draft", **output}
 
-    print("[LLM] All gaps processed.")
-    return outputs
\ No newline at end of file
+
+def select_gaps(compliance_results: List[Dict]) -> List[Dict]:
+    """
+    Only WEAK and MISSING controls are worth drafting.
+    """
+    return [
+        g for g in compliance_results
+        if g["status"] in ("WEAK", "MISSING")
+    ]
+
+
+def _draft_gap(engine: Phi3PolicyDraftingEngine, gap: Dict, idx: int, total: int) -> Dict:
+    """
+    Drafts one gap. Never raises: failures become placeholder text.
+    """
+    control_id = gap.get("control_id", "UNKNOWN")
+    control_name = gap.get("control_name", "UNKNOWN")
+
+    print(f"[LLM] ({idx}/{total}) Processing {control_id} — {control_name}")
+    start = time.perf_counter()
+
+    try:
+        output = _gap_output(gap, engine.generate_full_improvement(gap))
+
+    except Exception as e:
+        print(f"[LLM] ⚠️ Failed for {control_id}: {str(e)}")
+
+        # Fail gracefully — do NOT break pipeline
+        output = _failed_output(gap)
+
+    output["latency_seconds"] = round(time.perf_counter() - start, 3)
+    print(f"[LLM] ({idx}/{total}) {control_id} finished in {output['latency_seconds']}s")
+    return output
+
+
+def _draft_batch(engine: Phi3PolicyDraftingEngine, batch: List, total: int) -> List[Dict]:
+    """
+    Drafts several gaps with one batched prompt. If the batch as a whole
+    fails, each gap is drafted on its own so failures stay isolated.
+    """
+    first, last = batch[0][0], batch[-1][0]
+    gaps = [gap for _, gap in batch]
+
+    print(f"[LLM] ({first}-{last}/{total}) Processing batch: "
+          f"{', '.join(g.get('control_id', 'UNKNOWN') for g in gaps)}")
+    start = time.perf_counter()
+
+    try:
+        llm_results = engine.generate_batch_improvements(gaps)
+    except Exception as e:
+        print(f"[LLM] ⚠️ Batch failed, drafting gaps individually: {str(e)}")
+        return [_draft_gap(engine, gap, idx, total) for idx, gap in batch]
+
+    latency = round(time.perf_counter() - start, 3)
+    outputs = []
+    for gap, llm_result in zip(gaps, llm_results):
+        output = _gap_output(gap, llm_result)
+        output["latency_seconds"] = latency
+        outputs.append(output)
+
+    print(f"[LLM] ({first}-{last}/{total}) Batch finished in {latency}s")
+    return outputs
+
+
+def _gap_output(gap: Dict, llm_result: Dict) -> Dict:
+    # Safety fallback in case model returns empty sections
+    return {
+        "control_id": gap.get("control_id", "UNKNOWN"),
+        "control_name": gap.get("control_name", "UNKNOWN"),
+        "status": gap["status"],
+        "severity": gap["severity"],
+        "risk_explanation": llm_result.get("risk_explanation", "").strip() or
+            "Risk explanation could not be generated.",
+        "rewritten_policy": llm_result.get("rewritten_policy", "").strip() or
+            "No policy rewrite generated.",
+        "improvement_roadmap": llm_result.get("improvement_roadmap", "").strip() or
+            "No improvement roadmap generated."
+    }
+
+
+def _failed_output(gap: Dict) -> Dict:
+    return {
+        "control_id": gap.get("control_id", "UNKNOWN"),
+        "control_name": gap.get("control_name", "UNKNOWN"),
+        "status": gap["status"],
+        "severity": gap["severity"],
+        "risk_explanation": "LLM generation failed.",
+        "rewritten_policy": "LLM generation failed.",
+        "improvement_roadmap": "LLM generation failed."
+    }
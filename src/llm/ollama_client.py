@@ -0,0 +1,173 @@
+import http.client
+import json
+import os
+import queue
+from typing import Callable, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+DEFAULT_HOST = os.environ.get("OLLAMA_HOST", "http://127.0.0.1:11434")
+
+
+class OllamaHTTPClient:
+    """
+    Minimal client for the local Ollama HTTP API.
+
+    Keeps a small pool of keep-alive connections, so consecutive
+    generations reuse the same socket instead of paying process start-up
+    (`ollama run`) or a new TCP handshake per gap.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        timeout: float = 120,
+        pool_size: int = 4,
+    ):
+        host = host or DEFAULT_HOST
+        url = urlsplit(host if "://" in host else f"http://{host}")
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or 11434
+        self.timeout = timeout
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(pool_size)
+
+    # -------------------------------------------------
+    # API
+    # -------------------------------------------------
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict] = None,
+        keep_alive: Optional[str] = None,
+    ) -> Dict:
+        """
+        Non-streaming /api/generate call. Returns the decoded JSON body;
+        the generated text is under "response".
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": False,
+            "options": options or {},
+        }
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+
+        return self._post("/api/generate", payload)
+
+    def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict] = None,
+        keep_alive: Optional[str] = None,
+        on_done: Optional[Callable[[Dict], None]] = None,
+    ) -> Iterator[str]:
+        """
+        Streaming /api/generate call. Yields text fragments as the model
+        produces them. `on_done` receives the final part (token counts,
+        durations) once the model finishes.
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True,
+            "options": options or {},
+        }
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+
+        conn, response = self._send("/api/generate", payload)
+        finished = False
+        try:
+            if response.status != 200:
+                data = response.read()
+                finished = True
+                raise OllamaHTTPError(response.status, data.decode("utf-8", errors="ignore"))
+
+            for line in response:
+                if not line.strip():
+                    continue
+                part = json.loads(line)
+                if part.get("response"):
+                    yield part["response"]
+                if part.get("done"):
+                    if on_done is not None:
+                        on_done(part)
+                    break
+
+            response.read()
+            finished = True
+        finally:
+            # An abandoned stream leaves unread data on the socket
+            if finished and not response.will_close:
+                self._release(conn)
+            else:
+                conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    # -------------------------------------------------
+    # Connection Pool
+    # -------------------------------------------------
+    def _acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _send(self, path: str, payload: Dict) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """
+        Sends a JSON POST and returns the connection with its response
+        headers read. The caller reads the body and releases the connection.
+        """
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+        # A pooled socket may have been closed by the server while idle;
+        # retry once on a fresh connection before giving up.
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except (http.client.HTTPException, ConnectionError) as e:
+                conn.close()
+                if attempt == 1:
+                    raise ConnectionError(f"Ollama request failed: {e}") from e
+
+    def _post(self, path: str, payload: Dict) -> Dict:
+        conn, response = self._send(path, payload)
+        try:
+            data = response.read()
+        except (http.client.HTTPException, ConnectionError) as e:
+            conn.close()
+            raise ConnectionError(f"Ollama request failed: {e}") from e
+
+        if response.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+
+        if response.status != 200:
+            raise OllamaHTTPError(response.status, data.decode("utf-8", errors="ignore"))
+
+        return json.loads(data)
+
+
+class OllamaHTTPError(RuntimeError):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Ollama returned HTTP {status}: {message}")
+        self.status = status
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+# Set POLICY_LLM_CACHE to a file path, or to "off" to disable caching
+DEFAULT_CACHE_PATH = ROOT_DIR / ".cache" / "llm_responses.sqlite3"
+DEFAULT_MAX_ENTRIES = int(os.environ.get("POLICY_LLM_CACHE_ENTRIES", "5000"))
+
+
+def gap_signature(control_gap: Dict) -> Dict:
+    """
+    Normalized view of everything in a gap that reaches the prompt.
+    Prompts are built from the signature, so two gaps with the same
+    signature produce the same prompt.
+    """
+    missing = control_gap.get("missing_elements", [])
+    if isinstance(missing, str):
+        missing = [missing]
+
+    return {
+        "control_id": str(control_gap.get("control_id", "")).strip().upper(),
+        "control_name": str(control_gap.get("control_name", "")).strip(),
+        "severity": str(control_gap.get("severity", "")).strip().capitalize(),
+        "missing_elements": sorted({m.strip().lower() for m in missing if m.strip()}),
+    }
+
+
+def response_key(model: str, options: Dict, prompt_version: str, control_gap: Dict) -> str:
+    """
+    Cache key: model, the generation options sent with the prompt,
+    prompt template version and the normalized gap signature.
+    """
+    material = json.dumps(
+        {
+            "model": model,
+            "options": options,
+            "prompt_version": prompt_version,
+            "gap": gap_signature(control_gap),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Persistent cache of parsed drafting results, stored in SQLite.
+
+    Entries are evicted least-recently-used once `max_entries` is
+    exceeded. Safe to share between threads of one process and between
+    processes using the same file.
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+            )
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(row[0])
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)
+            ).fetchone() is not None
+
+    def put(self, key: str, value: Dict) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, created, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            self._conn.execute(
+                """
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM responses"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> Optional[LLMResponseCache]:
+    """
+    Process-wide cache at POLICY_LLM_CACHE (or .cache/), None when off.
+    """
+    global _default_cache
+
+    setting = os.environ.get("POLICY_LLM_CACHE", "")
+    if setting.lower() == "off":
+        return None
+
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMResponseCache(Path(setting) if setting else DEFAULT_CACHE_PATH)
+        return _default_cache
@@ -0,0 +1,90 @@
+"""
+Pre-warms the LLM response cache for the control catalog.
+
+Usage (from the project root):
+    python -m src.llm.warm_cache [--all-subsets] [--concurrency N] [--dry-run]
+
+By default every control is drafted for the gaps seen most often in
+practice: everything missing (MISSING), each single element missing and
+all-but-one element missing (WEAK). --all-subsets covers every
+non-empty subset of each control's required elements.
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from typing import Dict, Iterator, List
+
+from src.compliance.control_loader import load_controls
+from src.llm.llm_engine import Phi3PolicyDraftingEngine
+
+
+def missing_subsets(elements: List[str], all_subsets: bool = False) -> Iterator[List[str]]:
+    """
+    Yields the missing-element sets to pre-draft for one control.
+    """
+    elements = sorted(set(elements))
+    if all_subsets:
+        sizes = range(1, len(elements) + 1)
+    else:
+        sizes = sorted({1, len(elements) - 1, len(elements)} - {0})
+
+    for size in sizes:
+        for subset in combinations(elements, size):
+            yield list(subset)
+
+
+def warm_gaps(controls: List[Dict], all_subsets: bool = False) -> List[Dict]:
+    gaps = []
+    for control in controls:
+        for missing in missing_subsets(control["required_elements"], all_subsets):
+            gaps.append({
+                "control_id": control["id"],
+                "control_name": control["name"],
+                "severity": control["severity"],
+                "missing_elements": missing,
+            })
+    return gaps
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--all-subsets", action="store_true",
+                        help="draft every non-empty missing-element subset")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="drafting requests in flight")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="only report how many drafts are missing")
+    args = parser.parse_args(argv)
+
+    engine = Phi3PolicyDraftingEngine(pool_size=max(4, args.concurrency))
+    if engine.cache is None:
+        parser.error("LLM response cache is disabled (POLICY_LLM_CACHE=off)")
+
+    gaps = warm_gaps(load_controls(), args.all_subsets)
+    todo = [gap for gap in gaps if not engine.cache.contains(engine.cache_key(gap))]
+    print(f"[Warm-up] {len(gaps)} gap signatures, {len(todo)} not cached yet")
+
+    if args.dry_run or not todo:
+        return
+
+    start = time.perf_counter()
+    done = 0
+
+    def draft(gap):
+        result = engine.generate_full_improvement(gap)
+        return gap, all(result.values())
+
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+        for gap, ok in pool.map(draft, todo):
+            done += 1
+            mark = "ok" if ok else "⚠️ incomplete, not cached"
+            print(f"[Warm-up] ({done}/{len(todo)}) {gap['control_id']} "
+                  f"{', '.join(gap['missing_elements'])}: {mark}")
+
+    print(f"[Warm-up] Finished in {time.perf_counter() - start:.1f}s")
+    print(f"[Warm-up] Cache: {engine.cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Lightweight per-stage instrumentation.
+
+Stages (extract, normalize, split, evaluate, llm, ...) record their
+exclusive wall time: time spent in a nested stage is credited to that
+stage only, so a streaming pipeline where evaluation pulls clauses
+from the parser still splits cleanly into parsing and evaluation.
+
+Everything is aggregated in-process and rendered in the Prometheus text
+format; a request may also collect its own stage totals for a
+Server-Timing header. Set POLICY_METRICS=off to disable: stages then
+cost one flag check.
+"""
+import contextvars
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+ENABLED = os.environ.get("POLICY_METRICS", "on").lower() not in ("off", "0", "false")
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+BYTES_BUCKETS = (1 << 10, 1 << 14, 1 << 17, 1 << 20, 1 << 23, 1 << 26, 1 << 29)
+CLAUSE_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def set_enabled(enabled: bool) -> None:
+    global ENABLED
+    ENABLED = enabled
+
+
+# -------------------------
+# Aggregation
+# -------------------------
+class Histogram:
+    """
+    Cumulative Prometheus histogram, optionally split by one label.
+    """
+
+    def __init__(self, name: str, help_text: str, buckets, label: Optional[str] = None):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label = label
+        self._series: Dict[str, List] = {}
+
+    def observe(self, value: float, label_value: str = "") -> None:
+        series = self._series.get(label_value)
+        if series is None:
+            # [bucket counts..., sum, count]
+            series = self._series[label_value] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_value, series in sorted(self._series.items()):
+            prefix = f'{self.label}="{label_value}",' if self.label else ""
+            labels = f"{{{prefix.rstrip(',')}}}" if prefix else ""
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-1]}')
+            lines.append(f"{self.name}_sum{labels} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Registry:
+    """
+    Process-wide metric store. All updates take one lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stage_seconds = Histogram(
+                "policy_stage_seconds", "Exclusive time spent per analysis stage.",
+                STAGE_BUCKETS, label="stage",
+            )
+            self.document_bytes = Histogram(
+                "policy_document_bytes", "Size of analyzed policy documents.", BYTES_BUCKETS,
+            )
+            self.document_clauses = Histogram(
+                "policy_document_clauses", "Clauses extracted per policy document.",
+                CLAUSE_BUCKETS,
+            )
+            self.llm_tokens: Dict[str, int] = defaultdict(int)
+            self.llm_calls = 0
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds.observe(seconds, stage)
+
+    def observe_document(self, size: int, clauses: int) -> None:
+        with self._lock:
+            self.document_bytes.observe(size)
+            self.document_clauses.observe(clauses)
+
+    def count_llm_call(self, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_tokens["prompt"] += prompt_tokens
+            self.llm_tokens["completion"] += completion_tokens
+
+    def render(self) -> str:
+        with self._lock:
+            lines = []
+            for histogram in (self.stage_seconds, self.document_bytes, self.document_clauses):
+                lines.extend(histogram.render())
+
+            lines += [
+                "# HELP policy_llm_calls_total Model generations requested.",
+                "# TYPE policy_llm_calls_total counter",
+                f"policy_llm_calls_total {self.llm_calls}",
+                "# HELP policy_llm_tokens_total Tokens reported by the model server.",
+                "# TYPE policy_llm_tokens_total counter",
+            ]
+            for kind in ("prompt", "completion"):
+                lines.append(f'policy_llm_tokens_total{{kind="{kind}"}} {self.llm_tokens[kind]}')
+
+        peak = peak_rss_bytes()
+        if peak is not None:
+            lines += [
+                "# HELP process_peak_rss_bytes Peak resident set size of the process.",
+                "# TYPE process_peak_rss_bytes gauge",
+                f"process_peak_rss_bytes {peak}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if os.uname().sysname == "Darwin" else peak * 1024
+
+
+# -------------------------
+# Stages
+# -------------------------
+_local = threading.local()
+_request: contextvars.ContextVar = contextvars.ContextVar("policy_request_timings", default=None)
+
+
+class _Stage:
+    __slots__ = ("name", "start", "nested")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.nested = 0.0
+        self.start = time.perf_counter()
+        stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        if stack:
+            stack[-1].nested += elapsed
+
+        exclusive = elapsed - self.nested
+        REGISTRY.observe_stage(self.name, exclusive)
+        timings = _request.get()
+        if timings is not None:
+            timings[self.name] = timings.get(self.name, 0.0) + exclusive
+        return False
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_STAGE = _NoStage()
+
+
+def stage(name: str):
+    """
+    Context manager timing one stage: `with metrics.stage("evaluate"): ...`
+    """
+    return _Stage(name) if ENABLED else _NO_STAGE
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator timing every call of a function as stage `name`. Generator
+    functions are timed while they produce items (not while the consumer
+    holds them); coroutines from start to finish.
+    """
+
+    def decorate(fn):
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                items = fn(*args, **kwargs)
+                return timed_iter(name, items) if ENABLED else items
+            return generator_wrapper
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def coroutine_wrapper(*args, **kwargs):
+                if not ENABLED:
+                    return await fn(*args, **kwargs)
+                # Not pushed on the stage stack: other tasks may interleave
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    REGISTRY.observe_stage(name, time.perf_counter() - start)
+            return coroutine_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with _Stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorate
+
+
+def timed_iter(name: str, items: Iterable) -> Iterator:
+    """
+    Yields from `items`, timing each step as stage `name`.
+    """
+    if not ENABLED:
+        yield from items
+        return
+
+    iterator = iter(items)
+    while True:
+        with _Stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+def observe_document(size: int, clauses: int) -> None:
+    if ENABLED:
+        REGISTRY.observe_document(size, clauses)
+
+
+def count_llm_call(prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+    if ENABLED:
+        REGISTRY.count_llm_call(prompt_tokens, completion_tokens)
+
+
+# -------------------------
+# Request Scope
+# -------------------------
+@contextmanager
+def request_timings() -> Iterator[Optional[Dict[str, float]]]:
+    """
+    Collects the exclusive stage times of everything run inside the
+    block (including worker threads that copy the context). Yields None
+    when metrics are disabled.
+    """
+    if not ENABLED:
+        yield None
+        return
+
+    timings: Dict[str, float] = {}
+    token = _request.set(timings)
+    try:
+        yield timings
+    finally:
+        _request.reset(token)
+
+
+def server_timing(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    """
+    Server-Timing header value, durations in milliseconds.
+    """
+    parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items()]
+    if total is not None:
+        parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts)
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+from src.compliance.aggregates import ComplianceAggregate
+from src.compliance.gap_engine import evaluate_controls
+from src.compliance.grouping import group_by_function
+from src.compliance.scoring import compute_compliance_score
+
+
+CONTROLS = json.loads(
+    (Path(__file__).resolve().parent / "data" / "controls" / "nist_controls.json").read_text()
+)
+DOCUMENTS = [
+    [
+        "the organization shall maintain an asset inventory of all systems",
+        "security roles and responsibilities are assigned to the ciso",
+        "incident response procedures must be tested annually by the security team",
+    ],
+    ["the organization shall maintain an asset inventory of all systems"],
+    [],
+    ["all data shall be encrypted; access control applies to all systems owned by it"],
+]
+
+
+def test_aggregate_scores_match_scoring_for_any_subset():
+    documents = [evaluate_controls(CONTROLS, clauses) for clauses in DOCUMENTS]
+    aggregate = ComplianceAggregate()
+    for n, results in enumerate(documents):
+        compact = evaluate_controls(CONTROLS, DOCUMENTS[n], compact=True)
+        assert aggregate.add_document(compact) == compute_compliance_score(results)
+
+    pooled = [r for results in documents for r in results]
+    assert aggregate.score() == compute_compliance_score(pooled)
+    for function, results in group_by_function(pooled).items():
+        expected = compute_compliance_score(results)
+        assert {k: aggregate.function_scores()[function][k] for k in expected} == expected
+
+    stats = aggregate.control_stats()["ID.AM"]
+    statuses = [r["status"] for r in pooled if r["control_id"] == "ID.AM"]
+    assert stats["gap_rate"] == round(1 - statuses.count("ADEQUATE") / len(statuses), 4)
+    assert sum(aggregate.document_maturity.values()) == aggregate.documents == len(DOCUMENTS)
+
+
+def test_aggregates_merge_across_shards_and_round_trip_json():
+    documents = [evaluate_controls(CONTROLS, clauses) for clauses in DOCUMENTS]
+    whole = ComplianceAggregate()
+    shards = [ComplianceAggregate(), ComplianceAggregate()]
+    for n, results in enumerate(documents):
+        whole.add_document(results)
+        shards[n % 2].add_document(results)
+
+    merged = ComplianceAggregate.from_dict(json.loads(json.dumps(shards[0].to_dict())))
+    merged += shards[1]
+    assert merged.summary() == whole.summary()
+    assert (shards[0] + shards[1]).to_dict() == merged.to_dict()
+
+
+def test_severity_weighted_score():
+    results = [
+        {"control_id": "A", "control_name": "a", "nist_function": "Protect",
+         "severity": "Critical", "status": "ADEQUATE", "missing_elements": []},
+        {"control_id": "B", "control_name": "b", "nist_function": "Protect",
+         "severity": "Medium", "status": "MISSING", "missing_elements": ["x"]},
+    ]
+    aggregate = ComplianceAggregate()
+    aggregate.add_document(results)
+
+    # 4 * 100 / (4 + 2) = 66.67, where the unweighted score is 50
+    assert aggregate.score()["compliance_percentage"] == 50.0
+    assert aggregate.severity_weighted_score() == {
+        "compliance_percentage": 66.67, "maturity_level": "Moderate"
+    }
+    assert aggregate.control_stats()["B"]["missing_elements"] == {"x": 1}
@@ -0,0 +1,59 @@
+import os
+
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+from src.analysis_cache import CACHE, CacheTier
+
+
+def test_tier_evicts_least_recently_used_by_size():
+    tier = CacheTier("t", max_bytes=20)
+    tier.put("a", "x" * 8)
+    tier.put("b", "y" * 8)
+    assert tier.get("a") == "x" * 8
+
+    tier.put("c", "z" * 8)
+    assert tier.get("b") is None
+    assert tier.get("a") == "x" * 8
+    assert tier.stats()["evictions"] == 1
+    assert tier.stats()["bytes"] <= 20
+
+
+def test_tier_falls_back_to_disk(tmp_path):
+    CacheTier("t", max_bytes=1024, disk_dir=tmp_path).put("k", ["clause"])
+
+    fresh = CacheTier("t", max_bytes=1024, disk_dir=tmp_path)
+    assert fresh.get("k") == ["clause"]
+    assert fresh.stats()["disk_hits"] == 1
+
+
+def test_disk_store_prunes_oldest_files_beyond_budget(tmp_path):
+    # Nothing fits in memory: every read goes to disk
+    tier = CacheTier("t", max_bytes=1, disk_dir=tmp_path, max_disk_bytes=100)
+    for n in range(5):
+        tier.put(f"k{n}", "x" * 18)  # 20 bytes each
+        os.utime(tier._disk_path(f"k{n}"), (n + 1, n + 1))
+
+    assert tier.get("k0") == "x" * 18  # read: now the most recent file
+    tier.put("k5", "x" * 18)  # 120 bytes > 100: prune to <= 80
+
+    assert [tier.get(f"k{n}") is not None for n in range(6)] == [True, False, False, True, True, True]
+    assert tier.stats()["disk_evictions"] == 2
+    assert sum(f.stat().st_size for f in tmp_path.rglob("*.json")) <= 80
+
+
+def test_repeated_upload_skips_parsing(monkeypatch):
+    CACHE.clear()
+    client = TestClient(app_module.app)
+    upload = {"file": ("policy.txt", b"The organization shall maintain an asset inventory of all systems. " * 5)}
+
+    first = client.post("/analyze", files=upload)
+    assert first.status_code == 200
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit should not parse the file")
+
+    monkeypatch.setattr(app_module, "iter_policy_clauses", fail)
+    second = client.post("/analyze", files=upload)
+    assert second.json() == first.json()
+    assert client.get("/cache/stats").json()["results"]["hits"] >= 1
@@ -0,0 +1,40 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+
+
+POLICY = b"The organization shall maintain an asset inventory of all systems and data. " * 5
+
+
+def _events(client, **params):
+    with client.stream("POST", "/analyze/stream", params=params,
+                       files={"file": ("policy.txt", POLICY)}) as response:
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        return [json.loads(line) for line in response.iter_lines() if line]
+
+
+def test_stream_emits_parse_controls_score_then_drafts(monkeypatch):
+    def fake_drafts(results):
+        yield {"event": "draft_delta", "control_id": "GV.RR", "text": "RISK:"}
+        yield {"event": "draft", "control_id": "GV.RR", "risk_explanation": "r"}
+
+    monkeypatch.setattr(app_module, "stream_llm_on_gaps", fake_drafts)
+    events = _events(TestClient(app_module.app))
+    kinds = [e["event"] for e in events]
+
+    assert kinds[0] == "parse" and events[0]["clauses"] == 5
+    controls = [e for e in events if e["event"] == "control"]
+    assert len(controls) == kinds.index("score") - 1
+    assert kinds[-3:] == ["draft_delta", "draft", "done"]
+
+
+def test_stream_without_drafting_matches_analyze():
+    client = TestClient(app_module.app)
+    events = _events(client, draft="false")
+    analyze = client.post("/analyze", files={"file": ("policy.txt", POLICY)}).json()
+
+    controls = [{k: v for k, v in e.items() if k != "event"} for e in events if e["event"] == "control"]
+    assert controls == analyze["compliance"]["raw_results"]
+    assert events[-1]["event"] == "done"
@@ -0,0 +1,57 @@
+import io
+import json
+from pathlib import Path
+
+from src.batch_analyze import analyze_document, find_documents, main
+from src.parser import policy_parser
+
+
+POLICY = "The organization shall maintain an asset inventory of all systems and data. " * 5
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_batch_writes_one_record_per_document_and_resumes(tmp_path):
+    corpus = tmp_path / "corpus"
+    (corpus / "unit").mkdir(parents=True)
+    (corpus / "a.txt").write_text(POLICY)
+    (corpus / "unit" / "b.txt").write_text(POLICY.upper())
+    (corpus / "broken.pdf").write_bytes(b"not a pdf")
+    (corpus / "notes.md").write_text(POLICY)
+    output = tmp_path / "out.jsonl"
+
+    main([str(corpus), "--output", str(output), "--workers", "2"])
+    records = {r["filename"]: r for r in _records(output)}
+
+    assert set(records) == {"a.txt", "b.txt", "broken.pdf"}
+    assert "error" in records["broken.pdf"]
+    assert records["a.txt"]["clauses"] == 5
+    assert records["a.txt"]["results"] == records["b.txt"]["results"]
+
+    # Successful documents are skipped, failed ones retried
+    main([str(corpus), "--output", str(output), "--workers", "1"])
+    filenames = [r["filename"] for r in _records(output)]
+    assert sorted(filenames) == ["a.txt", "b.txt", "broken.pdf", "broken.pdf"]
+
+
+def test_pdf_pages_are_counted_by_the_parsing_pass(monkeypatch):
+    pdf = Path(__file__).resolve().parent / "NIST-Cybersecurity-Framework-Policy-Template-Guide-v2111Online.pdf"
+    readers = []
+    open_reader = policy_parser._pdf_reader
+    monkeypatch.setattr(policy_parser, "_pdf_reader", lambda stream: readers.append(1) or open_reader(stream))
+
+    record = analyze_document(str(pdf))
+    assert len(readers) == 1
+    assert record["pages"] == len(open_reader(io.BytesIO(pdf.read_bytes())).pages) > 0
+    assert record["clauses"] > 0
+
+
+def test_find_documents_accepts_globs(tmp_path):
+    (tmp_path / "a.txt").write_text(POLICY)
+    (tmp_path / "b.docx").write_bytes(b"")
+    (tmp_path / "c.csv").write_text("x")
+
+    found = find_documents(str(tmp_path / "*"))
+    assert [p.name for p in found] == ["a.txt", "b.docx"]
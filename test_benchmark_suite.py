@@ -0,0 +1,53 @@
+import io
+import json
+
+from benchmarks import suite
+from benchmarks.synthetic import (
+    parse_size,
+    synthetic_catalog,
+    synthetic_docx,
+    synthetic_pdf,
+    synthetic_policy,
+)
+from src.parser.policy_parser import iter_policy_clauses
+
+
+def test_synthetic_inputs_are_deterministic_and_sized():
+    assert parse_size("1KB") == 1024 and parse_size("100MB") == 100 << 20
+
+    text = synthetic_policy(parse_size("16KB"), seed=1)
+    assert len(text.encode("utf-8")) == 16384
+    assert text == synthetic_policy(16384, seed=1) != synthetic_policy(16384, seed=2)
+    assert synthetic_catalog(50) == synthetic_catalog(50)
+
+
+def test_synthetic_formats_parse_to_the_same_clauses():
+    text = synthetic_policy(8192)
+    expected = list(iter_policy_clauses(io.BytesIO(text.encode()), "p.txt"))
+
+    assert list(iter_policy_clauses(io.BytesIO(synthetic_docx(text)), "p.docx")) == expected
+    assert len(list(iter_policy_clauses(io.BytesIO(synthetic_pdf(text)), "p.pdf"))) == len(expected)
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {"a": {"seconds": 1.0}, "b": {"seconds": 1.0}, "c": {"seconds": 0.001}}
+    current = {"a": {"seconds": 1.2}, "b": {"seconds": 1.4}, "c": {"seconds": 0.003},
+               "d": {"seconds": 5.0}}
+
+    # "c" tripled but stays under the noise floor; "d" has no baseline
+    assert suite.compare(current, baseline, threshold=0.25) == ["b"]
+
+
+def test_save_then_compare_round_trip(tmp_path, monkeypatch):
+    baseline = tmp_path / "baseline.json"
+    args = ["--sizes", "1KB", "--filter", "clean_text", "--repeat", "1"]
+
+    assert suite.main(args + ["--save", str(baseline)]) == 0
+    assert list(json.loads(baseline.read_text())["results"]) == ["clean_text[1KB]"]
+
+    # A much faster baseline makes the same case a regression
+    data = json.loads(baseline.read_text())
+    data["results"]["clean_text[1KB]"]["seconds"] = 1e-7
+    baseline.write_text(json.dumps(data))
+    monkeypatch.setattr(suite, "NOISE_FLOOR", 0.0)
+    assert suite.main(args + ["--compare", str(baseline)]) == 1
@@ -1,7 +1,7 @@
 from pathlib import Path
 import json
 
-from src.compliance.gap_engine import evaluate_control
+from src.compliance.gap_engine import evaluate_controls
 from src.compliance.scoring import compute_compliance_score
 
 # Load controls
@@ -21,10 +21,8 @@ clauses = policy_text.split(".")
 
 print("Running compliance engine...\n")
 
-results = []
-for control in controls:
-    result = evaluate_control(control, clauses)
-    results.append(result)
+results = evaluate_controls(controls, clauses)
+for result in results:
     print(result)
 
 summary = compute_compliance_score(results)
@@ -0,0 +1,72 @@
+import json
+import os
+
+import pytest
+
+from src.compliance import control_loader, gap_engine
+from src.compliance.control_loader import get_catalog, load_controls
+
+
+def _write(path, controls):
+    path.write_text(json.dumps(controls), encoding="utf-8")
+
+
+def test_catalog_is_cached_and_reloaded_on_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(control_loader, "RELOAD_CHECK_INTERVAL", 0.0)
+    control_loader.clear_cache()
+
+    path = tmp_path / "controls.json"
+    controls = load_controls(control_loader.CONTROLS_PATH)
+    _write(path, controls[:2])
+
+    first = get_catalog(path)
+    assert get_catalog(path) is first
+    assert len(first.controls) == 2
+
+    _write(path, controls[:3])
+    os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+    second = get_catalog(path)
+    assert second.version != first.version
+    assert len(second.controls) == 3
+
+
+def test_invalid_catalog_is_rejected(tmp_path):
+    control_loader.clear_cache()
+    path = tmp_path / "controls.json"
+    _write(path, [{"id": "X", "name": "No function"}])
+
+    with pytest.raises(ValueError):
+        get_catalog(path)
+
+
+def test_missing_catalog_file_keeps_last_good_catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(control_loader, "RELOAD_CHECK_INTERVAL", 0.0)
+    control_loader.clear_cache()
+    path = tmp_path / "controls.json"
+    _write(path, load_controls(control_loader.CONTROLS_PATH)[:2])
+
+    first = get_catalog(path)
+    path.unlink()  # e.g. a non-atomic save in progress
+    assert get_catalog(path) is first
+
+    control_loader.clear_cache()
+    with pytest.raises(OSError):
+        get_catalog(path)
+
+
+def test_reloads_do_not_grow_the_compiled_matcher_caches(tmp_path, monkeypatch):
+    monkeypatch.setattr(control_loader, "RELOAD_CHECK_INTERVAL", 0.0)
+    control_loader.clear_cache()
+    path = tmp_path / "controls.json"
+    controls = load_controls(control_loader.CONTROLS_PATH)[:1]
+
+    for version in range(gap_engine.SIGNAL_CACHE_SIZE * 2):
+        control = dict(controls[0], required_elements=[f"element {version}"])
+        _write(path, [control])
+        os.utime(path, ns=(version * 10**9, version * 10**9))
+        catalog = get_catalog(path)
+        gap_engine.evaluate_controls(catalog.controls, ["element"])
+        gap_engine.evaluate_control(control, ["element"])
+
+    assert gap_engine.compile_signals.cache_info().currsize <= gap_engine.SIGNAL_CACHE_SIZE
+    assert gap_engine.compile_elements.cache_info().currsize <= gap_engine.ELEMENT_CACHE_SIZE
@@ -0,0 +1,94 @@
+import os
+from pathlib import Path
+
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+from src.compliance import control_loader, frameworks as frameworks_module
+from src.compliance.control_loader import get_catalog
+from src.compliance.frameworks import (
+    available_frameworks,
+    framework_path,
+    get_frameworks,
+    split_results,
+)
+from src.compliance.gap_engine import evaluate_controls
+from src.parser.policy_parser import iter_text_clauses
+
+
+POLICY = (Path(__file__).resolve().parent / "data" / "sample_policies" / "weak_policy.txt").read_text()
+CLAUSES = list(iter_text_clauses(POLICY)) + [
+    "the organization shall maintain an asset inventory and encryption of data at rest",
+    "all suppliers and third party service providers must meet contractual obligations",
+    "backup restoration is tested quarterly; incident response roles are owned by the ciso",
+]
+
+
+def test_frameworks_share_one_pass_and_match_separate_evaluation():
+    assert {"nist", "iso27001", "cis", "nist_csf"} <= set(available_frameworks())
+
+    frameworks = get_frameworks(["nist", "iso27001", "cis", "nist_csf"])
+    assert get_frameworks(["nist", "iso27001", "cis", "nist_csf"]) is frameworks
+
+    for compact in (False, True):
+        combined = split_results(
+            frameworks,
+            evaluate_controls(frameworks.controls, iter(CLAUSES), frameworks.compiled, compact),
+        )
+        for name in frameworks.names:
+            catalog = get_catalog(framework_path(name))
+            alone = evaluate_controls(catalog.controls, CLAUSES, catalog.compiled, compact)
+            if compact:
+                combined[name] = [r.to_dict() for r in combined[name]]
+                alone = [r.to_dict() for r in alone]
+            assert combined[name] == alone
+
+
+def test_unknown_framework_is_rejected():
+    with pytest.raises(ValueError, match="Unknown framework"):
+        get_frameworks(["nist", "../nist"])
+
+
+def test_analyze_endpoint_returns_every_requested_framework():
+    client = TestClient(app_module.app)
+    files = {"file": ("policy.txt", "\n".join(CLAUSES).encode())}
+
+    single = client.post("/analyze", files=files).json()
+    assert "frameworks" not in single
+
+    response = client.post("/analyze?frameworks=nist,iso27001,cis", files=files).json()
+    assert list(response["frameworks"]) == ["nist", "iso27001", "cis"]
+    assert response["compliance"] == response["frameworks"]["nist"] == single["compliance"]
+    assert response["frameworks"]["cis"]["raw_results"][0]["control_id"] == "CIS.1"
+
+    assert client.post("/analyze?frameworks=nope", files=files).status_code == 400
+
+
+def test_framework_list_is_cached_until_the_directory_changes(tmp_path, monkeypatch):
+    shutil.copy(frameworks_module.FRAMEWORKS_DIR / "nist_controls.json", tmp_path)
+    monkeypatch.setattr(frameworks_module, "FRAMEWORKS_DIR", tmp_path)
+    monkeypatch.setattr(control_loader, "RELOAD_CHECK_INTERVAL", 3600.0)
+    frameworks_module.clear_cache()
+
+    assert available_frameworks() == ["nist"]
+    shutil.copy(tmp_path / "nist_controls.json", tmp_path / "cis_controls.json")
+    assert available_frameworks() == ["nist"]
+
+    monkeypatch.setattr(control_loader, "RELOAD_CHECK_INTERVAL", 0.0)
+    stat = tmp_path.stat()
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert available_frameworks() == ["cis", "nist"]
+    frameworks_module.clear_cache()
+
+
+def test_analyze_resolves_the_frameworks_once(monkeypatch):
+    calls = []
+    resolve = app_module.get_frameworks
+    monkeypatch.setattr(app_module, "get_frameworks", lambda names=None: calls.append(names) or resolve(names))
+    client = TestClient(app_module.app)
+
+    client.post("/analyze?frameworks=nist,cis", files={"file": ("policy.txt", POLICY.encode())})
+    assert calls == [["nist", "cis"]]
@@ -1,7 +1,7 @@
 from pathlib import Path
 import json
 
-from src.compliance.gap_engine import evaluate_control
+from src.compliance.gap_engine import evaluate_controls
 from src.compliance.scoring import compute_compliance_score
 from src.llm.llm_runner import run_llm_on_gaps
 
@@ -22,9 +22,7 @@ clauses = policy_text.split(".")
 
 print("Running compliance...\n")
 
-results = []
-for control in controls:
-    results.append(evaluate_control(control, clauses))
+results = evaluate_controls(controls, clauses)
 
 summary = compute_compliance_score(results)
 print("SUMMARY:", summary)
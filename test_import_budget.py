@@ -0,0 +1,20 @@
+import pytest
+
+from benchmarks import import_budget
+
+
+# Import times are machine-dependent; `python -m benchmarks.import_budget`
+# checks them. These tests only check which modules load.
+@pytest.mark.parametrize(
+    "entry",
+    [entry for entry in import_budget.ENTRY_POINTS if entry.module in ("main", "src.app")],
+    ids=lambda entry: entry.module,
+)
+def test_entry_points_load_heavy_modules_lazily(entry):
+    _, loaded, _ = import_budget.measure(entry.module)
+    assert [name for name in entry.lazy if name in loaded] == []
+
+
+def test_parser_loads_pdf_and_web_libraries_lazily():
+    _, loaded, _ = import_budget.measure("src.parser.policy_parser")
+    assert "PyPDF2" not in loaded and "fastapi" not in loaded
@@ -0,0 +1,73 @@
+import json
+import random
+
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+from src.compliance.control_loader import load_controls
+from src.compliance.gap_engine import evaluate_controls
+from src.compliance.incremental import evaluate_revision
+
+
+CONTROLS = load_controls()
+
+BASE = [
+    "the organization shall maintain an asset inventory of all systems",
+    "asset owners are responsible for each asset",
+    "logging of security events must be enabled organization-wide",
+    "access control applies to all systems and users",
+    "this paragraph has no relevant content for any control at all",
+]
+
+
+def test_revision_matches_full_evaluation_and_reuses_vectors():
+    rng = random.Random(3)
+    clauses = [rng.choice(BASE) + f" section {n}" for n in range(200)]
+    first = evaluate_revision(CONTROLS, clauses, catalog_version="v1")
+    assert first.results == evaluate_controls(CONTROLS, clauses)
+    assert first.evaluated == 200 and first.changes == []
+
+    # Round-trip the state through JSON like the cache does
+    state = json.loads(json.dumps(first.state))
+    edited = clauses[:150] + ["incident response plan shall be tested annually"] + clauses[150:]
+    second = evaluate_revision(CONTROLS, edited, previous=state, catalog_version="v1")
+
+    assert second.results == evaluate_controls(CONTROLS, edited)
+    assert (second.reused, second.evaluated) == (200, 1)
+    changed = {c["control_id"] for c in second.changes}
+    assert changed == {
+        r["control_id"]
+        for a, r in zip(first.results, second.results) if a["status"] != r["status"]
+    }
+    assert changed and all(c["before"] != c["after"] for c in second.changes)
+
+
+def test_duplicate_clauses_count_every_occurrence():
+    clauses = [BASE[0]] * 3 + [BASE[1]]
+    revision = evaluate_revision(CONTROLS, clauses)
+    assert revision.results == evaluate_controls(CONTROLS, clauses)
+    assert (revision.reused, revision.evaluated) == (2, 2)
+
+
+def test_catalog_change_discards_vectors_but_keeps_diff():
+    first = evaluate_revision(CONTROLS, BASE, catalog_version="v1")
+    second = evaluate_revision(CONTROLS, BASE[:1], previous=first.state, catalog_version="v2")
+    assert second.evaluated == 1 and second.reused == 0
+    assert second.changes
+
+
+def test_revision_endpoint_reports_changes():
+    client = TestClient(app_module.app)
+    v1 = ". ".join(BASE).encode() + b"."
+    v2 = ". ".join([BASE[0], BASE[4]]).encode() + b"."
+
+    first = client.post("/analyze/revision", params={"document_id": "doc-1"},
+                        files={"file": ("policy.txt", v1)}).json()
+    second = client.post("/analyze/revision", params={"document_id": "doc-1"},
+                         files={"file": ("policy.txt", v2)}).json()
+
+    assert first["changes"] == []
+    assert second["document"] == {"clauses": 2, "reused": 2, "evaluated": 0}
+    assert second["changes"]
+    full = client.post("/analyze", files={"file": ("policy.txt", v2)}).json()
+    assert second["compliance"] == full["compliance"]
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+from src.jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue, JobStore, QueueFull, analysis_job
+
+
+POLICY = b"The organization shall maintain an asset inventory of all systems and data. " * 5
+
+
+def _wait_for(store, job_id, statuses=(DONE, FAILED), timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get(job_id)
+        if job["status"] in statuses:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} still {store.get(job_id)['status']}")
+
+
+def test_queue_depth_limit_raises(tmp_path):
+    queue = JobQueue(JobStore(tmp_path / "jobs.db"), lambda job, report: {}, max_queued=2)
+
+    queue.submit("a.txt", b"a")
+    queue.submit("b.txt", b"b")
+    with pytest.raises(QueueFull):
+        queue.submit("c.txt", b"c")
+
+
+def test_worker_publishes_partial_then_final(tmp_path):
+    release = threading.Event()
+
+    def process(job, report):
+        report({"step": 1})
+        release.wait(5)
+        return {"content": job["content"].decode()}
+
+    queue = JobQueue(JobStore(tmp_path / "jobs.db"), process, workers=1)
+    queue.start()
+    try:
+        job_id = queue.submit("a.txt", b"hello")
+        running = _wait_for(queue.store, job_id, statuses=(RUNNING,))
+        while queue.store.get(job_id)["partial"] is None:
+            time.sleep(0.02)
+        assert queue.store.get(job_id)["partial"] == {"step": 1}
+        assert running["result"] is None
+
+        release.set()
+        job = _wait_for(queue.store, job_id)
+        assert job["status"] == DONE
+        assert job["result"] == {"content": "hello"}
+    finally:
+        queue.stop()
+
+
+def test_failed_job_records_error(tmp_path):
+    def process(job, report):
+        raise RuntimeError("boom")
+
+    queue = JobQueue(JobStore(tmp_path / "jobs.db"), process, workers=1)
+    queue.start()
+    try:
+        job = _wait_for(queue.store, queue.submit("a.txt", b"x"))
+        assert job["status"] == FAILED and job["error"] == "boom"
+    finally:
+        queue.stop()
+
+
+def test_interrupted_jobs_resume_after_restart(tmp_path):
+    path = tmp_path / "jobs.db"
+    store = JobStore(path)
+    job_id = store.create("a.txt", b"resumed", {}, max_queued=10)
+    assert store.claim_next()["id"] == job_id      # "crashes" while running
+    store.close()
+
+    queue = JobQueue(JobStore(path), lambda job, report: {"content": job["content"].decode()})
+    assert queue.store.get(job_id)["status"] == RUNNING
+    queue.start()
+    try:
+        assert _wait_for(queue.store, job_id)["result"] == {"content": "resumed"}
+    finally:
+        queue.stop()
+
+
+def test_jobs_endpoints(tmp_path, monkeypatch):
+    def fake_drafts(results):
+        yield {"event": "draft_start", "control_id": "GV.RR"}
+        yield {"event": "draft", "control_id": "GV.RR", "risk_explanation": "r"}
+
+    process = analysis_job(app_module.analyze_upload, fake_drafts)
+    queue = JobQueue(JobStore(tmp_path / "jobs.db"), process, workers=1, max_queued=0)
+    monkeypatch.setattr(app_module, "_job_queue", queue)
+    client = TestClient(app_module.app)
+
+    # Nothing may be queued yet: backpressure
+    assert client.post("/jobs", files={"file": ("policy.txt", POLICY)}).status_code == 429
+    assert client.get("/jobs/unknown").status_code == 404
+
+    queue.max_queued = 5
+    response = client.post("/jobs", files={"file": ("policy.txt", POLICY)})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert client.get(f"/jobs/{job_id}").json()["status"] == QUEUED
+
+    queue.start()
+    try:
+        _wait_for(queue.store, job_id)
+    finally:
+        queue.stop()
+
+    job = client.get(f"/jobs/{job_id}").json()
+    analyze = client.post("/analyze", files={"file": ("policy.txt", POLICY)}).json()
+    assert job["status"] == DONE
+    assert job["result"]["compliance"] == analyze["compliance"]
+    assert job["result"]["remediation"] == [{"control_id": "GV.RR", "risk_explanation": "r"}]
+
+
+def test_server_start_resumes_stored_jobs(tmp_path, monkeypatch):
+    store = JobStore(tmp_path / "jobs.db")
+    job_id = store.create("policy.txt", POLICY, {"draft": False}, max_queued=5)
+    store.close()
+
+    monkeypatch.setattr(app_module, "JOB_DB_PATH", tmp_path / "jobs.db")
+    monkeypatch.setattr(app_module, "_job_queue", None)
+    with TestClient(app_module.app):
+        assert _wait_for(app_module._job_queue.store, job_id)["status"] == DONE
+
+
+def test_finished_jobs_are_pruned_after_retention(tmp_path):
+    store = JobStore(tmp_path / "jobs.db", retention_hours=1)
+    old = store.create("old.txt", b"a", {}, max_queued=5)
+    queued = store.create("queued.txt", b"b", {}, max_queued=5)
+    store.finish(store.claim_next()["id"], result={"ok": True})
+
+    assert store.prune(now=time.time() + 1800) == 0
+    assert store.prune(now=time.time() + 7200) == 1
+    assert store.get(old) is None
+    assert store.get(queued)["status"] == QUEUED
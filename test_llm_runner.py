@@ -0,0 +1,109 @@
+import threading
+import time
+
+from src.llm import llm_runner
+from src.llm.draft_worker import DraftWorker
+
+
+class SlowEngine:
+    """
+    Stand-in engine: fixed latency, tracks peak concurrency, fails on demand.
+    """
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def __init__(self, **kwargs):
+        pass
+
+    def generate_full_improvement(self, gap):
+        with SlowEngine.lock:
+            SlowEngine.active += 1
+            SlowEngine.peak = max(SlowEngine.peak, SlowEngine.active)
+        try:
+            time.sleep(0.05)
+            if gap["control_id"] == "BAD":
+                raise RuntimeError("model error")
+            return {"risk_explanation": f"risk {gap['control_id']}",
+                    "rewritten_policy": "policy", "improvement_roadmap": "- step"}
+        finally:
+            with SlowEngine.lock:
+                SlowEngine.active -= 1
+
+
+def test_concurrent_drafting_keeps_order_and_isolates_failures(monkeypatch):
+    monkeypatch.setattr(llm_runner, "Phi3PolicyDraftingEngine", SlowEngine)
+    SlowEngine.peak = 0
+
+    gaps = [
+        {"control_id": cid, "control_name": cid, "status": "WEAK", "severity": "High"}
+        for cid in ["A", "BAD", "C", "D", "E", "F"]
+    ]
+    gaps.insert(2, {"control_id": "OK", "control_name": "OK", "status": "ADEQUATE", "severity": "Low"})
+
+    outputs = llm_runner.run_llm_on_gaps(gaps, max_in_flight=3)
+
+    assert [o["control_id"] for o in outputs] == ["A", "BAD", "C", "D", "E", "F"]
+    assert outputs[1]["risk_explanation"] == "LLM generation failed."
+    assert outputs[0]["risk_explanation"] == "risk A"
+    assert all(o["latency_seconds"] >= 0.05 for o in outputs)
+    assert SlowEngine.peak == 3
+
+
+def _section(number, text):
+    return (f"=== GAP {number} ===\nRISK:\n{text} risk.\n\nPOLICY:\n{text} policy.\n\n"
+            f"ROADMAP:\n- {text} step\n=== END GAP {number} ===\n")
+
+
+def test_batched_prompt_retries_only_malformed_sections(monkeypatch):
+    from src.llm.llm_engine import Phi3PolicyDraftingEngine
+
+    engine = Phi3PolicyDraftingEngine(backend="subprocess", use_cache=False)
+    gaps = [
+        {"control_id": cid, "control_name": cid, "severity": "High", "missing_elements": ["x"]}
+        for cid in ["A", "B", "C"]
+    ]
+    prompts = []
+
+    def fake_model(prompt, max_tokens=None):
+        prompts.append(prompt)
+        if len(prompts) == 1:
+            # Section 2 lost its POLICY part; section 3 arrives before 1
+            return (_section(3, "c") + "=== GAP 2 ===\nRISK:\nonly risk\n=== END GAP 2 ===\n"
+                    + _section(1, "a"))
+        return "RISK:\nb risk.\n\nPOLICY:\nb policy.\n\nROADMAP:\n- b step"
+
+    monkeypatch.setattr(engine, "_call_model", fake_model)
+    results = engine.generate_batch_improvements(gaps)
+
+    assert [r["rewritten_policy"] for r in results] == ["a policy.", "b policy.", "c policy."]
+    assert len(prompts) == 2
+    assert "GAP 3" in prompts[0] and "(B)" in prompts[1] and "(A)" not in prompts[1]
+
+
+def test_draft_worker_collects_drafts_in_background():
+    release = threading.Event()
+
+    def stream(results):
+        for gap in llm_runner.select_gaps(results):
+            yield {"event": "draft_delta", "control_id": gap["control_id"], "text": "par"}
+            release.wait(5)
+            yield {"event": "draft", "control_id": gap["control_id"], "risk_explanation": "r"}
+
+    results = [
+        {"control_id": "A", "status": "MISSING"},
+        {"control_id": "B", "status": "ADEQUATE"},
+    ]
+    worker = DraftWorker(results, stream=stream).start()
+    assert [gap["control_id"] for gap in worker.gaps] == ["A"]
+
+    deadline = time.time() + 5
+    while not worker.snapshot()["partial"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert worker.snapshot() == {"partial": {"A": "par"}, "drafts": {}, "done": False}
+
+    release.set()
+    worker.join(5)
+    progress = worker.snapshot()
+    assert progress["done"] and progress["partial"] == {}
+    assert progress["drafts"]["A"]["risk_explanation"] == "r"
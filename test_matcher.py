@@ -0,0 +1,53 @@
+import json
+import random
+
+from src.compliance.matcher import KeywordMatcher
+from benchmarks.bench_gap_engine import (
+    CONTROLS_PATH,
+    reference_evaluate_control,
+    synthetic_clauses,
+)
+from src.compliance.gap_engine import evaluate_control, evaluate_controls
+
+
+def test_matcher_agrees_with_substring_checks():
+    keywords = [
+        "incident response", "security incident response", "asset owner",
+        "asset ownership", "owner", "data at rest", "rest api", "a", "aa",
+    ]
+    matcher = KeywordMatcher({k: [k] for k in keywords})
+
+    rng = random.Random(3)
+    alphabet = "aeinorst "
+    for _ in range(2000):
+        clause = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        clause += rng.choice(keywords + [""]) + rng.choice(keywords + [""])
+        assert matcher.match(clause) == {k for k in keywords if k in clause}
+
+
+def test_evaluate_control_matches_reference():
+    with open(CONTROLS_PATH, "r", encoding="utf-8") as f:
+        controls = json.load(f)
+
+    clauses = synthetic_clauses(500)
+    for control in controls:
+        expected = reference_evaluate_control(control, clauses)
+        result = evaluate_control(control, clauses)
+        assert result["status"] == expected["status"]
+        assert sorted(result["missing_elements"]) == expected["missing_elements"]
+
+
+def test_evaluate_controls_matches_per_control_path():
+    with open(CONTROLS_PATH, "r", encoding="utf-8") as f:
+        controls = json.load(f)
+
+    clauses = synthetic_clauses(500)
+    expected = [evaluate_control(control, clauses) for control in controls]
+    assert evaluate_controls(controls, clauses) == expected
+
+
+if __name__ == "__main__":
+    test_matcher_agrees_with_substring_checks()
+    test_evaluate_control_matches_reference()
+    test_evaluate_controls_matches_per_control_path()
+    print("OK")
@@ -0,0 +1,71 @@
+import io
+import time
+
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+from src import metrics
+from src.analysis_cache import CACHE
+from src.parser.policy_parser import iter_policy_clauses
+
+
+POLICY = b"The organization shall maintain an asset inventory of all systems. " * 20
+
+
+def test_nested_stages_record_exclusive_time():
+    metrics.REGISTRY.reset()
+    with metrics.request_timings() as timings:
+        with metrics.stage("outer"):
+            time.sleep(0.02)
+            with metrics.stage("inner"):
+                time.sleep(0.05)
+
+    assert timings["inner"] >= 0.05
+    assert 0.02 <= timings["outer"] < 0.05
+    assert 'policy_stage_seconds_count{stage="inner"} 1' in metrics.REGISTRY.render()
+
+
+def test_parser_stages_keep_clauses_identical():
+    metrics.REGISTRY.reset()
+    with metrics.request_timings() as timings:
+        clauses = list(iter_policy_clauses(io.BytesIO(POLICY), "policy.txt"))
+
+    metrics.set_enabled(False)
+    try:
+        assert list(iter_policy_clauses(io.BytesIO(POLICY), "policy.txt")) == clauses
+    finally:
+        metrics.set_enabled(True)
+
+    assert {"extract", "normalize", "split"} <= set(timings)
+
+
+def test_disabled_metrics_record_nothing():
+    metrics.REGISTRY.reset()
+    metrics.set_enabled(False)
+    try:
+        with metrics.request_timings() as timings:
+            with metrics.stage("evaluate"):
+                pass
+        metrics.count_llm_call(10, 20)
+    finally:
+        metrics.set_enabled(True)
+
+    assert timings is None
+    rendered = metrics.REGISTRY.render()
+    assert "stage=" not in rendered and "policy_llm_calls_total 0" in rendered
+
+
+def test_analyze_sets_server_timing_and_exports_metrics():
+    CACHE.clear()
+    metrics.REGISTRY.reset()
+    client = TestClient(app_module.app)
+
+    response = client.post("/analyze", files={"file": ("policy.txt", POLICY)})
+    header = response.headers["Server-Timing"]
+    assert "evaluate;dur=" in header and "total;dur=" in header
+
+    exported = client.get("/metrics")
+    assert exported.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'policy_stage_seconds_count{stage="evaluate"} 1' in exported.text
+    assert "policy_document_clauses_count 1" in exported.text
+    assert f"policy_document_bytes_sum {len(POLICY)}" in exported.text
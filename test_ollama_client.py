@@ -0,0 +1,73 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.llm.llm_engine import Phi3PolicyDraftingEngine
+
+
+class StandInOllama(BaseHTTPRequestHandler):
+    """
+    Local stand-in for the Ollama /api/generate endpoint.
+    """
+    protocol_version = "HTTP/1.1"
+    requests = []
+    connections = set()
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        StandInOllama.requests.append(payload)
+        StandInOllama.connections.add(self.client_address)
+
+        body = json.dumps({
+            "response": "RISK:\nGap.\n\nPOLICY:\nThe organization shall act.\n\nROADMAP:\n- Step",
+            "done": True,
+        }).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_http_backend_reuses_connection_and_sends_options():
+    StandInOllama.requests.clear()
+    StandInOllama.connections.clear()
+    server = _serve()
+    try:
+        engine = Phi3PolicyDraftingEngine(
+            backend="http",
+            host=f"http://127.0.0.1:{server.server_address[1]}",
+            temperature=0.1,
+            top_p=0.8,
+            max_tokens=64,
+            use_cache=False,
+        )
+        gap = {"control_id": "PR.DS", "control_name": "Data Security",
+               "severity": "Critical", "missing_elements": ["encryption"]}
+
+        for _ in range(3):
+            result = engine.generate_full_improvement(gap)
+            assert result["rewritten_policy"] == "The organization shall act."
+    finally:
+        server.shutdown()
+
+    assert len(StandInOllama.requests) == 3
+    assert len(StandInOllama.connections) == 1
+    sent = StandInOllama.requests[0]
+    assert sent["options"] == {"temperature": 0.1, "top_p": 0.8, "num_predict": 64}
+    assert sent["keep_alive"] == "30m" and sent["stream"] is False
+
+
+def test_auto_backend_falls_back_when_server_is_down(monkeypatch):
+    engine = Phi3PolicyDraftingEngine(backend="auto", host="http://127.0.0.1:9", use_cache=False)
+    monkeypatch.setattr(engine, "_call_subprocess", lambda prompt: "from cli")
+    assert engine._call_model("prompt") == "from cli"
@@ -0,0 +1,195 @@
+import io
+import random
+import re
+
+import pytest
+
+from benchmarks.synthetic import docx_package, synthetic_docx, synthetic_structured_docx
+from src.parser import policy_parser
+from src.parser.policy_parser import (
+    _clean_text,
+    _extract_clauses,
+    _iter_clauses,
+    _iter_docx_paragraphs,
+    _iter_docx_text,
+    _last_safe_cut,
+    _SAFE_CUT,
+    iter_policy_clauses,
+    iter_text_clauses,
+)
+
+
+# Pre-streaming normalization, kept as the parity reference
+def reference_clean_text(text: str) -> str:
+    text = text.lower()
+    text = re.sub(r'-\s*\n\s*', '', text)
+    text = re.sub(r'\n+', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^a-z0-9.,;:() ]', '', text)
+    return text.strip()
+
+
+def test_streaming_clauses_match_whole_document():
+    rng = random.Random(11)
+    alphabet = list("abcdefghij   ..;;--\n\n\t•☃İ,()0") + ["shall ", "\r\n", "\xa0"]
+
+    for _ in range(3000):
+        pages = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 120)))
+            for _ in range(rng.randint(1, 8))
+        ]
+        expected = _extract_clauses(reference_clean_text("".join(pages)))
+        assert list(_iter_clauses(pages)) == expected
+
+
+def test_clean_text_matches_reference_for_every_character():
+    # Unicode case mapping (KELVIN SIGN, dotted I), non-ASCII whitespace,
+    # control characters and hyphenated breaks around each of them
+    for code_point in list(range(0x3100)) + [0x1E9E, 0x2028, 0x212A, 0xFB01, 0x1D400]:
+        char = chr(code_point)
+        text = f"Ab-{char}\n x {char} y{char}{char}z -\n{char}."
+        assert _clean_text(text) == reference_clean_text(text), hex(code_point)
+
+
+def test_text_clauses_and_safe_cuts_match_whole_document(monkeypatch):
+    from src.parser import policy_parser
+
+    monkeypatch.setattr(policy_parser, "TEXT_CHUNK_SIZE", 37)
+    monkeypatch.setattr(policy_parser, "_SAFE_CUT_WINDOW", 5)
+    rng = random.Random(5)
+    alphabet = list("abcdefghij   ..;;--\n\t☃İ,()0") + ["shall ", "\xa0", "K"]
+
+    for _ in range(500):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 400)))
+        assert list(iter_text_clauses(text)) == _extract_clauses(reference_clean_text(text))
+
+        last = None
+        for last in _SAFE_CUT.finditer(text):
+            pass
+        cut = _last_safe_cut(text)
+        assert (cut and cut.span()) == (last and last.span())
+
+
+def test_clauses_are_stitched_across_page_breaks():
+    pages = [
+        "All personnel must complete security awareness train-\n",
+        "ing every year. Access to production systems shall be restricted\n",
+        "to authorized administrators only.",
+    ]
+    assert list(_iter_clauses(pages)) == [
+        "all personnel must complete security awareness training every year",
+        "access to production systems shall be restricted to authorized administrators only.",
+    ]
+
+
+def test_txt_stream_matches_clean_text(monkeypatch):
+    from src.parser import policy_parser
+
+    monkeypatch.setattr(policy_parser, "TEXT_CHUNK_SIZE", 7)
+    text = "Données: the organization shall maintain an asset inventory. " * 20
+    stream = io.BytesIO(text.encode("utf-8"))
+
+    clauses = list(iter_policy_clauses(stream, "policy.TXT"))
+    assert clauses == _extract_clauses(_clean_text(text))
+
+
+def test_parallel_pdf_extraction_matches_serial(monkeypatch):
+    from pathlib import Path
+    from src.parser import policy_parser
+
+    # One range per page, so every page break is a range boundary
+    monkeypatch.setattr(policy_parser, "PDF_RANGES_PER_WORKER", 100)
+    pdf = Path(__file__).resolve().parent / "NIST-Cybersecurity-Framework-Policy-Template-Guide-v2111Online.pdf"
+
+    with open(pdf, "rb") as f:
+        serial = list(iter_policy_clauses(f, pdf.name, workers=1))
+        parallel = list(iter_policy_clauses(f, pdf.name, workers=2))
+
+    assert serial and parallel == serial
+
+
+def test_one_worker_extracts_pdf_without_a_pool(monkeypatch):
+    from pathlib import Path
+
+    monkeypatch.setattr(policy_parser, "PDF_WORKERS", 4)
+    monkeypatch.setattr(
+        policy_parser, "_map_page_ranges", lambda *args: pytest.fail("page pool used")
+    )
+    pdf = Path(__file__).resolve().parent / "NIST-Cybersecurity-Framework-Policy-Template-Guide-v2111Online.pdf"
+
+    with open(pdf, "rb") as f:
+        assert list(iter_policy_clauses(f, pdf.name, workers=1))
+
+
+def test_docx_stream_matches_python_docx(monkeypatch):
+    from docx import Document
+
+    text = "Section 1. Scope\nThe organization shall encrypt data at rest; owners are accountable.\n" * 40
+    content = synthetic_docx(text)
+    paragraphs = [p.text + "\n" for p in Document(io.BytesIO(content)).paragraphs]
+
+    assert "".join(_iter_docx_text(io.BytesIO(content))) == "".join(paragraphs)
+    streamed = list(iter_policy_clauses(io.BytesIO(content), "p.docx"))
+    assert streamed == list(_iter_clauses(paragraphs))
+
+    # Tables and tracked changes: the fallback reads the same text
+    structured = synthetic_structured_docx(text)
+    assert "".join(_iter_docx_text(io.BytesIO(structured))) == \
+        "".join(_iter_docx_paragraphs(io.BytesIO(structured)))
+
+    monkeypatch.setattr(policy_parser, "DOCX_STREAMING", False)
+    assert list(iter_policy_clauses(io.BytesIO(content), "p.docx")) == streamed
+
+
+def test_docx_stream_reads_tables_revisions_and_breaks():
+    content = docx_package(
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006">'
+        '<w:body>'
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>'
+        '<w:r><w:t>Owners</w:t><w:tab/><w:t>shall</w:t><w:br/><w:t>review</w:t>'
+        '<w:br w:type="page"/><w:t>non</w:t><w:noBreakHyphen/><w:t>stop &amp; log</w:t></w:r>'
+        '<w:ins><w:r><w:t xml:space="preserve"> annually</w:t></w:r></w:ins>'
+        '<w:del><w:r><w:delText> monthly</w:delText></w:r></w:del></w:p>'
+        '<w:tbl><w:tr><w:tc><w:p><w:r><w:t>Cell one</w:t></w:r></w:p></w:tc>'
+        '<w:tc><w:p><w:r><w:t>Cell two</w:t></w:r></w:p></w:tc></w:tr></w:tbl>'
+        '<w:p><w:r><w:t>Box:</w:t></w:r><w:r><mc:AlternateContent>'
+        '<mc:Choice Requires="wps"><w:p><w:r><w:t>In the box</w:t></w:r></w:p></mc:Choice>'
+        '<mc:Fallback><w:p><w:r><w:t>In the box</w:t></w:r></w:p></mc:Fallback>'
+        '</mc:AlternateContent></w:r></w:p>'
+        '</w:body></w:document>'
+    )
+
+    streamed = "".join(_iter_docx_text(io.BytesIO(content))).split("\n")
+    assert streamed == [
+        "Owners\tshall", "reviewnon-stop & log annually",
+        "Cell one", "Cell two", "Box:", "In the box", "",
+    ]
+    # Text boxes follow the paragraph they sit in on both paths
+    assert "".join(_iter_docx_paragraphs(io.BytesIO(content))).split("\n") == streamed
+
+
+def test_docx_text_boxes_give_the_same_clauses_on_both_paths(monkeypatch):
+    box = (
+        '<w:r><mc:AlternateContent><mc:Choice Requires="wps">'
+        '<w:p><w:r><w:t>The text box says backups must be tested</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>and restoration is owned by it</w:t></w:r></w:p>'
+        '</mc:Choice><mc:Fallback><w:p><w:r><w:t>Fallback copy</w:t></w:r></w:p>'
+        '</mc:Fallback></mc:AlternateContent></w:r>'
+    )
+    content = docx_package(
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"><w:body>'
+        '<w:p><w:r><w:t>The organization shall maintain an asset inventory</w:t></w:r></w:p>'
+        f'<w:p><w:r><w:t>Before the box the policy states that</w:t></w:r>{box}'
+        '<w:r><w:t> and after the box it continues with encryption.</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>Incident response roles shall be assigned; reviews happen yearly.</w:t></w:r></w:p>'
+        '</w:body></w:document>'
+    )
+
+    streamed = list(iter_policy_clauses(io.BytesIO(content), "p.docx"))
+    monkeypatch.setattr(policy_parser, "DOCX_STREAMING", False)
+    assert list(iter_policy_clauses(io.BytesIO(content), "p.docx")) == streamed
+    assert "".join(_iter_docx_text(io.BytesIO(content))) == \
+        "".join(_iter_docx_paragraphs(io.BytesIO(content)))
+    assert not any("fallback copy" in clause for clause in streamed)
@@ -0,0 +1,84 @@
+from src.llm.llm_engine import Phi3PolicyDraftingEngine
+from src.llm.response_cache import LLMResponseCache
+from src.llm.warm_cache import missing_subsets
+
+DRAFT = "RISK:\nGap.\n\nPOLICY:\nThe organization shall act.\n\nROADMAP:\n- Step"
+
+
+def test_equivalent_gaps_hit_the_cache(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3")
+    engine = Phi3PolicyDraftingEngine(backend="subprocess", cache=cache)
+
+    calls = []
+    monkeypatch.setattr(engine, "_call_model", lambda prompt: calls.append(prompt) or DRAFT)
+
+    gap = {"control_id": "PR.DS", "control_name": "Data Security", "severity": "Critical",
+           "missing_elements": ["encryption", "data at rest"]}
+    first = engine.generate_full_improvement(gap)
+    second = engine.generate_full_improvement({**gap, "missing_elements": ["Data at rest ", "encryption"]})
+
+    assert first == second
+    assert len(calls) == 1
+
+    # Different generation parameters must not reuse the draft
+    engine.temperature = 0.7
+    engine.generate_full_improvement(gap)
+    assert len(calls) == 2
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3", max_entries=2)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_default_warm_up_subsets():
+    subsets = list(missing_subsets(["a", "b", "c"]))
+    assert ["a", "b", "c"] in subsets
+    assert ["a"] in subsets and ["a", "b"] in subsets
+    assert len(subsets) == 7
+
+
+def test_gaps_with_one_key_get_the_same_prompt():
+    engine = Phi3PolicyDraftingEngine(backend="subprocess", use_cache=False)
+    gap = {"control_id": "pr.ds", "control_name": "Data Security", "severity": "critical",
+           "missing_elements": ["Encryption", "data at rest", "encryption "]}
+    same = {"control_id": "PR.DS", "control_name": "Data Security ", "severity": "Critical",
+            "missing_elements": ["data at rest", "encryption"]}
+
+    assert engine.cache_key(gap) == engine.cache_key(same)
+    assert engine.build_prompt(gap) == engine.build_prompt(same)
+    assert engine.build_batch_prompt([gap]) == engine.build_batch_prompt([same])
+    assert "Missing Elements: data at rest, encryption\n" in engine.build_prompt(gap)
+
+
+def test_batch_drafts_are_keyed_by_their_token_budget(tmp_path, monkeypatch):
+    cache = LLMResponseCache(tmp_path / "llm.sqlite3")
+    engine = Phi3PolicyDraftingEngine(backend="subprocess", cache=cache)
+    gaps = [{"control_id": cid, "control_name": cid, "severity": "High", "missing_elements": ["x"]}
+            for cid in ["A", "B"]]
+
+    calls = []
+
+    def fake_model(prompt, max_tokens=None):
+        calls.append(max_tokens)
+        return "".join(
+            f"=== GAP {n} ===\nRISK:\nr\n\nPOLICY:\np\n\nROADMAP:\n- s\n=== END GAP {n} ===\n"
+            for n in (1, 2)
+        )
+
+    monkeypatch.setattr(engine, "_call_model", fake_model)
+    engine.generate_batch_improvements(gaps)
+    assert calls == [engine.max_tokens * 2]
+
+    assert not cache.contains(engine.cache_key(gaps[0]))
+    assert cache.contains(engine.cache_key(gaps[0], batch_size=2))
+
+    # The same batch again is served from the cache
+    engine.generate_batch_improvements(gaps)
+    assert len(calls) == 1
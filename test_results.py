@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+from src.compliance.gap_engine import evaluate_controls
+from src.compliance.grouping import group_by_function
+from src.compliance.results import ControlResult, ResultSet, Status
+from src.compliance.scoring import compute_compliance_score
+
+
+CONTROLS = json.loads(
+    (Path(__file__).resolve().parent / "data" / "controls" / "nist_controls.json").read_text()
+)
+CLAUSES = [
+    "the organization shall maintain an asset inventory of all systems",
+    "security roles and responsibilities are assigned to the ciso",
+    "incident response procedures must be tested annually by the security team",
+]
+
+
+def test_compact_results_match_result_dicts():
+    expected = evaluate_controls(CONTROLS, CLAUSES)
+    compact = evaluate_controls(CONTROLS, CLAUSES, compact=True)
+
+    assert all(isinstance(r, ControlResult) for r in compact)
+    assert [r.to_dict() for r in compact] == expected
+    assert compute_compliance_score(compact) == compute_compliance_score(expected)
+    assert {f: [r.to_dict() for r in rs] for f, rs in group_by_function(compact).items()} \
+        == group_by_function(expected)
+
+    # Shared, interned catalog strings
+    assert compact[0]["nist_function"] is evaluate_controls(CONTROLS, [], compact=True)[0].control.function
+
+
+def test_result_set_round_trips_documents():
+    documents = [CLAUSES, CLAUSES[:1], [], CLAUSES[1:]]
+    corpus = ResultSet(CONTROLS)
+    for n, clauses in enumerate(documents):
+        results = evaluate_controls(CONTROLS, clauses, compact=n % 2 == 0)
+        assert corpus.add(f"doc{n}", results) == n
+
+    for n, clauses in enumerate(documents):
+        expected = evaluate_controls(CONTROLS, clauses)
+        assert corpus.to_dicts(n) == expected
+        assert corpus.score(n) == compute_compliance_score(expected)
+
+    counts = corpus.function_counts()
+    assert sum(map(sum, counts.values())) == len(documents) * len(CONTROLS)
+    assert counts["Identify"][Status.MISSING] >= 1
+
+
+def test_result_set_handles_duplicate_and_many_elements():
+    controls = [
+        {"id": "X.1", "name": "Dup", "function": "Protect", "severity": "Low",
+         "required_elements": ["asset inventory", "asset inventory", "encryption"]},
+        {"id": "X.2", "name": "Wide", "function": "Detect", "severity": "High",
+         "required_elements": [f"element {i}" for i in range(70)]},
+    ]
+    clauses = ["the organization shall maintain an asset inventory", "element 69 and element 3"]
+    expected = evaluate_controls(controls, clauses)
+
+    corpus = ResultSet(controls)
+    corpus.add("doc", expected)
+    assert corpus.to_dicts(0) == expected
@@ -0,0 +1,73 @@
+from fastapi.testclient import TestClient
+
+from src import app as app_module
+from src.compliance.control_loader import load_controls
+from src.compliance.gap_engine import evaluate_controls
+from src.compliance.retrieval import ClauseIndex, evaluate_controls_bm25, stem, tokenize
+from src.parser.policy_parser import iter_policy_clauses
+
+
+CONTROLS = load_controls()
+POLICY_PATH = "data/sample_policies/weak_policy.txt"
+
+
+def test_stemmer_conflates_inflections():
+    assert stem("classification") == stem("classified") == stem("classify")
+    assert stem("monitoring") == stem("monitored") == stem("monitors")
+    assert stem("logging") == stem("logs") == stem("log")
+    assert stem("policies") == stem("policy")
+    assert tokenize("The Inventory of Assets") == ["inventory", "asset"]
+
+
+def test_index_matches_paraphrases_above_threshold():
+    index = ClauseIndex([
+        "an inventory of all assets is kept current",
+        "assets are tracked",
+        "the weather is nice today",
+    ])
+    scores = index.search("asset inventory")
+    assert scores[0] >= 1.0 > scores[1]
+    assert 2 not in scores
+
+    assert index.matching_clauses("asset inventory", threshold=1.0) == {0}
+    assert index.matching_clauses("asset inventory", threshold=0.3) == {0, 1}
+
+
+def test_full_threshold_finds_exact_keyword_matches_on_whole_words():
+    with open(POLICY_PATH, "rb") as f:
+        clauses = list(iter_policy_clauses(f, POLICY_PATH))
+
+    keyword = evaluate_controls(CONTROLS, clauses)
+    retrieved = evaluate_controls_bm25(CONTROLS, clauses, threshold=1.0)
+    loose = evaluate_controls_bm25(CONTROLS, clauses, threshold=0.5)
+
+    for exact, bm25, lenient in zip(keyword, retrieved, loose):
+        assert set(bm25["missing_elements"]) <= set(exact["missing_elements"])
+        assert set(lenient["missing_elements"]) <= set(bm25["missing_elements"])
+
+
+def test_substring_hits_inside_words_are_not_retrieved():
+    controls = [{"id": "X.1", "name": "Crypto", "function": "Protect", "severity": "High",
+                 "required_elements": ["encrypted"]}]
+    clauses = ["unencrypted backups are not permitted by the organization"]
+
+    # The exact engine tests substrings, the index whole tokens
+    assert evaluate_controls(controls, clauses)[0]["missing_elements"] == []
+    assert evaluate_controls_bm25(controls, clauses, threshold=1.0)[0]["missing_elements"] == ["encrypted"]
+
+
+def test_api_can_use_retrieval_matching(monkeypatch):
+    client = TestClient(app_module.app)
+    policy = b"An inventory of all assets shall be maintained by the asset owner. " * 3
+
+    keyword = client.post("/analyze", files={"file": ("p.txt", policy)}).json()
+    monkeypatch.setattr(app_module, "MATCHING_MODE", "bm25")
+    bm25 = client.post("/analyze", files={"file": ("p.txt", policy)}).json()
+
+    def missing(result, control_id):
+        return next(sorted(r["missing_elements"]) for r in result["compliance"]["raw_results"]
+                    if r["control_id"] == control_id)
+
+    # Same upload, different matching mode: not served from the result cache
+    assert missing(keyword, "ID.AM") == ["asset inventory", "classification"]
+    assert missing(bm25, "ID.AM") == ["classification"]
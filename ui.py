@@ -1,28 +1,96 @@
+import io
+from pathlib import Path
+
 import streamlit as st
 import tempfile
 
 # Parser
-from src.parser.policy_parser import _clean_text
+from src.parser.policy_parser import PARSER_VERSION, _clean_text, iter_raw_text
+
+# Cache
+from src.analysis_cache import CACHE, cache_key, file_digest
 
 # Compliance
-from src.compliance.gap_engine import evaluate_control
+from src.compliance.control_loader import get_catalog
+from src.compliance.gap_engine import ENGINE_VERSION, evaluate_controls
 from src.compliance.grouping import group_by_function
 from src.compliance.scoring import compute_compliance_score
 
 # LLM
-from src.llm.llm_runner import run_llm_on_gaps
+from src.llm.draft_worker import DraftWorker
+
+# -------------------------
+# Load Controls (cached per process, reloaded on file change)
+# -------------------------
+CATALOG = get_catalog()
 
-import json
-from pathlib import Path
 
 # -------------------------
-# Load Controls
+# Cached Analysis (per upload hash)
 # -------------------------
-ROOT_DIR = Path(__file__).resolve().parent
-CONTROLS_PATH = ROOT_DIR / "data" / "controls" / "nist_controls.json"
+def upload_digest(uploaded_file) -> str:
+    """
+    SHA-256 of the upload, hashed once per uploaded file and remembered
+    in the session, so reruns do not re-read large documents.
+    """
+    digests = st.session_state.setdefault("digests", {})
+    digest = digests.get(uploaded_file.file_id)
+    if digest is None:
+        digest = digests[uploaded_file.file_id] = file_digest(uploaded_file)
+    return digest
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def analyze_document(digest: str, filename: str, catalog_version: str, _content: bytes):
+    """
+    Compliance results for one upload. Keyed by the upload hash and the
+    catalog version; the content itself is not hashed again (leading
+    underscore).
+    """
+    file_type = Path(filename).suffix
+    text_key = cache_key(digest, file_type, PARSER_VERSION)
+    result_key = cache_key(
+        digest, file_type, PARSER_VERSION, catalog_version, ENGINE_VERSION, "ui"
+    )
+
+    results = CACHE.results.get(result_key)
+    if results is None:
+        raw_text = CACHE.text.get(text_key)
+        if raw_text is None:
+            # Shared extractor (parallel PDF pages when POLICY_PDF_WORKERS > 1);
+            # anything it cannot read is treated as plain text
+            try:
+                raw_text = "".join(iter_raw_text(io.BytesIO(_content), filename))
+            except Exception:
+                raw_text = _content.decode("utf-8", errors="ignore")
+            CACHE.text.put(text_key, raw_text)
+
+        policy_text = _clean_text(raw_text)
+
+        clauses = policy_text.split(".")
+
+        results = evaluate_controls(CATALOG.controls, clauses, CATALOG.compiled)
+        CACHE.results.put(result_key, results)
+
+    return results, compute_compliance_score(results)
+
+
+def draft_worker(analysis_key: str, results) -> DraftWorker:
+    """
+    The session's background drafting worker for this analysis. A new
+    analysis stops the previous worker; reruns reuse the running one.
+    """
+    current = st.session_state.get("draft_worker")
+    if current is not None and current[0] == analysis_key:
+        return current[1]
+
+    if current is not None:
+        current[1].stop()
+
+    worker = DraftWorker(results).start()
+    st.session_state["draft_worker"] = (analysis_key, worker)
+    return worker
 
-with open(CONTROLS_PATH, "r", encoding="utf-8") as f:
-    CONTROLS = json.load(f)
 
 # -------------------------
 # UI
@@ -39,80 +107,80 @@ uploaded_file = st.file_uploader(
 
 analyze = st.button("🔍 Analyze Policy")
 
-if uploaded_file and analyze:
-    with st.spinner("Analyzing policy..."):
-        # Read file bytes and extract text according to file type
-        content = uploaded_file.read()
-        filename = getattr(uploaded_file, "name", getattr(uploaded_file, "filename", "")).lower()
-
-        raw_text = ""
-        try:
-            if filename.endswith('.pdf'):
-                import io
-                import PyPDF2
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        raw_text += page_text + "\n"
-            elif filename.endswith('.docx'):
-                try:
-                    from docx import Document
-                    import io
-                    doc = Document(io.BytesIO(content))
-                    for para in doc.paragraphs:
-                        raw_text += para.text + "\n"
-                except ImportError:
-                    raw_text = content.decode("utf-8", errors="ignore")
-            else:
-                raw_text = content.decode("utf-8", errors="ignore")
-        except Exception:
-            raw_text = content.decode("utf-8", errors="ignore")
+with st.sidebar.expander("Cache statistics"):
+    st.json(CACHE.stats())
 
-        policy_text = _clean_text(raw_text)
+if uploaded_file is not None:
+    digest = upload_digest(uploaded_file)
+    if analyze:
+        st.session_state["analyzed"] = digest
 
-        clauses = policy_text.split(".")
+# Results stay on screen across reruns until another file is analyzed
+if uploaded_file is not None and st.session_state.get("analyzed") == digest:
+    filename = uploaded_file.name.lower()
 
-        # -------------------------
-        # Run Compliance
-        # -------------------------
-        results = []
-        for control in CONTROLS:
-            results.append(evaluate_control(control, clauses))
+    with st.spinner("Analyzing policy..."):
+        results, summary = analyze_document(
+            digest, filename, CATALOG.version, uploaded_file.getvalue()
+        )
+
+    st.success("Analysis complete!")
+
+    # -------------------------
+    # Compliance Summary
+    # -------------------------
+    st.header("📊 Compliance Summary")
+    st.metric("Compliance %", summary["compliance_percentage"])
+    st.metric("Maturity Level", summary["maturity_level"])
 
-        summary = compute_compliance_score(results)
+    # -------------------------
+    # Run LLM (background worker, one per session)
+    # -------------------------
+    worker = draft_worker(f"{digest}:{CATALOG.version}", results)
 
-        st.success("Analysis complete!")
+    # -------------------------
+    # Display Results (only this part refreshes while the LLM drafts)
+    # -------------------------
+    polling = not worker.done
 
-        # -------------------------
-        # Compliance Summary
-        # -------------------------
-        st.header("📊 Compliance Summary")
-        st.metric("Compliance %", summary["compliance_percentage"])
-        st.metric("Maturity Level", summary["maturity_level"])
+    @st.fragment(run_every=1.0 if polling else None)
+    def show_drafts():
+        progress = worker.snapshot()
+        drafts, partial = progress["drafts"], progress["partial"]
 
-        # -------------------------
-        # Run LLM
-        # -------------------------
-        llm_outputs = run_llm_on_gaps(results)
+        if not progress["done"]:
+            st.caption(f"Drafting remediation... {len(drafts)}/{len(worker.gaps)} done")
 
-        # -------------------------
-        # Display Results
-        # -------------------------
         st.header("🚨 Risk Explanations")
 
-        for item in llm_outputs:
-            st.subheader(f"{item['control_id']} — {item['control_name']}")
-            st.write(item["risk_explanation"])
+        for gap in worker.gaps:
+            control_id = gap["control_id"]
+            st.subheader(f"{control_id} — {gap['control_name']}")
+            if control_id in drafts:
+                st.write(drafts[control_id]["risk_explanation"])
+            elif control_id in partial:
+                st.text(partial[control_id] + " ▌")
+            else:
+                st.caption("Waiting for draft...")
 
         st.header("✍️ Rewritten Policy Sections")
 
-        for item in llm_outputs:
-            with st.expander(f"{item['control_id']} — Improved Policy"):
-                st.text(item["rewritten_policy"])
+        for gap in worker.gaps:
+            control_id = gap["control_id"]
+            with st.expander(f"{control_id} — Improved Policy"):
+                if control_id in drafts:
+                    st.text(drafts[control_id]["rewritten_policy"])
 
         st.header("🗺️ Improvement Roadmap")
 
-        for item in llm_outputs:
-            st.subheader(f"{item['control_id']} — {item['control_name']}")
-            st.text(item["improvement_roadmap"])
+        for gap in worker.gaps:
+            control_id = gap["control_id"]
+            st.subheader(f"{control_id} — {gap['control_name']}")
+            if control_id in drafts:
+                st.text(drafts[control_id]["improvement_roadmap"])
+
+        # Stop polling once every draft is in
+        if polling and progress["done"]:
+            st.rerun()
+
+    show_drafts()